@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the benchmark scripts
+- Puts scripts/ and src/ on sys.path so benchmarks import the pipeline modules directly
+- Best-of-N timers and a results recorder
+- cleaned_synthetic(): cleaned synthetic jobs at any row count (clean a sample, then tile)
+- One JSON file per benchmark and commit under benchmarks/results/<benchmark>/<commit>.json,
+  so runs on different commits can be compared with compare_results.py
+"""
+from __future__ import annotations
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+REF_DT = datetime(2025, 1, 1)  # fixed "now" for clean_jobs, so runs on different days match
+DEFAULT_CLEAN_ROWS = 200_000
+
+for _p in (os.path.join(REPO_ROOT, 'scripts'), os.path.join(REPO_ROOT, 'src')):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+
+def git_commit() -> str:
+    """Short hash of HEAD, suffixed with '-dirty' when the tree has uncommitted changes."""
+    try:
+        sha = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                      stderr=subprocess.DEVNULL, text=True).strip()
+        dirty = subprocess.call(['git', 'diff', '--quiet', 'HEAD', '--'], cwd=REPO_ROOT,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) != 0
+        return sha + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def add_clean_rows_argument(parser):
+    parser.add_argument('--clean-rows', type=int, default=DEFAULT_CLEAN_ROWS,
+                        help='Synthetic raw rows to clean before tiling')
+
+
+def tile_rows(frame: pd.DataFrame, rows: int) -> pd.DataFrame:
+    """frame repeated to exactly `rows` rows (fresh RangeIndex)."""
+    reps = -(-rows // len(frame))
+    return pd.concat([frame] * reps, ignore_index=True).iloc[:rows]
+
+
+def cleaned_synthetic(rows: int, clean_rows: int = DEFAULT_CLEAN_ROWS, seed: int = 0) -> pd.DataFrame:
+    """
+    `rows` cleaned synthetic jobs: at most `clean_rows` raw rows go through clean_jobs
+    (the slow part) and the result is tiled up to `rows`.
+    """
+    from data_cleaning import clean_jobs
+    from synthetic_jobs import generate_raw_jobs
+
+    clean_rows = min(rows, clean_rows)
+    print(f"Generating and cleaning {clean_rows:,} rows...")
+    return tile_rows(clean_jobs(generate_raw_jobs(clean_rows, seed=seed), ref_dt=REF_DT), rows)
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Minimum wall seconds over `repeat` calls."""
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+class BenchResults:
+    """Flat metric -> value map plus run parameters, written as one JSON per commit."""
+
+    def __init__(self, name: str, params: Optional[Dict[str, object]] = None):
+        self.name = name
+        self.params = dict(params or {})
+        self.metrics: Dict[str, float] = {}
+
+    def record(self, key: str, value: float, unit: str = 's'):
+        self.metrics[key] = value
+        print(f"  {key:<48} {value:>12.6g} {unit}")
+
+    def time(self, key: str, fn: Callable[[], object], repeat: int = 3) -> float:
+        seconds = best_of(fn, repeat)
+        self.record(key, seconds)
+        return seconds
+
+    def to_dict(self) -> dict:
+        return {
+            'benchmark': self.name,
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'params': self.params,
+            'metrics': self.metrics,
+        }
+
+    def write(self, path: Optional[str] = None) -> str:
+        data = self.to_dict()
+        if path is None:
+            tag = '_'.join(f"{k}{v}" for k, v in sorted(self.params.items()) if k in ('rows', 'n'))
+            fname = f"{data['commit']}{'_' + tag if tag else ''}.json"
+            path = os.path.join(RESULTS_DIR, self.name, fname)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, default=str)
+        print(f"Results written to: {path}")
+        return path
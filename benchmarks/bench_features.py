@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Feature building: the original per-row build_features vs the vectorized block builder
+- Cleans synthetic rows once and tiles the cleaned frame to --rows (cleaning collapses
+  synthetic postings to a few hundred thousand), then times both builders on it and
+  checks that they produce identical frames
+- Times writing the float32 memmap + manifest and mapping it back
+- Times publishing the feature store and opening it, against reading the features CSV
+
+Usage: python benchmarks/bench_features.py --rows 1000000
+Results: benchmarks/results/features/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from bench_common import BenchResults, add_clean_rows_argument, cleaned_synthetic
+
+from data_preprocessing import build_features, build_features_reference
+from feature_builder import build_feature_block, load_feature_matrix, write_feature_matrix
+from feature_store import FeatureStore, publish_feature_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark feature building')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    add_clean_rows_argument(parser)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--skip-reference', action='store_true', help='Do not run the per-row builder')
+    parser.add_argument('--skip-csv', action='store_true', help='Do not write/read the features CSV for comparison')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    cleaned = cleaned_synthetic(args.rows, args.clean_rows, args.seed)
+    res = BenchResults('features', {'rows': args.rows, 'seed': args.seed})
+    res.record('feature_rows', len(cleaned), 'rows')
+
+    vec = res.time('vectorized_seconds', lambda: build_features(cleaned), args.repeat)
+    res.record('vectorized_rows_per_s', len(cleaned) / vec if vec else 0.0, 'rows/s')
+    if not args.skip_reference:
+        ref = res.time('reference_seconds', lambda: build_features_reference(cleaned), args.repeat)
+        res.record('speedup', ref / vec if vec else 0.0, 'x')
+        expected, _ = build_features_reference(cleaned)
+        got, _ = build_features(cleaned)
+        try:
+            pd.testing.assert_frame_equal(expected, got, check_exact=True)
+        except AssertionError as e:
+            print(f"Vectorized features differ from the reference: {e}")
+            sys.exit(1)
+        print("Vectorized features match the reference")
+        del expected, got
+
+    block = build_feature_block(cleaned)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'features.f32')
+        res.time('write_matrix_seconds', lambda: write_feature_matrix(path, block), args.repeat)
+        res.record('matrix_mb', os.path.getsize(path) / 1e6, 'MB')
+        t0 = time.perf_counter()
+        matrix, manifest = load_feature_matrix(path)
+        res.record('load_matrix_seconds', time.perf_counter() - t0)
+        res.time('matrix_column_sum_seconds', lambda: matrix.sum(axis=0), args.repeat)
+        del matrix
+
+        root = os.path.join(tmp, 'store')
+        res.time('store_publish_seconds', lambda: publish_feature_store(block, cleaned['skills_clean'], root=root), 1)
+        res.time('store_open_seconds', lambda: FeatureStore(root), args.repeat)
+        store = FeatureStore(root)
+        res.time('store_open_with_ids_skills_seconds', lambda: (FeatureStore(root).ids(), FeatureStore(root).skills()),
+                 args.repeat)
+        res.time('store_column_mean_seconds', lambda: store.column('avg_salary_lpa').mean(), args.repeat)
+        del store
+        if not args.skip_csv:
+            csv_path = os.path.join(tmp, 'features.csv')
+            block.to_frame().to_csv(csv_path, index=False)
+            res.record('csv_mb', os.path.getsize(csv_path) / 1e6, 'MB')
+            res.time('csv_read_seconds', lambda: pd.read_csv(csv_path), 1)
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Construction time and memory of scraped-job containers at scale
+- list of dicts (the scraper's previous representation, per-row timestamp)
+- list of slotted JobRecord instances
+- ColumnBatch (column lists + interned strings, one timestamp per page)
+plus DataFrame conversion time for each.
+
+Field values are rebuilt per row (as parsing produces fresh string objects), so
+interning savings are measured rather than assumed.
+
+Usage: python benchmarks/bench_job_records.py --n 1000000
+Results: benchmarks/results/job_records/<commit>_n<N>.json
+"""
+from __future__ import annotations
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+from bench_common import BenchResults
+
+from scraping.job_records import RAW_JOB_COLUMNS, ColumnBatch, JobRecord
+from synthetic_jobs import generate_raw_jobs
+
+JOBS_PER_PAGE = 20
+
+
+def _split(v):
+    return (v[:len(v) // 2], v[len(v) // 2:]) if isinstance(v, str) and len(v) > 1 else (v, None)
+
+
+def card_fields(templates, n):
+    """Yield n field dicts with freshly allocated strings, cycling through templates."""
+    split = [{k: _split(v) for k, v in t.items()} for t in templates]
+    for i in range(n):
+        t = split[i % len(split)]
+        yield {k: (a + b if b is not None else a) for k, (a, b) in t.items()}
+
+
+def build_dicts(templates, n):
+    out = []
+    for i, fields in enumerate(card_fields(templates, n)):
+        job = {'job_id': f"{i:032x}", 'source': 'Internshala', 'scrape_timestamp': datetime.now().isoformat(),
+               'category_searched': fields.pop('category_searched'), 'location_searched': fields.pop('location_searched'),
+               'page_found': 1 + (i // JOBS_PER_PAGE) % 3}
+        job.update(fields)
+        out.append(job)
+    return out
+
+
+def build_records(templates, n):
+    out = []
+    stamp = datetime.now().isoformat()
+    for i, fields in enumerate(card_fields(templates, n)):
+        if i % JOBS_PER_PAGE == 0:
+            stamp = datetime.now().isoformat()
+        out.append(JobRecord(job_id=f"{i:032x}", source='Internshala', scrape_timestamp=stamp,
+                             page_found=1 + (i // JOBS_PER_PAGE) % 3, **fields))
+    return out
+
+
+def build_batch(templates, n):
+    batch = ColumnBatch(RAW_JOB_COLUMNS)
+    stamp = datetime.now().isoformat()
+    for i, fields in enumerate(card_fields(templates, n)):
+        if i % JOBS_PER_PAGE == 0:
+            stamp = datetime.now().isoformat()
+        batch.append(fields, job_id=f"{i:032x}", source='Internshala', scrape_timestamp=stamp,
+                     page_found=1 + (i // JOBS_PER_PAGE) % 3)
+    return batch
+
+
+def to_frame(kind, obj):
+    if kind == 'dicts':
+        return pd.DataFrame(obj)
+    if kind == 'records':
+        return pd.DataFrame({c: [getattr(r, c) for r in obj] for c in RAW_JOB_COLUMNS})
+    return obj.to_frame()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job record containers')
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--templates', type=int, default=20_000, help='Distinct synthetic postings to cycle through')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    raw = generate_raw_jobs(args.templates, seed=1)
+    templates = raw[[c for c in RAW_JOB_COLUMNS if c not in ('job_id', 'source', 'scrape_timestamp', 'page_found')]]
+    templates = templates.astype(object).where(templates.notna(), None).to_dict('records')
+    res = BenchResults('job_records', {'n': args.n, 'templates': args.templates})
+
+    builders = {'dicts': build_dicts, 'records': build_records, 'batch': build_batch}
+    for kind, build in builders.items():
+        print(f"{kind}:")
+        gc.collect()
+        t0 = time.perf_counter()
+        obj = build(templates, args.n)
+        res.record(f'{kind}.build_seconds', time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        frame = to_frame(kind, obj)
+        res.record(f'{kind}.to_frame_seconds', time.perf_counter() - t0)
+        del frame, obj
+        gc.collect()
+
+        tracemalloc.start()
+        obj = build(templates, args.n)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        res.record(f'{kind}.memory_mb', current / 1e6, 'MB')
+        del obj
+        gc.collect()
+
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Job store: bulk ingestion throughput and time-travel query latency
+- Generates a first run of --rows distinct postings, then --sessions later runs, each
+  dropping --churn of the live postings, adding as many new ones and changing the salary
+  text of --changed of the rest
+- Times JobStore.ingest for every run (staged executemany batches + set-based SCD2 upsert)
+  and reports rows/s and the versions written
+- Times as_of() at the first and last run and time_series() by category and city
+- For contrast, upserts --naive-rows postings of the first run row by row (look up the
+  current version, close it, insert, commit per posting) into a fresh store
+
+Usage: python benchmarks/bench_job_store.py --rows 500000
+Results: benchmarks/results/job_store/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from bench_common import BenchResults
+
+from job_store import JobStore, prepare_run, session_instant
+from synthetic_jobs import generate_raw_jobs
+
+FIRST_SESSION = datetime(2025, 1, 1)
+
+
+def simulate_runs(rows: int, sessions: int, churn: float, changed: float, seed: int):
+    rng = np.random.default_rng(seed)
+    pool = generate_raw_jobs(int(rows * (1 + churn * sessions) * 1.1) + 1000, seed=seed, dup_rate=0.0,
+                             exact_dup_rate=0.0).drop_duplicates('job_id', ignore_index=True)
+    live, fresh = pool.iloc[:rows].copy(), rows
+    for s in range(sessions + 1):
+        session = (FIRST_SESSION + timedelta(days=7 * s)).strftime('%Y%m%d_%H%M%S')
+        if s:
+            keep = rng.random(len(live)) >= churn
+            n_new = len(live) - int(keep.sum())
+            live = pd.concat([live[keep], pool.iloc[fresh:fresh + n_new]], ignore_index=True)
+            fresh += n_new
+            edit = rng.random(len(live)) < changed
+            live.loc[edit, 'salary_text'] = live.loc[edit, 'salary_text'].fillna('') + f' (rev {s})'
+        yield session, live.assign(collection_session=session)
+
+
+def naive_upsert(path: str, df: pd.DataFrame, session: str):
+    """Row-at-a-time SCD2 upsert with a commit per posting (what batching avoids)."""
+    store = JobStore(path)
+    store.close()
+    conn = sqlite3.connect(path)
+    run = prepare_run(df)
+    at = session_instant(session)
+    cols = list(run.columns)
+    insert = (f"INSERT INTO job_versions (valid_from, valid_to, session, {', '.join(cols)}) "
+              f"VALUES (?, NULL, ?, {', '.join('?' * len(cols))})")
+    for row in run.astype(object).where(run.notna(), None).itertuples(index=False, name=None):
+        current = conn.execute("SELECT content_hash FROM job_versions WHERE job_id = ? AND valid_to IS NULL",
+                               (row[0],)).fetchone()
+        if current is not None and current[0] == row[1]:
+            continue
+        if current is not None:
+            conn.execute("UPDATE job_versions SET valid_to = ? WHERE job_id = ? AND valid_to IS NULL", (at, row[0]))
+        conn.execute(insert, (at, session) + row)
+        conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the historical job store')
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--sessions', type=int, default=4, help='Runs after the first one')
+    parser.add_argument('--churn', type=float, default=0.05)
+    parser.add_argument('--changed', type=float, default=0.03)
+    parser.add_argument('--naive-rows', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    res = BenchResults('job_store', {'rows': args.rows, 'sessions': args.sessions, 'churn': args.churn,
+                                     'changed': args.changed})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'job_store.sqlite')
+        store = JobStore(path)
+        first = last = None
+        total_rows, total_seconds = 0, 0.0
+        for i, (session, df) in enumerate(simulate_runs(args.rows, args.sessions, args.churn, args.changed, args.seed)):
+            t0 = time.perf_counter()
+            stats = store.ingest(df, session)
+            seconds = time.perf_counter() - t0
+            total_rows, total_seconds = total_rows + stats['rows'], total_seconds + seconds
+            res.record(f'run_{i}.ingest_seconds', seconds)
+            res.record(f'run_{i}.rows_per_s', stats['rows'] / seconds if seconds else 0.0, 'rows/s')
+            res.record(f'run_{i}.versions_written', stats['added'] + stats['changed'], 'rows')
+            first = first or stats['collected_at']
+            last = stats['collected_at']
+        res.record('ingest_rows_per_s', total_rows / total_seconds if total_seconds else 0.0, 'rows/s')
+        res.record('store_mb', os.path.getsize(path) / 1e6, 'MB')
+        res.record('versions', store.counts()['versions'], 'rows')
+
+        res.time('as_of_first_seconds', lambda: store.as_of(first), args.repeat)
+        res.time('as_of_last_seconds', lambda: store.as_of(last), args.repeat)
+        res.time('series_category_seconds', lambda: store.time_series('category_searched'), args.repeat)
+        res.time('series_city_seconds', lambda: store.time_series('city'), args.repeat)
+        store.close()
+
+        session, df = next(simulate_runs(args.naive_rows, 0, 0.0, 0.0, args.seed))
+        naive_path = os.path.join(tmp, 'naive.sqlite')
+        t0 = time.perf_counter()
+        naive_upsert(naive_path, df, session)
+        naive = time.perf_counter() - t0
+        res.record('naive_rows_per_s', len(df) / naive if naive else 0.0, 'rows/s')
+        with JobStore(os.path.join(tmp, 'batched.sqlite')) as batched:
+            seconds = res.time('batched_small_ingest_seconds', lambda: batched.ingest(df, session), 1)
+        res.record('batched_small_rows_per_s', len(df) / seconds if seconds else 0.0, 'rows/s')
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark on synthetic data
+- parse_salary_text per call (all rows and distinct texts)
+- every clean_jobs step (timed through RunMetrics stages)
+- build_features
+- EDA aggregates via DuckDB (JobQueries) and the analytics cube
+
+Usage: python benchmarks/bench_pipeline.py --rows 100000
+Results: benchmarks/results/pipeline/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import time
+
+from bench_common import REF_DT, BenchResults
+
+from analytics_cube import AnalyticsCube
+from data_cleaning import clean_jobs, write_parquet_twin
+from data_preprocessing import build_features
+from job_queries import JobQueries
+from run_metrics import RunMetrics
+from salary_parser import parse_salary_text
+from synthetic_jobs import generate_raw_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the cleaning/preprocessing/EDA pipeline on synthetic rows')
+    parser.add_argument('--rows', type=int, default=100_000, help='Synthetic raw rows (10k-10M)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='Repeats for the fast micro benchmarks (best-of)')
+    parser.add_argument('--output', default=None, help='Results JSON path (default: benchmarks/results/pipeline/...)')
+    args = parser.parse_args()
+
+    res = BenchResults('pipeline', {'rows': args.rows, 'seed': args.seed})
+    print(f"Generating {args.rows} synthetic rows...")
+    t0 = time.perf_counter()
+    raw = generate_raw_jobs(args.rows, seed=args.seed)
+    res.record('generate_seconds', time.perf_counter() - t0)
+
+    texts = raw['salary_text'].tolist()
+    distinct = list(dict.fromkeys(t for t in texts if isinstance(t, str)))
+    print("parse_salary_text:")
+    sec = res.time('salary_parse_all_seconds', lambda: [parse_salary_text(t) for t in texts], args.repeat)
+    res.record('salary_parse_us_per_call', sec / max(1, len(texts)) * 1e6, 'us')
+    sec = res.time('salary_parse_distinct_seconds', lambda: [parse_salary_text(t) for t in distinct], args.repeat)
+    res.record('salary_parse_distinct_us_per_call', sec / max(1, len(distinct)) * 1e6, 'us')
+
+    print("clean_jobs:")
+    metrics = RunMetrics('bench_clean', sample_rss=False)
+    t0 = time.perf_counter()
+    cleaned = clean_jobs(raw.copy(), metrics, ref_dt=REF_DT)
+    total = time.perf_counter() - t0
+    for name, seconds in metrics.stage_seconds().items():
+        res.record(f"clean.{name}_seconds", seconds)
+    res.record('clean_total_seconds', total)
+    res.record('clean_rows_per_s', len(raw) / total if total else 0.0, 'rows/s')
+    res.params['cleaned_rows'] = len(cleaned)
+
+    print("build_features:")
+    res.time('build_features_seconds', lambda: build_features(cleaned), 1)
+
+    print("EDA aggregates:")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'cleaned_jobs_dataset.csv')
+        cleaned.to_csv(csv_path, index=False)
+        write_parquet_twin(cleaned, csv_path)
+        q = JobQueries(csv_path)
+        city = q.first_present('city_norm', 'city')
+        cat = q.first_present('category_standard', 'category_searched')
+        res.time('eda.value_counts_seconds', lambda: q.value_counts(city, n=15), args.repeat)
+        if q.has('skills_clean'):
+            res.time('eda.token_counts_seconds', lambda: q.token_counts('skills_clean', n=30), args.repeat)
+        if q.has('avg_salary_inr'):
+            res.time('eda.salary_stats_by_seconds', lambda: q.salary_stats_by(city), args.repeat)
+        res.time('eda.crosstab_seconds', lambda: q.crosstab(city, cat, top_rows=15, top_cols=8), args.repeat)
+        q.close()
+
+    cube = None
+
+    def build():
+        nonlocal cube
+        cube = AnalyticsCube.from_frame(cleaned)
+    res.time('cube.build_seconds', build, 1)
+    res.time('cube.rollup_city_seconds', lambda: cube.rollup(['city_norm'], quantiles=(0.5,)), args.repeat)
+    res.time('cube.crosstab_seconds', lambda: cube.crosstab('city_norm', 'category_standard'), args.repeat)
+
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
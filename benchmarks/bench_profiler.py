@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Streaming data quality profile: throughput, bounded memory and accuracy
+- Writes synthetic raw CSVs of --rows / 10 and --rows rows
+- Profiles both in one chunked pass (stream_profile.py) in a fresh process, recording its
+  peak RSS above the RSS after imports; the two peaks should be close however large the file is
+- Also times the old pandas approach (full read_csv, isnull/duplicated/astype(str).value_counts)
+  the same way, on the small file only unless --pandas-large
+- On the large file, checks the profile against exact DuckDB aggregates: null counts,
+  duplicate count, distinct-count error and top-15 distribution agreement
+
+Usage: python benchmarks/bench_profiler.py --rows 10000000
+Results: benchmarks/results/profiler/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_common import BenchResults
+
+from data_quality_assessment import DISTRIBUTION_FIELDS, KEY_FIELDS, duplicate_subset
+from job_queries import JobQueries
+from run_metrics import RssSampler, current_rss_mb
+from stream_profile import DEFAULT_CHUNK_ROWS, profile_csv
+from synthetic_jobs import write_raw_jobs
+
+
+def profile(path: str, chunk_rows: int):
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    return profile_csv(path, chunk_rows, distribution_columns=[c for c in DISTRIBUTION_FIELDS if c in columns],
+                       duplicate_subset=duplicate_subset(columns),
+                       distinct_columns=[c for c in KEY_FIELDS if c in columns])
+
+
+def pandas_profile(path: str):
+    df = pd.read_csv(path)
+    df.isnull().sum()
+    df.duplicated(subset=duplicate_subset(list(df.columns))).sum()
+    for col in DISTRIBUTION_FIELDS:
+        df[col].astype(str).value_counts().head(15)
+
+
+def _child(target: str, path: str, chunk_rows: int, conn):
+    base = current_rss_mb() or 0.0
+    sampler = RssSampler(interval=0.02).start()
+    t0 = time.perf_counter()
+    if target == 'stream':
+        profile(path, chunk_rows)
+    else:
+        pandas_profile(path)
+    seconds = time.perf_counter() - t0
+    sampler.stop()
+    conn.send((seconds, sampler.peak_mb - base))
+    conn.close()
+
+
+def measured(target: str, path: str, chunk_rows: int):
+    """(seconds, peak RSS above the post-import RSS in MB) measured in a spawned process."""
+    ctx = multiprocessing.get_context('spawn')
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(target, path, chunk_rows, child))
+    proc.start()
+    seconds, peak = parent.recv()
+    proc.join()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the streaming data quality profiler')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--pandas-large', action='store_true', help='Also run the full-load pandas profile on --rows')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    res = BenchResults('profiler', {'rows': args.rows, 'chunk_rows': args.chunk_rows})
+    with tempfile.TemporaryDirectory() as tmp:
+        sizes = {'small': max(args.rows // 10, 1), 'large': args.rows}
+        paths = {}
+        for label, rows in sizes.items():
+            print(f"Writing {rows:,} synthetic raw rows...")
+            paths[label] = write_raw_jobs(os.path.join(tmp, f'{label}.csv'), rows, seed=args.seed)
+            res.record(f'{label}.csv_mb', os.path.getsize(paths[label]) / 1e6, 'MB')
+
+        for label, path in paths.items():
+            seconds, peak = measured('stream', path, args.chunk_rows)
+            res.record(f'{label}.stream_seconds', seconds)
+            res.record(f'{label}.stream_rows_per_s', sizes[label] / seconds if seconds else 0.0, 'rows/s')
+            res.record(f'{label}.stream_peak_rss_mb', peak, 'MB')
+            if label == 'small' or args.pandas_large:
+                seconds, peak = measured('pandas', path, args.chunk_rows)
+                res.record(f'{label}.pandas_seconds', seconds)
+                res.record(f'{label}.pandas_peak_rss_mb', peak, 'MB')
+
+        prof = profile(paths['large'], args.chunk_rows)
+        q = JobQueries(paths['large'], prefer_parquet=False)
+        dup = q.duplicate_count(duplicate_subset(q.columns))
+        res.record('large.nulls_exact', float(q.missing_counts().sort_index().equals(prof.missing_counts().sort_index())), '')
+        res.record('large.duplicates_exact', float(prof.duplicate_count() == dup), '')
+        cols = list(prof.distinct)
+        exprs = ', '.join(f'count(DISTINCT "{c}")' for c in cols)
+        exact = q.con.execute(f"SELECT {exprs} FROM {q.source}").fetchone()
+        errors = [abs(prof.distinct[c].estimate() - n) / max(n, 1) for c, n in zip(cols, exact)]
+        res.record('large.distinct_mean_rel_error', float(np.mean(errors)), '')
+        res.record('large.distinct_max_rel_error', float(np.max(errors)), '')
+        agree = [prof.value_counts(col).equals(q.value_counts(col, n=15, as_text=True)) for col in prof.heavy]
+        res.record('large.distributions_identical', float(np.mean(agree)), '')
+        q.close()
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
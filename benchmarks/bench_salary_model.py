@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Out-of-core salary model: training and inference throughput, and memory vs dataset size
+- Publishes a feature store from cleaned synthetic rows tiled to --rows
+- Trains (scaling pass + --epochs epochs) and predicts missing salaries, reporting rows/s
+- Traces peak Python/NumPy allocations during training at --rows and a quarter of it,
+  to check that memory depends on the batch size, not the row count
+
+Usage: python benchmarks/bench_salary_model.py --rows 1000000
+Results: benchmarks/results/salary_model/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from bench_common import BenchResults, add_clean_rows_argument, cleaned_synthetic
+
+from feature_builder import build_feature_block
+from feature_store import FeatureStore, publish_feature_store
+from salary_model import predict_missing, train
+
+
+def publish_store(frame: pd.DataFrame, root: str) -> FeatureStore:
+    publish_feature_store(build_feature_block(frame), frame['skills_clean'], root=root)
+    return FeatureStore(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the out-of-core salary model')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    add_clean_rows_argument(parser)
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--batch-rows', type=int, default=65_536)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    cleaned = cleaned_synthetic(args.rows, args.clean_rows, args.seed)
+    res = BenchResults('salary_model', {'rows': args.rows, 'epochs': args.epochs, 'batch_rows': args.batch_rows})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, rows in (('quarter', max(1, args.rows // 4)), ('full', args.rows)):
+            store = publish_store(cleaned.iloc[:rows], os.path.join(tmp, label))
+            tracemalloc.start()
+            model, stats = train(store, epochs=args.epochs, batch_rows=args.batch_rows)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            res.record(f'{label}.train_peak_mb', peak / 1e6, 'MB')
+            if label != 'full':
+                continue
+            res.record('train_seconds', stats['train_seconds'])
+            res.record('train_rows_per_s', stats['train_rows_per_s'], 'rows/s')
+            holdout = stats.get('holdout') or {}
+            res.record('holdout_rmse_log', holdout.get('rmse_log') or float('nan'), '')
+            res.record('holdout_baseline_rmse_log', holdout.get('baseline_rmse_log') or float('nan'), '')
+            t0 = time.perf_counter()
+            predicted = predict_missing(store, model, args.batch_rows)
+            seconds = time.perf_counter() - t0
+            res.record('predicted_rows', len(predicted), 'rows')
+            res.record('predict_seconds', seconds)
+            res.record('predict_scan_rows_per_s', store.rows / seconds if seconds else 0.0, 'rows/s')
+            del store, predicted
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
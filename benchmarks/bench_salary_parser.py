@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Salary parser: compatibility on the golden corpus and per-call cost
+- Checks parse_salary_text against benchmarks/data/salary_golden.json (outputs of the
+  original sequential parser, frozen) and exits non-zero on any difference
+- Times parse_salary_text and parse_salary_text_reference over synthetic salary texts
+  drawn with the scraper's observed format mix, and reports which branch handled them
+
+Usage: python benchmarks/bench_salary_parser.py --n 200000
+Results: benchmarks/results/salary_parser/<commit>_n<N>.json
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from bench_common import REPO_ROOT, BenchResults
+
+from salary_parser import (parse_salary_text, parse_salary_text_reference, reset_salary_branch_counts,
+                           salary_branch_counts)
+from synthetic_jobs import salary_pool
+
+GOLDEN_PATH = os.path.join(REPO_ROOT, 'benchmarks', 'data', 'salary_golden.json')
+
+
+def check_golden(path=GOLDEN_PATH):
+    """List of (text, expected, got) for every golden entry the parser disagrees with."""
+    with open(path, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    mismatches = []
+    for entry in golden:
+        got = list(parse_salary_text(entry['text']))
+        if got != entry['expected']:
+            mismatches.append((entry['text'], entry['expected'], got))
+    return len(golden), mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the salary parser')
+    parser.add_argument('--n', type=int, default=200_000, help='Salary texts to parse per timing run')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--golden', default=GOLDEN_PATH)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    total, mismatches = check_golden(args.golden)
+    print(f"Golden corpus: {total:,} texts, {len(mismatches)} mismatch(es)")
+    for text, expected, got in mismatches[:20]:
+        print(f"  {text!r}: expected {expected}, got {got}")
+    if mismatches:
+        sys.exit(1)
+
+    rng = np.random.default_rng(args.seed)
+    pool, weights = salary_pool(rng)
+    texts = list(rng.choice(pool, size=args.n, p=weights))
+    res = BenchResults('salary_parser', {'n': args.n, 'seed': args.seed})
+    res.record('golden_texts', total, 'texts')
+
+    ref = res.time('reference_seconds', lambda: [parse_salary_text_reference(t) for t in texts], args.repeat)
+    new = res.time('grammar_seconds', lambda: [parse_salary_text(t) for t in texts], args.repeat)
+    res.record('reference_us_per_call', ref / args.n * 1e6, 'us')
+    res.record('grammar_us_per_call', new / args.n * 1e6, 'us')
+    res.record('speedup', ref / new if new else 0.0, 'x')
+    res.record('grammar_calls_per_s', args.n / new if new else 0.0, 'calls/s')
+
+    reset_salary_branch_counts()
+    for t in texts:
+        parse_salary_text(t)
+    counts = salary_branch_counts()
+    calls = sum(counts.values())
+    for branch, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+        res.record(f'branch_share.{branch}', count / calls, '')
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
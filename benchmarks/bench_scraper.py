@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Scraper throughput against the local fixture replay server
+- Builds a fixture archive from synthetic jobs (or uses a recorded one via --archive)
+- Runs scrape_internshala_optimized against the replay server with no politeness delay
+- Reports pages/s and jobs/s for the serial and concurrent (--workers) modes, plus retries,
+  dead-lettered pages and HTTP status counts
+
+Usage: python benchmarks/bench_scraper.py --categories 4 --locations 4 --pages 3 --latency 0.02
+Results: benchmarks/results/scraper/<commit>.json
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from bench_common import BenchResults
+
+from run_metrics import RunMetrics
+from scraping.fixture_replay import ReplayServer, synthesize_fixtures
+from scraping.internshala_optimized import scrape_internshala_optimized
+from synthetic_jobs import CATEGORIES, SEARCH_LOCATIONS, generate_raw_jobs
+
+
+def run_mode(res: BenchResults, mode: str, archive: str, categories, locations, max_pages: int, server_opts: dict,
+             workers: int = 1, max_retries: int = 3):
+    metrics = RunMetrics(f'bench_scrape_{mode}', sample_rss=False)
+    with ReplayServer(archive, **server_opts) as server:
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = scrape_internshala_optimized(categories=categories, locations=locations, max_pages=max_pages,
+                                              delay=0.0, metrics=metrics, base_url=server.base_url,
+                                              workers=workers, max_retries=max_retries)
+        elapsed = time.perf_counter() - t0
+    pages = metrics.counters.get('pages_scraped', 0)
+    print(f"{mode}:")
+    res.record(f'{mode}.seconds', elapsed)
+    res.record(f'{mode}.pages_per_s', pages / elapsed if elapsed else 0.0, 'pages/s')
+    res.record(f'{mode}.jobs_per_s', len(df) / elapsed if elapsed else 0.0, 'jobs/s')
+    res.record(f'{mode}.jobs', len(df), 'jobs')
+    if 'page_parse' in metrics.histograms:
+        res.record(f'{mode}.parse_ms_per_page', metrics.histograms['page_parse'].total / max(1, pages) * 1000, 'ms')
+    res.record(f'{mode}.retries', metrics.counters.get('request_retries', 0), 'requests')
+    res.record(f'{mode}.dead_letters', len(df.attrs.get('dead_letters', [])), 'pages')
+    res.params[f'{mode}_status_counts'] = dict(server.status_counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scraper throughput against a local replay server')
+    parser.add_argument('--archive', default=None, help='Recorded fixture archive (default: synthesize one)')
+    parser.add_argument('--categories', type=int, default=4)
+    parser.add_argument('--locations', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=3, help='Listing pages per combination')
+    parser.add_argument('--jobs-per-page', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02, help='Server latency per response (seconds)')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=int, default=0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--workers', type=int, nargs='+', default=[4], help='Concurrent modes to run besides serial')
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    categories = CATEGORIES[:args.categories]
+    locations = SEARCH_LOCATIONS[:args.locations]
+    server_opts = {'latency': args.latency, 'jitter': args.jitter, 'error_rate': args.error_rate,
+                   'rate_429': args.rate_429, 'retry_after': args.retry_after}
+    res = BenchResults('scraper', {
+        'combinations': len(categories) * len(locations), 'pages': args.pages, 'jobs_per_page': args.jobs_per_page,
+        **server_opts, 'archive': args.archive or 'synthetic',
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = args.archive
+        if archive is None:
+            archive = os.path.join(tmp, 'fixtures.zip')
+            n_jobs = len(categories) * len(locations) * args.pages * args.jobs_per_page
+            jobs = generate_raw_jobs(n_jobs, dup_rate=0.3, exact_dup_rate=0.0).to_dict('records')
+            count = synthesize_fixtures(archive, jobs, categories, locations, args.pages, args.jobs_per_page)
+            print(f"Synthesized {count} listing pages")
+        run_mode(res, 'serial', archive, categories, locations, args.pages + 1, server_opts,
+                 max_retries=args.max_retries)
+        for workers in args.workers:
+            if workers > 1:
+                run_mode(res, f'concurrent{workers}', archive, categories, locations, args.pages + 1, server_opts,
+                         workers=workers, max_retries=args.max_retries)
+
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Similar-job search: TF-IDF + LSH build time, and recall/latency against exact search
+- Cleans synthetic raw rows in --chunk-rows chunks with different seeds until --rows
+  distinct postings exist (cleaning collapses repeated synthetic postings, and tiling
+  would only add exact duplicates)
+- Times vectorizing + hashing, then for --queries sampled postings compares the LSH top-k
+  (with and without multi-probe) with brute-force cosine over every posting
+- Recall@k counts returned postings scoring at least the exact k-th similarity, so
+  ties with equal vectors are not counted as misses
+
+Usage: python benchmarks/bench_similar_jobs.py --rows 100000
+Results: benchmarks/results/similar_jobs/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_common import REF_DT, BenchResults
+
+from data_cleaning import clean_jobs
+from similar_jobs import TABLES, SimilarJobs
+from synthetic_jobs import generate_raw_jobs
+
+
+def cleaned_postings(rows: int, chunk_rows: int, seed: int, max_chunks: int) -> pd.DataFrame:
+    df, chunk = pd.DataFrame(), 0
+    # later chunks add fewer new postings as the generator's title/company/city space fills up
+    while len(df) < rows and chunk < max_chunks:
+        cleaned = clean_jobs(generate_raw_jobs(chunk_rows, seed=seed + chunk), ref_dt=REF_DT)
+        df = pd.concat([df, cleaned], ignore_index=True).drop_duplicates('job_id', ignore_index=True)
+        chunk += 1
+        print(f"  {len(df):,} distinct postings after {chunk} chunk(s)")
+    return df.iloc[:rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark similar-job search')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--chunk-rows', type=int, default=300_000, help='Raw synthetic rows cleaned per chunk')
+    parser.add_argument('--max-chunks', type=int, default=8)
+    parser.add_argument('--tables', type=int, default=TABLES)
+    parser.add_argument('--bits', type=int, default=None)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    print(f"Generating and cleaning postings until {args.rows:,} remain...")
+    df = cleaned_postings(args.rows, args.chunk_rows, args.seed, args.max_chunks)
+    res = BenchResults('similar_jobs', {'rows': len(df), 'tables': args.tables, 'bits': args.bits, 'top': args.top})
+
+    t0 = time.perf_counter()
+    index = SimilarJobs.build(df, args.tables, args.bits, args.seed)
+    build = time.perf_counter() - t0
+    res.record('build_seconds', build)
+    res.record('build_rows_per_s', index.rows / build if build else 0.0, 'rows/s')
+    res.record('bits', index.bits, '')
+    res.record('terms', len(index.vocab), '')
+
+    queries = np.random.default_rng(args.seed).choice(index.rows, min(args.queries, index.rows), replace=False)
+    exact_times, exact = [], {}
+    for q in queries:
+        t0 = time.perf_counter()
+        exact[q] = index.similar(row=q, k=args.top, exact=True)['similarity'].to_numpy()
+        exact_times.append(time.perf_counter() - t0)
+    res.record('exact_query_ms', statistics.median(exact_times) * 1e3, 'ms')
+
+    for label, multiprobe in (('multiprobe', True), ('single_probe', False)):
+        times, recalls, candidates = [], [], []
+        for q in queries:
+            t0 = time.perf_counter()
+            got = index.similar(row=q, k=args.top, multiprobe=multiprobe)['similarity'].to_numpy()
+            times.append(time.perf_counter() - t0)
+            kth = exact[q][-1] if len(exact[q]) else 0.0
+            recalls.append(float((got >= kth - 1e-5).sum()) / max(len(exact[q]), 1))
+            candidates.append(len(index.candidates(index.keys[q], multiprobe)))
+        res.record(f'{label}.query_ms', statistics.median(times) * 1e3, 'ms')
+        res.record(f'{label}.recall_at_k', float(np.mean(recalls)), '')
+        res.record(f'{label}.candidates_share', float(np.mean(candidates)) / index.rows, '')
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Inverted skill index: build, incremental update and boolean query latency vs a row scan
+- Cleans synthetic rows once and tiles them to --rows postings (job_ids made unique per tile)
+- Times a full build, save/load, and appending one new --session-rows collection session
+- Times each query against the index (median of --repeat) and against re-splitting
+  skills_clean on every row, as a query had to before, and checks that both return
+  the same jobs
+
+Usage: python benchmarks/bench_skill_index.py --rows 1000000
+Results: benchmarks/results/skill_index/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_common import BenchResults, add_clean_rows_argument, cleaned_synthetic, tile_rows
+
+from skill_index import SkillIndex
+
+
+def tile(cleaned: pd.DataFrame, rows: int, session: str) -> pd.DataFrame:
+    frame = tile_rows(cleaned, rows).copy()
+    frame['job_id'] = frame['job_id'].astype(str) + f'-{session}-' + (np.arange(rows) // len(cleaned)).astype(str)
+    frame['collection_session'] = session
+    return frame
+
+
+def scan_query(df: pd.DataFrame, all_of, none_of=(), city=None) -> set:
+    """The pre-index approach: split and lowercase every row's skills for each query."""
+    tokens = df['skills_clean'].fillna('').str.lower().str.split(',').map(lambda parts: {p.strip() for p in parts})
+    mask = tokens.map(lambda s: all(t in s for t in all_of) and not any(t in s for t in none_of)).to_numpy(bool)
+    if city is not None:
+        mask &= (df['city_norm'].str.lower() == city.lower()).to_numpy()
+    return set(df['job_id'][mask])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the inverted skill index')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    add_clean_rows_argument(parser)
+    parser.add_argument('--session-rows', type=int, default=10_000, help='Rows in the incrementally added session')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    cleaned = cleaned_synthetic(min(args.rows, args.clean_rows), seed=args.seed)
+    df = tile(cleaned, args.rows, 'base')
+    res = BenchResults('skill_index', {'rows': args.rows, 'session_rows': args.session_rows})
+
+    t0 = time.perf_counter()
+    index = SkillIndex.from_frame(df)
+    build = time.perf_counter() - t0
+    res.record('build_seconds', build)
+    res.record('build_rows_per_s', len(df) / build if build else 0.0, 'rows/s')
+    res.record('skills', len(index.postings), '')
+    res.record('postings', sum(len(p) for p in index.postings.values()), '')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'skill_index.npz')
+        res.time('save_seconds', lambda: index.save(path), 1)
+        res.record('index_mb', os.path.getsize(path) / 1e6, 'MB')
+        res.time('load_seconds', lambda: SkillIndex.load(path), 3)
+
+    session = tile(cleaned.sample(min(args.session_rows, len(cleaned)), random_state=args.seed),
+                   args.session_rows, 'new')
+    res.time('update_session_seconds', lambda: index.update(session), 1)
+
+    top = list(index.top_skills(6).index)
+    city = df['city_norm'].value_counts().index[0]
+    queries = {
+        'two_skills': (f'"{top[0]}" AND "{top[1]}"', dict(), [top[0], top[1]], [], None),
+        'two_skills_city': (f'"{top[0]}" AND "{top[3]}"', dict(city=city), [top[0], top[3]], [], city),
+        'three_skills_not': (f'"{top[1]}" AND "{top[2]}" AND "{top[4]}" AND NOT "{top[5]}"', dict(),
+                             [top[1], top[2], top[4]], [top[5]], None),
+    }
+    full = pd.concat([df, session], ignore_index=True)
+    for name, (expr, filters, all_of, none_of, scan_city) in queries.items():
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            ids = index.query(expr, **filters)
+            times.append(time.perf_counter() - t0)
+        res.record(f'{name}.index_ms', statistics.median(times) * 1e3, 'ms')
+        res.record(f'{name}.matches', len(ids), 'rows')
+        t0 = time.perf_counter()
+        expected = scan_query(full, all_of, none_of, scan_city)
+        scan = time.perf_counter() - t0
+        res.record(f'{name}.scan_ms', scan * 1e3, 'ms')
+        if set(ids) != expected:
+            print(f"{name}: index returned {len(ids)} jobs, scan {len(expected)}")
+            sys.exit(1)
+    print("Index results match the row scan")
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
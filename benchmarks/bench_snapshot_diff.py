@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Snapshot diff: fingerprint merge vs a pandas outer merge on job_id
+- Builds an earlier snapshot of --rows distinct postings and a later one that drops
+  --churn of them, adds as many new ones and rewrites salary_text on --changed of the rest
+- Times diff_snapshots (chunked fingerprints, partition sort, searchsorted merge) with
+  fingerprints spilled to disk every --spill-rows, and the pandas approach: read both
+  CSVs and outer-merge them, comparing every tracked text column
+- Runs each in a fresh process, recording its peak RSS above the RSS after imports, and
+  checks both find the same added/removed/changed counts
+
+Usage: python benchmarks/bench_snapshot_diff.py --rows 2000000
+Results: benchmarks/results/snapshot_diff/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_common import BenchResults
+
+from run_metrics import RssSampler, current_rss_mb
+from snapshot_diff import KEY_COLUMN, TRACKED_FIELDS, diff_snapshots
+from synthetic_jobs import iter_raw_job_chunks
+
+
+def write_snapshots(tmp: str, rows: int, churn: float, changed: float, seed: int):
+    rng = np.random.default_rng(seed)
+    old_path, new_path = os.path.join(tmp, 'old.csv'), os.path.join(tmp, 'new.csv')
+    n_new = int(rows * churn)
+    chunks = iter_raw_job_chunks(rows + n_new, chunk_size=500_000, seed=seed, dup_rate=0.0, exact_dup_rate=0.0)
+    written = 0
+    for i, chunk in enumerate(chunks):
+        chunk = chunk.drop_duplicates(KEY_COLUMN)
+        is_old = np.arange(written, written + len(chunk)) < rows
+        written += len(chunk)
+        old, new = chunk[is_old], chunk[~is_old]
+        keep = rng.random(len(old)) >= churn
+        later = old[keep].copy()
+        edit = rng.random(len(later)) < changed
+        later.loc[edit, 'salary_text'] = later.loc[edit, 'salary_text'].fillna('') + ' (revised)'
+        later = pd.concat([later, new]).assign(collection_session='20250108_000000')
+        old.to_csv(old_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        later.to_csv(new_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    return old_path, new_path
+
+
+def pandas_diff(old_path: str, new_path: str):
+    cols = [KEY_COLUMN] + TRACKED_FIELDS
+    old = pd.read_csv(old_path, usecols=cols, dtype=str).drop_duplicates(KEY_COLUMN, keep='last')
+    new = pd.read_csv(new_path, usecols=cols, dtype=str).drop_duplicates(KEY_COLUMN, keep='last')
+    merged = old.merge(new, on=KEY_COLUMN, how='outer', indicator=True, suffixes=('_old', '_new'))
+    both = merged[merged['_merge'] == 'both']
+    changed = np.zeros(len(both), dtype=bool)
+    for field in TRACKED_FIELDS:
+        a, b = both[f'{field}_old'], both[f'{field}_new']
+        changed |= ~((a == b) | (a.isna() & b.isna())).to_numpy()
+    return (int((merged['_merge'] == 'right_only').sum()), int((merged['_merge'] == 'left_only').sum()),
+            int(changed.sum()))
+
+
+def _child(target: str, old_path: str, new_path: str, spill_rows: int, workdir: str, conn):
+    base = current_rss_mb() or 0.0
+    sampler = RssSampler(interval=0.02).start()
+    t0 = time.perf_counter()
+    if target == 'fingerprint':
+        diff = diff_snapshots(old_path, new_path, spill_rows=spill_rows, workdir=workdir)
+        out = (len(diff.added), len(diff.removed), len(diff.changed_new), diff.old_rows + diff.new_rows)
+    else:
+        out = pandas_diff(old_path, new_path)
+    seconds = time.perf_counter() - t0
+    sampler.stop()
+    conn.send((seconds, sampler.peak_mb - base, out))
+    conn.close()
+
+
+def measured(target: str, old_path: str, new_path: str, spill_rows: int, workdir: str):
+    """(seconds, peak RSS above the post-import RSS in MB, result) measured in a spawned process."""
+    ctx = multiprocessing.get_context('spawn')
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(target, old_path, new_path, spill_rows, workdir, child))
+    proc.start()
+    out = parent.recv()
+    proc.join()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the snapshot diff engine')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--churn', type=float, default=0.05, help='Share of postings removed (and as many added)')
+    parser.add_argument('--changed', type=float, default=0.03, help='Share of kept postings with a new salary_text')
+    parser.add_argument('--spill-rows', type=int, default=500_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    res = BenchResults('snapshot_diff', {'rows': args.rows, 'churn': args.churn, 'changed': args.changed,
+                                         'spill_rows': args.spill_rows})
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Writing snapshots of ~{args.rows:,} postings...")
+        old_path, new_path = write_snapshots(tmp, args.rows, args.churn, args.changed, args.seed)
+        res.record('old_csv_mb', os.path.getsize(old_path) / 1e6, 'MB')
+
+        workdir = os.path.join(tmp, 'work')
+        seconds, peak, (added, removed, changed, rows) = measured('fingerprint', old_path, new_path, args.spill_rows,
+                                                                 workdir)
+        res.record('fingerprint_diff_seconds', seconds)
+        res.record('fingerprint_diff_rows_per_s', rows / seconds if seconds else 0.0, 'rows/s')
+        res.record('fingerprint_diff_peak_rss_mb', peak, 'MB')
+        res.record('added', added, 'rows')
+        res.record('removed', removed, 'rows')
+        res.record('changed', changed, 'rows')
+
+        seconds, peak, counts = measured('pandas', old_path, new_path, args.spill_rows, workdir)
+        res.record('pandas_merge_seconds', seconds)
+        res.record('pandas_merge_peak_rss_mb', peak, 'MB')
+        res.record('counts_match', float(counts == (added, removed, changed)), '')
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
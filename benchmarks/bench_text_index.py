@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+BM25 text index: build throughput, incremental segments and query latency vs str.contains
+- Cleans synthetic rows once and tiles them to --rows (job_ids made unique per tile)
+- Times the initial build, adding --sessions new collection sessions as segments, a
+  full optimize (merge), and opening the memory-mapped index
+- Times ranked queries (median of --repeat) against a case-insensitive str.contains scan
+  of title + description, the only way to search them before
+
+Usage: python benchmarks/bench_text_index.py --rows 1000000
+Results: benchmarks/results/text_index/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_common import BenchResults, add_clean_rows_argument, cleaned_synthetic, tile_rows
+
+from text_index import TextIndex
+
+QUERIES = ['react developer', 'senior java developer', 'python data analytics', 'mongodb']
+
+
+def tile(cleaned: pd.DataFrame, rows: int, session: str) -> pd.DataFrame:
+    frame = tile_rows(cleaned, rows).copy()
+    frame['job_id'] = frame['job_id'].astype(str) + f'-{session}-' + (np.arange(rows) // len(cleaned)).astype(str)
+    frame['collection_session'] = session
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the BM25 text index')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    add_clean_rows_argument(parser)
+    parser.add_argument('--sessions', type=int, default=3, help='Incremental sessions to add after the build')
+    parser.add_argument('--session-rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    cleaned = cleaned_synthetic(min(args.rows, args.clean_rows), seed=args.seed)
+    df = tile(cleaned, args.rows, 'base')
+    res = BenchResults('text_index', {'rows': args.rows, 'sessions': args.sessions, 'session_rows': args.session_rows})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'text_index')
+        index = TextIndex(root)
+        t0 = time.perf_counter()
+        index.update(df)
+        build = time.perf_counter() - t0
+        res.record('build_seconds', build)
+        res.record('build_rows_per_s', len(df) / build if build else 0.0, 'rows/s')
+        res.record('index_mb', sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(root) for f in fs) / 1e6,
+                   'MB')
+
+        frames = [df]
+        for i in range(args.sessions):
+            session = tile(cleaned.sample(min(args.session_rows, len(cleaned)), random_state=args.seed + i),
+                           args.session_rows, f'new{i}')
+            frames.append(session)
+            res.time(f'update_session_{i}_seconds', lambda: index.update(session), 1)
+        res.time('open_seconds', lambda: TextIndex(root), 3)
+
+        full = pd.concat(frames, ignore_index=True)
+        text = (full['title_clean'].fillna('') + ' ' + full['description'].fillna('')).str.lower()
+        for name, optimized in (('segmented', False), ('optimized', True)):
+            if optimized:
+                res.time('optimize_seconds', index.optimize, 1)
+                index = TextIndex(root)
+            for q in QUERIES:
+                key = q.replace(' ', '_')
+                times = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    hits = index.search(q, args.top)
+                    times.append(time.perf_counter() - t0)
+                res.record(f'{name}.{key}.search_ms', statistics.median(times) * 1e3, 'ms')
+                if optimized:
+                    continue
+                res.record(f'{key}.hits', len(hits), 'rows')
+                t0 = time.perf_counter()
+                mask = np.ones(len(text), dtype=bool)
+                for term in q.split():
+                    mask &= text.str.contains(term, regex=False).to_numpy()
+                res.record(f'{key}.contains_scan_ms', (time.perf_counter() - t0) * 1e3, 'ms')
+        del index
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
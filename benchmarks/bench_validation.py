@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Schema validation cost relative to cleaning
+- Generates --rows synthetic raw rows, validates them against the raw contract, cleans
+  them and validates the cleaned frame against the cleaned contract
+- Reports each validation time, rows/s and its share of the clean_jobs time, plus the
+  per-rule time for the slowest rules and the violation counts found
+
+Usage: python benchmarks/bench_validation.py --rows 1000000
+Results: benchmarks/results/validation/<commit>_rows<N>.json
+"""
+from __future__ import annotations
+import argparse
+import time
+
+from bench_common import REF_DT, BenchResults
+
+from data_cleaning import clean_jobs
+from schema_validation import CLEANED_CONTRACT, RAW_CONTRACT, validate
+from synthetic_jobs import generate_raw_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark schema validation against cleaning')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3, help='Repeats for the validation timings (best-of)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} raw rows...")
+    raw = generate_raw_jobs(args.rows, seed=args.seed)
+    res = BenchResults('validation', {'rows': args.rows})
+
+    t0 = time.perf_counter()
+    cleaned = clean_jobs(raw.copy(), ref_dt=REF_DT)
+    clean_seconds = time.perf_counter() - t0
+    res.record('clean_seconds', clean_seconds)
+    res.record('cleaned_rows', len(cleaned), 'rows')
+
+    for label, frame, contract in (('raw', raw, RAW_CONTRACT), ('cleaned', cleaned, CLEANED_CONTRACT)):
+        seconds = res.time(f'{label}.validate_seconds', lambda: validate(frame, contract), args.repeat)
+        res.record(f'{label}.rows_per_s', len(frame) / seconds if seconds else 0.0, 'rows/s')
+        res.record(f'{label}.share_of_clean_pct', seconds / clean_seconds * 100, '%')
+        result = validate(frame, contract)
+        res.record(f'{label}.error_rows', int(result.invalid('error').sum()), 'rows')
+        res.record(f'{label}.warn_rows', int(result.invalid('warn').sum()), 'rows')
+        rule_times = {}
+        for rule in result.rules:
+            t0 = time.perf_counter()
+            validate(frame, [rule])
+            rule_times[rule.name] = time.perf_counter() - t0
+        for name, seconds in sorted(rule_times.items(), key=lambda kv: -kv[1])[:3]:
+            res.record(f'{label}.rule.{name}_seconds', seconds)
+    res.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
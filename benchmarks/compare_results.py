@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files (e.g. the same benchmark on two commits).
+Prints each shared metric with its ratio new/old; ratios above --threshold are flagged
+(below 1/--threshold for metrics where higher is better).
+"""
+from __future__ import annotations
+import argparse
+import json
+
+# Metric name suffixes that improve upwards (throughput, speedups, accuracy/recall, hit rates);
+# everything else is a duration or size
+HIGHER_IS_BETTER = ('_per_s', 'speedup', 'recall_at_k', 'hit_rate', '_exact', '_identical', 'counts_match')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result JSON files')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=1.10, help='Flag metrics slower than this ratio')
+    args = parser.parse_args()
+
+    with open(args.old, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+
+    print(f"{old['benchmark']}: {old['commit']} -> {new['commit']}")
+    if old.get('params') != new.get('params'):
+        print(f"Warning: params differ ({old.get('params')} vs {new.get('params')})")
+    regressions = 0
+    for key in sorted(set(old['metrics']) & set(new['metrics'])):
+        a, b = old['metrics'][key], new['metrics'][key]
+        ratio = (b / a) if a else float('inf')
+        slower = (ratio < 1 / args.threshold) if key.endswith(HIGHER_IS_BETTER) else (ratio > args.threshold)
+        regressions += slower
+        print(f"  {key:<48} {a:>12.6g} {b:>12.6g}  x{ratio:.2f}{'  <-- regression' if slower else ''}")
+    print(f"{regressions} regression(s)")
+
+
+if __name__ == '__main__':
+    main()
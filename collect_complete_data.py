@@ -5,17 +5,29 @@ Focus: Maximum jobs with complete data from PROVEN working source
 Strategy: Prioritize Internshala (100% working) for guaranteed results
 """
 
+import argparse
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'scripts'))
 
 from datetime import datetime
 import pandas as pd
 
-def collect_complete_job_data():
+from run_metrics import RunMetrics
+from job_store import DEFAULT_STORE, JobStore
+
+def collect_complete_job_data(request_budget=None, full_grid=False, enrich=False, enrich_workers=4, archive_html=False):
     """
     Collect maximum complete job data from reliable source (Internshala)
     Focus on data completeness and volume
+    
+    Combinations are visited in order of their historical yield (new jobs per request,
+    data/raw/combination_yield.json); historically empty ones are mostly skipped and
+    request_budget caps the listing requests. full_grid=True visits every combination.
+    enrich=True fetches detail pages for postings not enriched before (see
+    src/scraping/detail_enrichment.py) and merges their fields into the raw dataset.
+    archive_html=True appends every listing page to data/raw/html_archive for offline re-parsing.
     """
     
     print("🎯 COMPLETE DATA COLLECTION - MAXIMUM JOBS WITH COMPLETE DATA")
@@ -23,6 +35,8 @@ def collect_complete_job_data():
     print("=" * 80)
     
     session_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    metrics = RunMetrics('collection')
+    metrics.info['collection_session'] = session_timestamp
     
     # Create data directory
     os.makedirs('data/raw', exist_ok=True)
@@ -35,6 +49,8 @@ def collect_complete_job_data():
     
     try:
         from scraping.internshala_optimized import scrape_internshala_optimized
+        from scraping.combo_scheduler import CombinationYield, DEFAULT_YIELD_TABLE
+        from scraping.page_archive import PageArchive
         
         # COMPREHENSIVE categories for maximum job coverage
         internshala_categories = [
@@ -81,14 +97,36 @@ def collect_complete_job_data():
         print(f"   Total combinations: {len(internshala_categories) * len(internshala_locations)}")
         print(f"   Estimated jobs: 1,500 - 3,000 unique jobs (first page only)")
         
+        # Schedule combinations by historical yield
+        yield_table = CombinationYield(DEFAULT_YIELD_TABLE)
+        grid = [(c, l) for c in internshala_categories for l in internshala_locations]
+        if full_grid:
+            planned, skipped = grid, []
+        else:
+            planned, skipped = yield_table.plan(grid, budget=request_budget)
+        print(f"   Scheduled combinations: {len(planned)} (skipped {len(skipped)} low-yield/empty)"
+              + (f", request budget {request_budget}" if request_budget else ""))
+        metrics.info.update({'combinations_planned': len(planned), 'combinations_skipped': len(skipped)})
+        
         print(f"\n🚀 Starting comprehensive Internshala collection...")
         
-        df_internshala = scrape_internshala_optimized(
-            categories=internshala_categories,
-            locations=internshala_locations,
-            max_pages=1,  # First page only for faster collection
-            delay=0.8     # Fast collection
-        )
+        with metrics.stage('scrape'):
+            df_internshala = scrape_internshala_optimized(
+                combinations=planned,
+                max_pages=1,  # First page only for faster collection
+                delay=0.8,    # Initial pace; adapts to server responses
+                metrics=metrics,
+                dead_letter_path=f"data/raw/failed_pages_{session_timestamp}.json",
+                request_budget=request_budget,
+                archive=PageArchive(session=session_timestamp) if archive_html else None
+            )
+        
+        # Learn per-combination yield for the next run
+        yield_table.update(df_internshala.attrs.get('combination_stats', []), session_timestamp)
+        yield_path = yield_table.save()
+        print(f"\n📈 Updated yield table: {yield_path}")
+        for line in yield_table.report_lines(10):
+            print(f"   {line}")
         
         print(f"\n✅ INTERNSHALA COLLECTION COMPLETED!")
         print(f"   📊 Total jobs collected: {len(df_internshala):,}")
@@ -98,13 +136,36 @@ def collect_complete_job_data():
             df_internshala['collection_session'] = session_timestamp
             df_internshala['collection_date'] = datetime.now().strftime('%Y-%m-%d')
             
-            # Save complete dataset
-            complete_filename = f"data/raw/complete_jobs_data_{session_timestamp}.csv"
-            df_internshala.to_csv(complete_filename, index=False)
+            if enrich:
+                from scraping.detail_enrichment import enrich_jobs
+                with metrics.stage('enrich'):
+                    df_internshala = enrich_jobs(df_internshala, workers=enrich_workers, metrics=metrics)
             
-            # Update main dataset
-            main_filename = "data/raw/unified_jobs_dataset.csv"
-            df_internshala.to_csv(main_filename, index=False)
+            with metrics.stage('save'):
+                # Save complete dataset
+                complete_filename = f"data/raw/complete_jobs_data_{session_timestamp}.csv"
+                df_internshala.to_csv(complete_filename, index=False)
+                
+                # Update main dataset
+                main_filename = "data/raw/unified_jobs_dataset.csv"
+                df_internshala.to_csv(main_filename, index=False)
+                
+                # Job -> (category, location) memberships; postings are stored once above
+                hits_filename = f"data/raw/job_hits_{session_timestamp}.csv"
+                df_hits = df_internshala.attrs.get('job_hits', pd.DataFrame())
+                df_hits.assign(collection_session=session_timestamp).to_csv(hits_filename, index=False)
+                df_hits.assign(collection_session=session_timestamp).to_csv("data/raw/unified_job_hits.csv", index=False)
+            # Versioned history of every run; only a full, unbudgeted grid with no dead-lettered
+            # pages sees the whole market, so only then are postings missing from this run closed
+            with metrics.stage('job_store'):
+                saw_everything = (full_grid and request_budget is None
+                                  and not df_internshala.attrs.get('dead_letters'))
+                with JobStore(DEFAULT_STORE) as store:
+                    stored = store.ingest(df_internshala, session_timestamp, full_snapshot=saw_everything)
+            print(f"\n🗄️ Job store {DEFAULT_STORE}: {stored['added']} added, {stored['changed']} changed, "
+                  f"{stored['closed']} closed, {stored['unchanged']} unchanged")
+            metrics.info['jobs_collected'] = len(df_internshala)
+            metrics_filename = metrics.write_json(os.path.join('reports', 'metrics', f'collection_{session_timestamp}.json'))
             
             # =================================================================
             # COMPREHENSIVE DATA QUALITY ANALYSIS
@@ -119,6 +180,8 @@ def collect_complete_job_data():
             print(f"   🔥 Total unique jobs: {total_jobs:,}")
             print(f"   💾 Complete dataset: {complete_filename}")
             print(f"   💾 Main dataset: {main_filename}")
+            print(f"   🔗 Category/location hits: {hits_filename} ({len(df_hits):,} rows)")
+            print(f"   ⏱️ Run metrics: {metrics_filename}")
             
             # Detailed quality analysis
             print(f"\n🔍 DATA COMPLETENESS ANALYSIS:")
@@ -217,7 +280,17 @@ if __name__ == "__main__":
     print("⏱️ Estimated time: 8-12 minutes for fast collection (first page only)")
     print("🎯 Target: 1,500+ jobs with high data completeness")
     
-    df = collect_complete_job_data()
+    parser = argparse.ArgumentParser(description='Collect Internshala jobs across the category × location grid')
+    parser.add_argument('--budget', type=int, default=None, help='Maximum listing requests for this run')
+    parser.add_argument('--full-grid', action='store_true', help='Visit every combination, ignoring yield history')
+    parser.add_argument('--enrich', action='store_true', help='Fetch detail pages for new postings')
+    parser.add_argument('--enrich-workers', type=int, default=4, help='Concurrent detail-page fetches')
+    parser.add_argument('--archive-html', action='store_true', help='Keep fetched listing pages in data/raw/html_archive')
+    args = parser.parse_args()
+    
+    df = collect_complete_job_data(request_budget=args.budget, full_grid=args.full_grid,
+                                   enrich=args.enrich, enrich_workers=args.enrich_workers,
+                                   archive_html=args.archive_html)
     
     if df is not None and len(df) > 0:
         print(f"\n🎊 MISSION ACCOMPLISHED! 🎊")
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Pre-aggregated analytics cube for Cross Platform Job Analytics
+- Cell key: collection session x city_norm x category_standard x experience_level x
+  posting week x job_type; queries roll sessions up unless filtered to some of them
+- Measures per cell: job count, salary count/sum/min/max and a mergeable
+  log-bucket quantile sketch of avg_salary_inr (relative error ~2%)
+- Built after cleaning; new collection sessions are merged in incrementally. Each session
+  keeps a fingerprint (rows + order-independent content hash of the cube inputs); when a
+  stored session's fingerprint changes (re-cleaned with different logic) only that
+  session's cells are dropped and re-aggregated, so other sessions' history is kept
+- Roll-ups (counts, means, quantiles, crosstabs) never touch row-level data
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_INPUT = os.path.join('data', 'processed', 'cleaned_jobs_dataset.csv')
+DEFAULT_CUBE = os.path.join('data', 'processed', 'analytics_cube.npz')
+
+KEY_COLUMNS = ['city_norm', 'category_standard', 'experience_level', 'posting_week', 'job_type']
+SOURCE_COLUMNS = {'posting_week': 'posting_date'}
+VALUE_COL = 'avg_salary_inr'
+PARTITION_COL = 'collection_session'
+PARTITION_KEY = 'partition'  # cell column holding the session; filter on it to query some sessions
+CELL_KEYS = [PARTITION_KEY] + KEY_COLUMNS
+LAYOUT_VERSION = 2
+MISSING = 'Unknown'
+
+# Sketch buckets: bucket i covers [GAMMA**i, GAMMA**(i+1)); ~2% relative error on quantiles
+SKETCH_GAMMA = 1.04
+_LOG_GAMMA = np.log(SKETCH_GAMMA)
+
+MEASURES = ['count', 'salary_count', 'salary_sum', 'salary_min', 'salary_max']
+
+
+def _week_key(dates: pd.Series) -> pd.Series:
+    """Monday of the posting week as YYYY-MM-DD (MISSING when unknown)."""
+    d = pd.to_datetime(dates, errors='coerce')
+    monday = d - pd.to_timedelta(d.dt.weekday, unit='D')
+    return monday.dt.strftime('%Y-%m-%d').fillna(MISSING)
+
+
+def _bucket_of(values: np.ndarray) -> np.ndarray:
+    return np.floor(np.log(values) / _LOG_GAMMA).astype(np.int32)
+
+
+def _bucket_value(buckets: np.ndarray) -> np.ndarray:
+    # geometric midpoint of the bucket
+    return np.exp((buckets.astype(np.float64) + 0.5) * _LOG_GAMMA)
+
+
+class AnalyticsCube:
+    """Materialized aggregates over the cleaned jobs dataset."""
+
+    def __init__(self, cells: Optional[pd.DataFrame] = None, sketch: Optional[pd.DataFrame] = None,
+                 partitions: Optional[Iterable[str]] = None, fingerprints: Optional[Dict[str, dict]] = None):
+        self.cells = cells if cells is not None else pd.DataFrame(columns=CELL_KEYS + MEASURES)
+        # long format: (cell row, bucket, n)
+        self.sketch = sketch if sketch is not None else pd.DataFrame({'cell': np.empty(0, np.int64), 'bucket': np.empty(0, np.int32), 'n': np.empty(0, np.int64)})
+        self.partitions: List[str] = list(partitions or [])
+        # partition -> {'rows': n, 'hash': hex}
+        self.fingerprints: Dict[str, dict] = dict(fingerprints or {})
+
+    # ------------------------------------------------------------------
+    # Building / incremental maintenance
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _keys_frame(df: pd.DataFrame) -> pd.DataFrame:
+        keys = {}
+        for k in KEY_COLUMNS:
+            src = SOURCE_COLUMNS.get(k, k)
+            if src not in df.columns:
+                keys[k] = pd.Series(MISSING, index=df.index)
+            elif k == 'posting_week':
+                keys[k] = _week_key(df[src])
+            else:
+                keys[k] = df[src].astype(object).where(df[src].notna(), MISSING).astype(str)
+        return pd.DataFrame(keys, index=df.index)
+
+    @staticmethod
+    def _salaries(df: pd.DataFrame) -> pd.Series:
+        sal = pd.to_numeric(df[VALUE_COL], errors='coerce') if VALUE_COL in df.columns else pd.Series(np.nan, index=df.index)
+        return sal.where(sal > 0)
+
+    @classmethod
+    def fingerprint(cls, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> Dict[str, dict]:
+        """Per partition: row count and a hash of the cube inputs that ignores row order."""
+        work = cls._keys_frame(df).assign(_sal=cls._salaries(df))
+        hashed = pd.Series(pd.util.hash_pandas_object(work, index=False).to_numpy(np.uint64), index=df.index)
+        g = hashed.groupby(df[partition_col].astype(str).to_numpy(), sort=True)
+        # uint64 sums wrap, which keeps the combination order-independent
+        return {str(p): {'rows': int(n), 'hash': f'{int(h):016x}'} for p, n, h in zip(g.size().index, g.size(), g.sum())}
+
+    @classmethod
+    def _aggregate(cls, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> 'AnalyticsCube':
+        keys = cls._keys_frame(df)
+        part = df[partition_col].astype(str) if partition_col in df.columns else pd.Series('', index=df.index)
+        keys.insert(0, PARTITION_KEY, part)
+        sal = cls._salaries(df)
+        work = keys.assign(_sal=sal)
+        g = work.groupby(CELL_KEYS, sort=True, dropna=False)
+        cells = pd.DataFrame({
+            'count': g.size(),
+            'salary_count': g['_sal'].count(),
+            'salary_sum': g['_sal'].sum(),
+            'salary_min': g['_sal'].min(),
+            'salary_max': g['_sal'].max(),
+        }).reset_index()
+        cell_of_row = g.ngroup().to_numpy()
+        valid = sal.notna().to_numpy()
+        sk = pd.DataFrame({'cell': cell_of_row[valid], 'bucket': _bucket_of(sal.to_numpy()[valid])})
+        sketch = sk.groupby(['cell', 'bucket']).size().rename('n').reset_index()
+        return cls(cells, sketch)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> 'AnalyticsCube':
+        cube = cls()
+        cube.update(df, partition_col)
+        return cube
+
+    def merge(self, other: 'AnalyticsCube') -> 'AnalyticsCube':
+        """Combine two cubes; counts/sums add, min/max fold, sketches add bucket-wise."""
+        parts = self.partitions + [p for p in other.partitions if p not in self.partitions]
+        fingerprints = {**self.fingerprints, **other.fingerprints}
+        if self.cells.empty:
+            return AnalyticsCube(other.cells, other.sketch, parts, fingerprints)
+        offset = len(self.cells)
+        cells = pd.concat([self.cells, other.cells], ignore_index=True)
+        sketch = pd.concat([self.sketch, other.sketch.assign(cell=other.sketch['cell'] + offset)], ignore_index=True)
+        g = cells.groupby(CELL_KEYS, sort=True, dropna=False)
+        merged = g.agg(count=('count', 'sum'), salary_count=('salary_count', 'sum'), salary_sum=('salary_sum', 'sum'),
+                       salary_min=('salary_min', 'min'), salary_max=('salary_max', 'max')).reset_index()
+        remap = g.ngroup().to_numpy()
+        sketch = sketch.assign(cell=remap[sketch['cell'].to_numpy()]).groupby(['cell', 'bucket'])['n'].sum().reset_index()
+        return AnalyticsCube(merged, sketch, parts, fingerprints)
+
+    def drop(self, partitions: Iterable[str]):
+        """Remove the cells (and sketch entries) of the given partitions."""
+        gone = set(partitions)
+        keep = ~self.cells[PARTITION_KEY].isin(gone).to_numpy()
+        remap = np.cumsum(keep) - 1
+        kept = keep[self.sketch['cell'].to_numpy()]
+        sketch = self.sketch[kept]
+        self.sketch = sketch.assign(cell=remap[sketch['cell'].to_numpy()]).reset_index(drop=True)
+        self.cells = self.cells[keep].reset_index(drop=True)
+        self.partitions = [p for p in self.partitions if p not in gone]
+        self.fingerprints = {p: f for p, f in self.fingerprints.items() if p not in gone}
+
+    def update(self, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> List[str]:
+        """
+        Fold rows of partitions not yet in the cube into it, and re-aggregate partitions
+        whose rows changed since they were folded (e.g. re-cleaned with new logic).
+        Without a partition column the cube is rebuilt from df.
+        Returns the partitions that were added or re-aggregated.
+        """
+        if partition_col not in df.columns:
+            fresh = self._aggregate(df, partition_col)
+            self.cells, self.sketch, self.partitions, self.fingerprints = fresh.cells, fresh.sketch, [], {}
+            return []
+        parts = df[partition_col].astype(str)
+        fingerprints = self.fingerprint(df, partition_col)
+        changed = [p for p in self.partitions if p in fingerprints and self.fingerprints.get(p) != fingerprints[p]]
+        if changed:
+            self.drop(changed)
+        new_parts = [p for p in pd.unique(parts) if p not in self.partitions]
+        if not new_parts:
+            return []
+        delta = self._aggregate(df[parts.isin(new_parts)], partition_col)
+        delta.partitions = list(new_parts)
+        delta.fingerprints = {p: fingerprints[p] for p in new_parts}
+        merged = self.merge(delta)
+        self.cells, self.sketch, self.partitions = merged.cells, merged.sketch, merged.partitions
+        self.fingerprints = merged.fingerprints
+        return list(new_parts)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        arrays = {f'key_{k}': self.cells[k].astype(str).to_numpy(dtype=str) for k in CELL_KEYS}
+        arrays.update({m: self.cells[m].to_numpy(dtype=np.float64) for m in MEASURES})
+        arrays.update({
+            'sketch_cell': self.sketch['cell'].to_numpy(np.int64),
+            'sketch_bucket': self.sketch['bucket'].to_numpy(np.int32),
+            'sketch_n': self.sketch['n'].to_numpy(np.int64),
+            'meta': np.array(json.dumps({'layout': LAYOUT_VERSION, 'gamma': SKETCH_GAMMA, 'keys': KEY_COLUMNS,
+                                      'partitions': self.partitions, 'fingerprints': self.fingerprints})),
+        })
+        tmp = path + '.tmp.npz'
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'AnalyticsCube':
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z['meta']))
+            if (meta.get('layout') != LAYOUT_VERSION or meta.get('gamma') != SKETCH_GAMMA
+                    or meta.get('keys') != KEY_COLUMNS):
+                raise ValueError(f"Cube layout in {path} does not match this version; rebuild it")
+            cells = pd.DataFrame({k: z[f'key_{k}'].astype(object) for k in CELL_KEYS})
+            for m in MEASURES:
+                cells[m] = z[m]
+            sketch = pd.DataFrame({'cell': z['sketch_cell'], 'bucket': z['sketch_bucket'], 'n': z['sketch_n']})
+        cells['count'] = cells['count'].astype(np.int64)
+        cells['salary_count'] = cells['salary_count'].astype(np.int64)
+        return cls(cells, sketch, meta.get('partitions', []), meta.get('fingerprints', {}))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _select(self, filters: Optional[Dict[str, object]]) -> np.ndarray:
+        mask = np.ones(len(self.cells), dtype=bool)
+        for col, val in (filters or {}).items():
+            vals = list(val) if isinstance(val, (list, tuple, set, pd.Index)) else [val]
+            mask &= self.cells[col].isin([MISSING if v is None else str(v) for v in vals]).to_numpy()
+        return mask
+
+    def _groups(self, by: Sequence[str], mask: np.ndarray, dropna: bool) -> tuple[pd.DataFrame, np.ndarray]:
+        cells = self.cells[mask]
+        if dropna:
+            keep = np.ones(len(cells), dtype=bool)
+            for b in by:
+                keep &= (cells[b] != MISSING).to_numpy()
+            cells = cells[keep]
+        gid = cells.groupby(list(by), sort=True).ngroup().to_numpy() if by else np.zeros(len(cells), np.int64)
+        return cells, gid
+
+    def rollup(self, by: Sequence[str], filters: Optional[Dict[str, object]] = None,
+               quantiles: Sequence[float] = (), dropna: bool = True) -> pd.DataFrame:
+        """Aggregate cells to `by` with count, salary mean/min/max and optional sketch quantiles."""
+        by = list(by)
+        cells, gid = self._groups(by, self._select(filters), dropna)
+        if cells.empty:
+            return pd.DataFrame(columns=by + ['count', 'salary_count', 'salary_mean'] + [f'q{int(q * 100)}' for q in quantiles])
+        agg = cells.assign(_g=gid).groupby('_g').agg(
+            count=('count', 'sum'), salary_count=('salary_count', 'sum'), salary_sum=('salary_sum', 'sum'),
+            salary_min=('salary_min', 'min'), salary_max=('salary_max', 'max'),
+            **{b: (b, 'first') for b in by})
+        agg['salary_mean'] = agg['salary_sum'] / agg['salary_count'].where(agg['salary_count'] > 0)
+        if quantiles:
+            qs = self._sketch_quantiles(cells.index.to_numpy(), gid, len(agg), quantiles)
+            for j, q in enumerate(quantiles):
+                # bucket midpoints can overshoot the observed range at the tails
+                agg[f'q{int(q * 100)}'] = np.clip(qs[:, j], agg['salary_min'], agg['salary_max'])
+        out = agg.set_index(by) if by else agg
+        return out.drop(columns=['salary_sum']).sort_values('count', ascending=False, kind='stable')
+
+    def _sketch_quantiles(self, cell_rows: np.ndarray, gid: np.ndarray, n_groups: int,
+                          quantiles: Sequence[float]) -> np.ndarray:
+        cell_to_group = np.full(len(self.cells), -1, dtype=np.int64)
+        cell_to_group[cell_rows] = gid
+        sk = self.sketch
+        grp = cell_to_group[sk['cell'].to_numpy()]
+        sel = grp >= 0
+        merged = pd.DataFrame({'g': grp[sel], 'bucket': sk['bucket'].to_numpy()[sel], 'n': sk['n'].to_numpy()[sel]})
+        merged = merged.groupby(['g', 'bucket'], sort=True)['n'].sum().reset_index()
+        out = np.full((n_groups, len(quantiles)), np.nan)
+        qs = np.asarray(quantiles, dtype=np.float64)
+        for g, part in merged.groupby('g', sort=False):
+            cum = np.cumsum(part['n'].to_numpy())
+            idx = np.minimum(np.searchsorted(cum, qs * cum[-1], side='left'), len(cum) - 1)
+            out[g] = _bucket_value(part['bucket'].to_numpy()[idx])
+        return out
+
+    def crosstab(self, row: str, col: str, filters: Optional[Dict[str, object]] = None,
+                 top_rows: Optional[int] = None, top_cols: Optional[int] = None) -> pd.DataFrame:
+        counts = self.rollup([row, col], filters)['count']
+        ct = counts.unstack(fill_value=0).astype(np.int64) if not counts.empty else pd.DataFrame()
+        if top_rows is not None and not ct.empty:
+            ct = ct.loc[ct.sum(axis=1).sort_values(ascending=False).head(top_rows).index]
+        if top_cols is not None and not ct.empty:
+            ct = ct[ct.sum(axis=0).sort_values(ascending=False).head(top_cols).index]
+        return ct
+
+
+def load_or_build(path: str, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> tuple[AnalyticsCube, List[str]]:
+    """Load the cube at path (if compatible) and fold in new partitions of df."""
+    cube = AnalyticsCube()
+    if os.path.exists(path):
+        try:
+            cube = AnalyticsCube.load(path)
+        except (ValueError, KeyError) as e:
+            print(f"Rebuilding analytics cube: {e}")
+    added = cube.update(df, partition_col)
+    return cube, added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build/update and query the pre-aggregated analytics cube')
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='Cleaned dataset (CSV or Parquet)')
+    parser.add_argument('--cube', default=DEFAULT_CUBE)
+    parser.add_argument('--rebuild', action='store_true', help='Discard the stored cube before ingesting')
+    parser.add_argument('--show', nargs='*', default=['city_norm'], help='Roll-up dimensions to print')
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(args.cube):
+        os.remove(args.cube)
+    if os.path.exists(args.input):
+        df = pd.read_parquet(args.input) if args.input.endswith('.parquet') else pd.read_csv(args.input)
+        cube, added = load_or_build(args.cube, df)
+        cube.save(args.cube)
+        print(f"Cube: {len(cube.cells)} cells, partitions added: {len(added)} (total {len(cube.partitions)})")
+    else:
+        cube = AnalyticsCube.load(args.cube)
+    if args.show:
+        print(cube.rollup(args.show, quantiles=(0.25, 0.5, 0.75)).head(20).round(0).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,15 @@
 Data Cleaning Pipeline for Cross Platform Job Analytics (Phase 2)
 - Loads raw dataset
 - Cleans/standardizes key fields
-- Parses salary and experience
+- Parses salary (memoized across runs in a SQLite cache) and experience
 - Standardizes dates
 - Creates derived features
-- Saves cleaned dataset and appends summary to report
+- Validates the raw and cleaned frames against column contracts (optionally quarantining rows
+  that break an error rule to a side file)
+- Saves cleaned dataset (CSV plus a Parquet twin for columnar queries) and appends summary to report
+- Folds new collection sessions into the pre-aggregated analytics cube, the inverted skill index
+  and the BM25 title/description index
+- Times every step and writes a JSON metrics file (optionally a cProfile dump)
 """
 from __future__ import annotations
 import argparse
@@ -15,7 +20,13 @@ from datetime import datetime, timedelta
 import re
 import pandas as pd
 
-from salary_parser import parse_salary_text
+from salary_parser import parse_salary_text, reset_salary_branch_counts, salary_branch_counts
+from salary_cache import DEFAULT_SALARY_CACHE, SalaryParseCache
+from analytics_cube import DEFAULT_CUBE, load_or_build
+from skill_index import DEFAULT_INDEX as DEFAULT_SKILL_INDEX, load_or_build as load_or_build_skill_index
+from text_index import DEFAULT_INDEX as DEFAULT_TEXT_INDEX, load_or_build as load_or_build_text_index
+from schema_validation import CLEANED_CONTRACT, DEFAULT_QUARANTINE, RAW_CONTRACT, quarantine, validate
+from run_metrics import RunMetrics, maybe_profile
 
 DEFAULT_INPUT = os.path.join('data', 'raw', 'unified_jobs_dataset.csv')
 DEFAULT_OUTPUT = os.path.join('data', 'processed', 'cleaned_jobs_dataset.csv')
@@ -195,153 +206,268 @@ def normalize_skill_token(token: str):
     return (repl or t).strip()
 
 
+def write_parquet_twin(df: pd.DataFrame, csv_path: str) -> str:
+    """Write df next to csv_path as .parquet so query layers can read only the columns they touch."""
+    pq_path = os.path.splitext(csv_path)[0] + '.parquet'
+    out = df
+    if 'posting_date' in out.columns:
+        # mixed date/None objects -> proper datetime column
+        out = out.assign(posting_date=pd.to_datetime(out['posting_date'], errors='coerce'))
+    out.to_parquet(pq_path, index=False)
+    return pq_path
+
+
+def parse_experience_with_months(text: str):
+    """Experience parsing with months support (falls back to parse_experience)."""
+    if not isinstance(text, str) or not text.strip():
+        return (None, None)
+    t = text.lower().strip()
+    # months range
+    m = re.search(r"(\d+)\s*(?:to|-|–|—)\s*(\d+)\s*month", t)
+    if m:
+        a = float(m.group(1))/12.0; b = float(m.group(2))/12.0
+        return (a, b)
+    # single months
+    m = re.search(r"(\d+)\s*month", t)
+    if m:
+        v = float(m.group(1))/12.0
+        return (v, v)
+    return parse_experience(text)
+
+
+PLACEHOLDER_TOKENS = {"not specified", "n/a", "na", "none", "null", "-", "—", "not disclosed"}
+
+
+def normalize_missing(x):
+    if isinstance(x, str) and x.strip().lower() in PLACEHOLDER_TOKENS:
+        return None
+    return x
+
+
+def map_skills(s):
+    """Map skill tokens via synonyms, de-duplicating while preserving order."""
+    if not isinstance(s, str):
+        return s
+    items = [normalize_skill_token(p.strip()) for p in s.split(',') if p.strip()]
+    seen = set(); out = []
+    for it in items:
+        low = it.lower()
+        if low not in seen:
+            seen.add(low); out.append(it)
+    return ', '.join(out) if out else None
+
+
+def clean_jobs(df: pd.DataFrame, metrics: RunMetrics | None = None, ref_dt: datetime | None = None,
+               salary_cache: SalaryParseCache | None = None) -> pd.DataFrame:
+    """
+    Run every cleaning step on a raw dataset; each step is timed as a metrics stage.
+    With a salary_cache, salary texts are parsed once per distinct text and memoized.
+    """
+    metrics = metrics or RunMetrics('clean', sample_rss=False)
+    ref_dt = ref_dt or datetime.now()
+
+    with metrics.stage('dedup_raw'):
+        # Drop exact duplicate rows
+        df = df.drop_duplicates()
+
+        # Drop dup by job_url else by (title, company)
+        if 'job_url' in df.columns:
+            df = df.drop_duplicates(subset=['job_url'])
+        elif all(c in df.columns for c in ['title', 'company']):
+            df = df.drop_duplicates(subset=['title', 'company'])
+
+    with metrics.stage('normalize_missing'):
+        # Normalize obvious placeholder tokens to missing
+        for col in ['title', 'company', 'city', 'category_searched', 'salary_text', 'skills', 'experience_text', 'job_type', 'posting_date_text']:
+            if col in df.columns:
+                df[col] = df[col].apply(normalize_missing)
+
+    with metrics.stage('normalize_text'):
+        # Clean text fields
+        for col in ['title', 'company', 'city', 'category_searched']:
+            if col in df.columns:
+                df[col + '_clean'] = df[col].apply(clean_text)
+
+        # Company normalization
+        if 'company_clean' in df.columns:
+            df['company_norm'] = df['company_clean'].apply(normalize_company)
+
+        # City normalization mapping
+        if 'city_clean' in df.columns:
+            df['city_clean'] = df['city_clean'].apply(lambda x: x.title() if isinstance(x, str) else x)
+            df['city_norm'] = df['city_clean'].apply(normalize_city)
+
+        # Category normalization
+        if 'category_searched_clean' in df.columns:
+            df['category_standard'] = df['category_searched_clean'].apply(normalize_category)
+
+    with metrics.stage('skills'):
+        # Skills normalization, then map skill tokens via synonyms
+        if 'skills' in df.columns:
+            df['skills_clean'] = df['skills'].apply(normalize_skills)
+            df['skills_clean'] = df['skills_clean'].apply(map_skills)
+
+    with metrics.stage('salary'):
+        # Salary parsing
+        if 'salary_text' in df.columns:
+            reset_salary_branch_counts()
+            if salary_cache is not None:
+                hits, misses = salary_cache.hits, salary_cache.misses
+                parsed = salary_cache.parse_series(df['salary_text'])
+                metrics.incr('salary_cache_hits', salary_cache.hits - hits)
+                metrics.incr('salary_cache_misses', salary_cache.misses - misses)
+            else:
+                parsed = df['salary_text'].apply(parse_salary_text)
+            for branch, count in salary_branch_counts().items():
+                metrics.incr(f'salary_branch_{branch}', count)
+            df['min_salary_inr'] = parsed.apply(lambda x: x[0])
+            df['max_salary_inr'] = parsed.apply(lambda x: x[1])
+            df['avg_salary_inr'] = parsed.apply(lambda x: x[2])
+
+    with metrics.stage('experience'):
+        if 'experience_text' in df.columns:
+            exp_parsed = df['experience_text'].apply(parse_experience_with_months)
+            df['exp_min_years'] = exp_parsed.apply(lambda x: x[0])
+            df['exp_max_years'] = exp_parsed.apply(lambda x: x[1])
+            df['experience_level'] = df.apply(lambda r: experience_level(r.get('exp_min_years'), r.get('exp_max_years')), axis=1)
+
+    with metrics.stage('posting_date'):
+        # Posting date standardization
+        if 'posting_date_text' in df.columns:
+            df['posting_date'] = df['posting_date_text'].apply(lambda x: parse_posting_date(x, ref_dt))
+
+    with metrics.stage('job_type_location'):
+        # Job type normalization and flags
+        if 'job_type' in df.columns:
+            df['job_type'] = df['job_type'].apply(normalize_job_type)
+            df['is_internship'] = df['job_type'].fillna('').str.contains('Internship', case=False)
+
+        # Location tier
+        base_city_col = 'city_norm' if 'city_norm' in df.columns else ('city_clean' if 'city_clean' in df.columns else ('city' if 'city' in df.columns else None))
+        if base_city_col:
+            df['location_tier'] = df[base_city_col].apply(location_tier)
+
+    with metrics.stage('salary_derived'):
+        # Salary LPA and capped values for robust analytics
+        if 'avg_salary_inr' in df.columns:
+            df['avg_salary_lpa'] = df['avg_salary_inr'].apply(lambda v: v/100000 if pd.notna(v) else v)
+            pos = df['avg_salary_inr'].dropna()
+            pos = pos[pos > 0]
+            if not pos.empty:
+                lo = pos.quantile(0.01)
+                hi = pos.quantile(0.99)
+                df['avg_salary_inr_capped'] = df['avg_salary_inr'].clip(lower=lo, upper=hi)
+                df['avg_salary_lpa_capped'] = df['avg_salary_inr_capped']/100000.0
+
+    with metrics.stage('remote_flag'):
+        # Remote flag from location_full/city
+        def detect_remote(row):
+            for col in ['location_full', base_city_col]:
+                if col in df.columns:
+                    v = row.get(col)
+                    if isinstance(v, str) and ('remote' in v.lower() or 'work from home' in v.lower()):
+                        return True
+            return False
+        df['has_remote'] = df.apply(detect_remote, axis=1)
+
+    with metrics.stage('dedup_normalized'):
+        # Enhanced deduplication after normalization
+        dedup_subset = [c for c in ['title_clean','company_norm','city_norm'] if c in df.columns]
+        if dedup_subset:
+            df = df.drop_duplicates(subset=dedup_subset)
+
+    with metrics.stage('quality_flags'):
+        # Data quality flags
+        for col in ['salary_text', 'skills', 'experience_text', 'description']:
+            if col in df.columns:
+                df[f'has_{col}'] = df[col].notna()
+
+    return df
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--input', default=DEFAULT_INPUT)
     parser.add_argument('--output', default=DEFAULT_OUTPUT)
     parser.add_argument('--report', default=DEFAULT_REPORT)
+    parser.add_argument('--no-parquet', action='store_true', help='Skip writing the Parquet twin of the output CSV')
+    parser.add_argument('--cube', default=DEFAULT_CUBE, help='Analytics cube to update with new sessions')
+    parser.add_argument('--no-cube', action='store_true', help='Skip updating the analytics cube')
+    parser.add_argument('--skill-index', default=DEFAULT_SKILL_INDEX, help='Inverted skill index to update with new sessions')
+    parser.add_argument('--no-skill-index', action='store_true', help='Skip updating the skill index')
+    parser.add_argument('--text-index', default=DEFAULT_TEXT_INDEX, help='BM25 title/description index directory')
+    parser.add_argument('--no-text-index', action='store_true', help='Skip updating the text index')
+    parser.add_argument('--no-validate', action='store_true', help='Skip the raw/cleaned schema validation')
+    parser.add_argument('--quarantine', action='store_true', help='Move cleaned rows failing an error rule to --quarantine-file')
+    parser.add_argument('--quarantine-file', default=DEFAULT_QUARANTINE, help='Side CSV for quarantined rows')
+    parser.add_argument('--salary-cache', default=DEFAULT_SALARY_CACHE, help='SQLite memo of salary parse results')
+    parser.add_argument('--no-salary-cache', action='store_true', help='Parse every salary text without the memo')
+    parser.add_argument('--metrics', default=None, help='Metrics JSON path (default: reports/metrics/cleaning_<timestamp>.json)')
+    parser.add_argument('--profile', default=None, help='Write a cProfile dump of the run to this path')
     args = parser.parse_args()
 
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
     os.makedirs(os.path.dirname(args.report), exist_ok=True)
 
-    print(f"Loading dataset: {args.input}")
-    df = pd.read_csv(args.input)
-    original_rows = len(df)
-
-    # Drop exact duplicate rows
-    df = df.drop_duplicates()
-
-    # Drop dup by job_url else by (title, company)
-    if 'job_url' in df.columns:
-        df = df.drop_duplicates(subset=['job_url'])
-    elif all(c in df.columns for c in ['title', 'company']):
-        df = df.drop_duplicates(subset=['title', 'company'])
-
-    # Normalize obvious placeholder tokens to missing
-    placeholder_tokens = {"not specified", "n/a", "na", "none", "null", "-", "—", "not disclosed"}
-    def normalize_missing(x):
-        if isinstance(x, str) and x.strip().lower() in placeholder_tokens:
-            return None
-        return x
-    for col in ['title', 'company', 'city', 'category_searched', 'salary_text', 'skills', 'experience_text', 'job_type', 'posting_date_text']:
-        if col in df.columns:
-            df[col] = df[col].apply(normalize_missing)
-
-    # Clean text fields
-    for col in ['title', 'company', 'city', 'category_searched']:
-        if col in df.columns:
-            df[col + '_clean'] = df[col].apply(clean_text)
-
-    # Company normalization
-    if 'company_clean' in df.columns:
-        df['company_norm'] = df['company_clean'].apply(normalize_company)
-
-    # City normalization mapping
-    if 'city_clean' in df.columns:
-        df['city_clean'] = df['city_clean'].apply(lambda x: x.title() if isinstance(x, str) else x)
-        df['city_norm'] = df['city_clean'].apply(normalize_city)
-
-    # Category normalization
-    if 'category_searched_clean' in df.columns:
-        df['category_standard'] = df['category_searched_clean'].apply(normalize_category)
-
-    # Skills normalization
-    if 'skills' in df.columns:
-        df['skills_clean'] = df['skills'].apply(normalize_skills)
-        # Map skill tokens via synonyms
-        def map_skills(s):
-            if not isinstance(s, str):
-                return s
-            items = [normalize_skill_token(p.strip()) for p in s.split(',') if p.strip()]
-            # dedupe preserving order
-            seen = set(); out = []
-            for it in items:
-                low = it.lower()
-                if low not in seen:
-                    seen.add(low); out.append(it)
-            return ', '.join(out) if out else None
-        df['skills_clean'] = df['skills_clean'].apply(map_skills)
-
-    # Salary parsing
-    if 'salary_text' in df.columns:
-        parsed = df['salary_text'].apply(parse_salary_text)
-        df['min_salary_inr'] = parsed.apply(lambda x: x[0])
-        df['max_salary_inr'] = parsed.apply(lambda x: x[1])
-        df['avg_salary_inr'] = parsed.apply(lambda x: x[2])
-
-    # Experience parsing (with months support)
-    def parse_experience_with_months(text: str):
-        if not isinstance(text, str) or not text.strip():
-            return (None, None)
-        t = text.lower().strip()
-        # months range
-        m = re.search(r"(\d+)\s*(?:to|-|–|—)\s*(\d+)\s*month", t)
-        if m:
-            a = float(m.group(1))/12.0; b = float(m.group(2))/12.0
-            return (a, b)
-        # single months
-        m = re.search(r"(\d+)\s*month", t)
-        if m:
-            v = float(m.group(1))/12.0
-            return (v, v)
-        return parse_experience(text)
-
-    if 'experience_text' in df.columns:
-        exp_parsed = df['experience_text'].apply(parse_experience_with_months)
-        df['exp_min_years'] = exp_parsed.apply(lambda x: x[0])
-        df['exp_max_years'] = exp_parsed.apply(lambda x: x[1])
-        df['experience_level'] = df.apply(lambda r: experience_level(r.get('exp_min_years'), r.get('exp_max_years')), axis=1)
-
-    # Posting date standardization
-    ref_dt = datetime.now()
-    if 'posting_date_text' in df.columns:
-        df['posting_date'] = df['posting_date_text'].apply(lambda x: parse_posting_date(x, ref_dt))
-
-    # Job type normalization and flags
-    if 'job_type' in df.columns:
-        df['job_type'] = df['job_type'].apply(normalize_job_type)
-        df['is_internship'] = df['job_type'].fillna('').str.contains('Internship', case=False)
-
-    # Location tier
-    base_city_col = 'city_norm' if 'city_norm' in df.columns else ('city_clean' if 'city_clean' in df.columns else ('city' if 'city' in df.columns else None))
-    if base_city_col:
-        df['location_tier'] = df[base_city_col].apply(location_tier)
-
-    # Salary LPA and capped values for robust analytics
-    if 'avg_salary_inr' in df.columns:
-        df['avg_salary_lpa'] = df['avg_salary_inr'].apply(lambda v: v/100000 if pd.notna(v) else v)
-        pos = df['avg_salary_inr'].dropna()
-        pos = pos[pos > 0]
-        if not pos.empty:
-            lo = pos.quantile(0.01)
-            hi = pos.quantile(0.99)
-            df['avg_salary_inr_capped'] = df['avg_salary_inr'].clip(lower=lo, upper=hi)
-            df['avg_salary_lpa_capped'] = df['avg_salary_inr_capped']/100000.0
-
-    # Remote flag from location_full/city
-    def detect_remote(row):
-        for col in ['location_full', base_city_col]:
-            if col in df.columns:
-                v = row.get(col)
-                if isinstance(v, str) and ('remote' in v.lower() or 'work from home' in v.lower()):
-                    return True
-        return False
-    df['has_remote'] = df.apply(detect_remote, axis=1)
-
-    # Enhanced deduplication after normalization
-    dedup_subset = [c for c in ['title_clean','company_norm','city_norm'] if c in df.columns]
-    if dedup_subset:
-        df = df.drop_duplicates(subset=dedup_subset)
-
-    # Data quality flags
-    for col in ['salary_text', 'skills', 'experience_text', 'description']:
-        if col in df.columns:
-            df[f'has_{col}'] = df[col].notna()
-
-    # Save cleaned dataset
-    df.to_csv(args.output, index=False)
-    print(f"Saved cleaned dataset: {args.output} ({len(df)} rows, from {original_rows} original)")
+    metrics = RunMetrics('cleaning')
+    with maybe_profile(args.profile):
+        print(f"Loading dataset: {args.input}")
+        with metrics.stage('load'):
+            df = pd.read_csv(args.input)
+        original_rows = len(df)
+        validations = []
+        if not args.no_validate:
+            with metrics.stage('validate_raw'):
+                validations.append(('Validation (Raw)', validate(df, RAW_CONTRACT)))
+
+        salary_cache = None if args.no_salary_cache else SalaryParseCache(args.salary_cache)
+        df = clean_jobs(df, metrics, salary_cache=salary_cache)
+        if salary_cache is not None:
+            metrics.incr('salary_cache_seconds_saved', salary_cache.seconds_saved())
+            salary_cache_line = salary_cache.summary_line()
+            salary_cache.close()
+            print(salary_cache_line)
+        quarantined = 0
+        if not args.no_validate:
+            with metrics.stage('validate_cleaned'):
+                cleaned_validation = validate(df, CLEANED_CONTRACT)
+                if args.quarantine:
+                    kept = quarantine(df, cleaned_validation, args.quarantine_file)
+                    quarantined, df = len(df) - len(kept), kept
+            validations.append(('Validation (Cleaned)', cleaned_validation))
+            for title, result in validations:
+                print(f"{title}: {int(result.invalid('error').sum())} row(s) with errors, "
+                      f"{int(result.invalid('warn').sum())} with warnings")
+            if args.quarantine:
+                print(f"Quarantined {quarantined} row(s): {args.quarantine_file}")
+
+        # Save cleaned dataset
+        with metrics.stage('save'):
+            df.to_csv(args.output, index=False)
+            print(f"Saved cleaned dataset: {args.output} ({len(df)} rows, from {original_rows} original)")
+            if not args.no_parquet:
+                pq_path = write_parquet_twin(df, args.output)
+                print(f"Saved Parquet twin: {pq_path}")
+        if not args.no_cube:
+            with metrics.stage('analytics_cube'):
+                cube, added = load_or_build(args.cube, df)
+                cube.save(args.cube)
+            print(f"Updated analytics cube: {args.cube} ({len(cube.cells)} cells, {len(added)} new partition(s))")
+        if not args.no_skill_index:
+            with metrics.stage('skill_index'):
+                skill_index, added = load_or_build_skill_index(args.skill_index, df)
+                skill_index.save(args.skill_index)
+            print(f"Updated skill index: {args.skill_index} ({skill_index.live_docs} jobs, "
+                  f"{len(skill_index.postings)} skills, {len(added)} new partition(s))")
+        if not args.no_text_index:
+            with metrics.stage('text_index'):
+                text_index, added = load_or_build_text_index(args.text_index, df)
+            print(f"Updated text index: {args.text_index} ({text_index.live_docs} jobs, "
+                  f"{len(text_index.segments)} segment(s), {len(added)} new partition(s))")
+
+    metrics.info.update({'input_rows': original_rows, 'output_rows': len(df), 'quarantined_rows': quarantined})
+    metrics_path = metrics.write_json(args.metrics)
+    print(f"Metrics written to: {metrics_path}")
 
     # Append summary to report
     lines = []
@@ -353,6 +479,14 @@ def main():
         if col in df.columns:
             non_null = df[col].notna().sum()
             lines.append(f"- Non-null {col}: {non_null} ({non_null/len(df)*100:.1f}%)")
+    if salary_cache is not None:
+        lines.append(f"- {salary_cache_line}")
+    if args.quarantine and not args.no_validate:
+        lines.append(f"- Quarantined rows: {quarantined} ({args.quarantine_file})")
+    for title, result in validations:
+        lines.extend(result.markdown_lines(title))
+
+    lines.extend(metrics.markdown_lines('Performance (Cleaning)'))
 
     with open(args.report, 'a', encoding='utf-8') as f:
         f.write("\n".join(lines))
@@ -6,7 +6,10 @@ Data Preprocessing for Cross Platform Job Analytics (Phase 2.5)
   - One-hot skills for top-N skills
   - Encodes categorical columns (source, job_type, location_tier)
   - Keeps numeric salary/experience features
-- Saves features CSV and appends summary to report
+- Features are computed in one vectorized block (feature_builder.py); --matrix also
+  writes them as a float32 memory-mapped matrix with a column manifest
+- Publishes a new version of the memory-mapped feature store (feature_store.py)
+- Saves features CSV and appends summary (with stage timings) to report
 """
 from __future__ import annotations
 import argparse
@@ -16,6 +19,10 @@ import pandas as pd
 import numpy as np
 from collections import Counter
 
+from feature_builder import build_feature_block, write_feature_matrix
+from feature_store import DEFAULT_STORE, publish_feature_store
+from run_metrics import RunMetrics, maybe_profile
+
 DEFAULT_INPUT = os.path.join('data', 'processed', 'cleaned_jobs_dataset.csv')
 DEFAULT_OUTPUT = os.path.join('data', 'processed', 'features_jobs_dataset.csv')
 DEFAULT_REPORT = os.path.join('reports', 'data_cleaning_report.md')
@@ -30,21 +37,16 @@ def extract_top_skills(df: pd.DataFrame, skills_col: str = 'skills_clean', top_n
     return [sk for sk, _ in counter.most_common(top_n)]
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--input', default=DEFAULT_INPUT)
-    parser.add_argument('--output', default=DEFAULT_OUTPUT)
-    parser.add_argument('--report', default=DEFAULT_REPORT)
-    parser.add_argument('--top_skills', type=int, default=30)
-    args = parser.parse_args()
+def build_features(df: pd.DataFrame, top_n: int = 30) -> tuple[pd.DataFrame, list[str]]:
+    """Feature-ready frame (ids + numeric + one-hot columns) and the top skills used."""
+    block = build_feature_block(df, top_n=top_n)
+    return block.to_frame(), block.top_skills
 
-    os.makedirs(os.path.dirname(args.output), exist_ok=True)
-
-    print(f"Loading cleaned dataset: {args.input}")
-    df = pd.read_csv(args.input)
 
+def build_features_reference(df: pd.DataFrame, top_n: int = 30) -> tuple[pd.DataFrame, list[str]]:
+    """Original per-row implementation of build_features, kept for compatibility checks and benchmarks."""
     # Identify top skills
-    top_skills = extract_top_skills(df, 'skills_clean', top_n=args.top_skills)
+    top_skills = extract_top_skills(df, 'skills_clean', top_n=top_n)
 
     # Prepare base features
     feature_cols = {}
@@ -100,8 +102,45 @@ def main():
     if keep_ids:
         feat_df = pd.concat([df[keep_ids], feat_df], axis=1)
 
-    feat_df.to_csv(args.output, index=False)
-    print(f"Saved features dataset: {args.output} ({len(feat_df)} rows, {feat_df.shape[1]} columns)")
+    return feat_df, top_skills
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', default=DEFAULT_INPUT)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--report', default=DEFAULT_REPORT)
+    parser.add_argument('--top_skills', type=int, default=30)
+    parser.add_argument('--store', default=DEFAULT_STORE, help='Feature store root (a new version is published per run)')
+    parser.add_argument('--no-store', action='store_true', help='Skip publishing the feature store')
+    parser.add_argument('--matrix', default=None, help='Also write features as a float32 memmap here (plus <path>.manifest.json)')
+    parser.add_argument('--metrics', default=None, help='Metrics JSON path (default: reports/metrics/preprocessing_<timestamp>.json)')
+    parser.add_argument('--profile', default=None, help='Write a cProfile dump of the run to this path')
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    metrics = RunMetrics('preprocessing')
+    with maybe_profile(args.profile):
+        print(f"Loading cleaned dataset: {args.input}")
+        with metrics.stage('load'):
+            df = pd.read_csv(args.input)
+        with metrics.stage('build_features'):
+            block = build_feature_block(df, top_n=args.top_skills)
+            feat_df, top_skills = block.to_frame(), block.top_skills
+        with metrics.stage('save'):
+            feat_df.to_csv(args.output, index=False)
+        print(f"Saved features dataset: {args.output} ({len(feat_df)} rows, {feat_df.shape[1]} columns)")
+        if args.matrix:
+            with metrics.stage('save_matrix'):
+                manifest_path = write_feature_matrix(args.matrix, block, source=args.input)
+            print(f"Saved feature matrix: {args.matrix} ({block.values.shape[0]} x {block.values.shape[1]} float32, manifest {manifest_path})")
+        store_dir = None
+        if not args.no_store:
+            with metrics.stage('publish_store'):
+                store_dir = publish_feature_store(block, df['skills_clean'] if 'skills_clean' in df.columns else None,
+                                                  root=args.store, source=args.input)
+            print(f"Published feature store: {store_dir}")
+    print(f"Metrics written to: {metrics.write_json(args.metrics)}")
 
     # Append summary to report
     lines = []
@@ -109,6 +148,9 @@ def main():
     lines.append("## Preprocessing Summary")
     lines.append(f"Top skills used: {', '.join(top_skills)}")
     lines.append(f"Feature columns: {feat_df.shape[1]}")
+    if store_dir:
+        lines.append(f"Feature store: {store_dir}")
+    lines.extend(metrics.markdown_lines('Performance (Preprocessing)'))
 
     with open(args.report, 'a', encoding='utf-8') as f:
         f.write("\n".join(lines))
@@ -2,14 +2,22 @@
 """
 Data Quality Assessment for Cross Platform Job Analytics
 Generates a markdown report with key data quality metrics.
+Aggregates are computed by DuckDB over the file (see job_queries.py), so the
+dataset is never materialized as a full DataFrame. --streaming builds the same
+sections from a single chunked pass with bounded-memory sketches instead
+(see stream_profile.py), adding approximate distinct counts and string lengths.
 """
 from __future__ import annotations
 import argparse
 import os
 import sys
 from datetime import datetime
+from typing import Dict, List, Optional
 import pandas as pd
 
+from job_queries import JobQueries
+from stream_profile import DEFAULT_CHUNK_ROWS, profile_csv
+
 DEFAULT_INPUT = os.path.join('data', 'raw', 'unified_jobs_dataset.csv')
 DEFAULT_REPORT = os.path.join('reports', 'data_cleaning_report.md')
 
@@ -18,42 +26,27 @@ KEY_FIELDS = [
     'skills', 'experience_text', 'description', 'job_type', 'posting_date_text',
     'job_url', 'source'
 ]
+DISTRIBUTION_FIELDS = ['salary_text', 'experience_text', 'job_type', 'city', 'category_searched', 'source']
+SAMPLE_FIELDS = ['title', 'company', 'city', 'salary_text', 'experience_text', 'job_type', 'source']
 
 
-def safe_value_counts(df: pd.DataFrame, col: str, n: int = 15) -> str:
-    if col in df.columns:
-        vc = df[col].astype(str).value_counts(dropna=True).head(n)
-        return vc.to_string()
-    return f"Column '{col}' not found."
+def duplicate_subset(columns: List[str]) -> List[str]:
+    """Duplicates by job_url if present else by title+company"""
+    if 'job_url' in columns:
+        return ['job_url']
+    return [c for c in ['title', 'company'] if c in columns]
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--input', default=DEFAULT_INPUT, help='Path to raw dataset CSV')
-    parser.add_argument('--output', default=DEFAULT_REPORT, help='Path to markdown report')
-    args = parser.parse_args()
-
-    os.makedirs(os.path.dirname(args.output), exist_ok=True)
-
-    print(f"Loading dataset: {args.input}")
-    try:
-        df = pd.read_csv(args.input)
-    except Exception as e:
-        print(f"Failed to read CSV: {e}")
-        sys.exit(1)
-
-    n_rows, n_cols = df.shape
-
-    # Duplicates by job_url if present else by title+company
-    if 'job_url' in df.columns:
-        dup_count = df.duplicated(subset=['job_url']).sum()
-    else:
-        subset = [c for c in ['title', 'company'] if c in df.columns]
-        dup_count = df.duplicated(subset=subset).sum() if subset else 0
+def safe_value_counts(q: JobQueries, col: str, n: int = 15) -> str:
+    if q.has(col):
+        vc = q.value_counts(col, n=n, as_text=True)
+        return vc.to_string()
+    return f"Column '{col}' not found."
 
-    missing_series = df.isnull().sum().sort_values(ascending=False)
 
-    # Build markdown report
+def report_lines(n_rows: int, n_cols: int, dup_count: str, missing_series: pd.Series, dtypes: pd.Series,
+                 distributions: Dict[str, str], sample: Optional[pd.DataFrame],
+                 column_summary: Optional[pd.DataFrame] = None) -> List[str]:
     lines = []
     lines.append(f"# Data Quality Report")
     lines.append("")
@@ -69,23 +62,81 @@ def main():
 
     lines.append("## Dtypes")
     lines.append("```")
-    lines.append(df.dtypes.to_string())
+    lines.append(dtypes.to_string())
     lines.append("```")
 
     # Distributions for key fields
-    for col in ['salary_text', 'experience_text', 'job_type', 'city', 'category_searched', 'source']:
+    for col, text in distributions.items():
         lines.append(f"## Distribution: {col}")
         lines.append("```")
-        lines.append(safe_value_counts(df, col))
+        lines.append(text)
+        lines.append("```")
+
+    if column_summary is not None:
+        lines.append("## Distinct Values and String Lengths (approximate)")
+        lines.append("```")
+        lines.append(column_summary.to_string())
         lines.append("```")
 
     # Sample rows
-    sample_cols = [c for c in ['title', 'company', 'city', 'salary_text', 'experience_text', 'job_type', 'source'] if c in df.columns]
-    if sample_cols:
+    if sample is not None:
         lines.append("## Sample Rows")
         lines.append("```")
-        lines.append(df[sample_cols].head(10).to_string(index=False))
+        lines.append(sample.to_string(index=False))
         lines.append("```")
+    return lines
+
+
+def duckdb_report(path: str) -> List[str]:
+    q = JobQueries(path)
+    n_rows, n_cols = q.row_count(), len(q.columns)
+    subset = duplicate_subset(q.columns)
+    dup_count = q.duplicate_count(subset) if subset else 0
+    distributions = {col: safe_value_counts(q, col) for col in DISTRIBUTION_FIELDS}
+    sample_cols = [c for c in SAMPLE_FIELDS if q.has(c)]
+    sample = q.select(sample_cols, limit=10) if sample_cols else None
+    return report_lines(n_rows, n_cols, str(dup_count), q.missing_counts(), q.dtypes(), distributions, sample)
+
+
+def streaming_report(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[str]:
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    profile = profile_csv(path, chunk_rows, distribution_columns=[c for c in DISTRIBUTION_FIELDS if c in columns],
+                          duplicate_subset=duplicate_subset(columns),
+                          distinct_columns=[c for c in KEY_FIELDS if c in columns])
+    dup_count = profile.duplicate_count()
+    distributions = {col: profile.value_counts(col).to_string() if col in profile.heavy
+                     else f"Column '{col}' not found." for col in DISTRIBUTION_FIELDS}
+    # a truncated Space-Saving summary may overcount its tail; mark those tables as estimates
+    for col in profile.heavy:
+        if not profile.heavy[col].exact:
+            distributions[col] += f"\n(approximate: counts may exceed the true count by up to {profile.heavy[col].floor})"
+    sample_cols = [c for c in SAMPLE_FIELDS if c in columns]
+    sample = None
+    if sample_cols and profile.sample is not None:
+        sample = profile.sample[sample_cols].astype(object)
+        sample = sample.where(sample.notna(), None)  # render missing values as the DuckDB path does
+    summary = profile.column_summary().dropna(subset=['distinct_approx'])
+    return report_lines(profile.rows, len(profile.columns), str(dup_count) if profile.duplicates_exact else f"≈{dup_count}",
+                        profile.missing_counts(), profile.dtype_series(), distributions, sample, summary)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='Path to raw dataset CSV')
+    parser.add_argument('--output', default=DEFAULT_REPORT, help='Path to markdown report')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Profile in one chunked pass with bounded-memory sketches instead of DuckDB')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Rows per chunk with --streaming')
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+
+    print(f"Loading dataset: {args.input}")
+    try:
+        lines = streaming_report(args.input, args.chunk_rows) if args.streaming else duckdb_report(args.input)
+    except Exception as e:
+        print(f"Failed to read CSV: {e}")
+        sys.exit(1)
 
     with open(args.output, 'w', encoding='utf-8') as f:
         f.write("\n".join(lines))
@@ -2,32 +2,68 @@
 """
 Generate EDA figures and append an EDA summary (date-less, path-less).
 Inputs:
-- data/processed/cleaned_jobs_dataset.csv
+- data/processed/cleaned_jobs_dataset.csv (or its fresher .parquet twin, queried via DuckDB)
 Outputs:
 - reports/figures/*.png
 - Appends an "## EDA Summary" section to reports/data_cleaning_report.md
+Figures are independent plot tasks rendered in a process pool (Agg backend);
+each task receives only the data it draws, and tasks whose input hash is
+unchanged since the last run are skipped unless --force is given.
+With --binned, distributions are pre-binned with NumPy (see plot_binning.py)
+and scatter overlays are sampled, so render time stays flat as rows grow.
 """
 from __future__ import annotations
+import argparse
+import hashlib
+import inspect
+import json
 import os
 import sys
 import math
 import subprocess
-from typing import List
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from job_queries import JobQueries
+from analytics_cube import DEFAULT_CUBE, PARTITION_COL, AnalyticsCube
+import plot_binning
+from run_metrics import RunMetrics, maybe_profile
+
 CLEANED = os.path.join('data', 'processed', 'cleaned_jobs_dataset.csv')
 REPORT = os.path.join('reports', 'data_cleaning_report.md')
+CUBE = DEFAULT_CUBE
 FIGDIR = os.path.join('reports', 'figures')
+FIG_HASHES = os.path.join(FIGDIR, '.figure_hashes.json')
 
 TOP_CITIES = 10
 TOP_COMPANIES = 15
 TOP_CATEGORIES = 15
 TOP_SKILLS = 20
 CO_SKILLS = 15
+COMPANY_PLACEHOLDERS = ('not specified', 'none', 'na', 'n/a')
+SCATTER_SAMPLE = 5000
+LEVEL_ORDER = ['Entry', 'Junior', 'Mid', 'Senior']
+
+FIGURES = [
+    'salary_distribution.png',
+    'salary_by_city.png',
+    'top_categories.png',
+    'top_companies.png',
+    'top_skills.png',
+    'skills_cooccurrence.png',
+    'salary_by_experience_level.png',
+    'salary_vs_experience.png',
+    'city_category_heatmap.png'
+]
 
 sns.set_theme(style="whitegrid")
 
@@ -43,6 +79,28 @@ def ensure_cleaned_ready():
             raise FileNotFoundError("Raw dataset not found; cannot run EDA.")
 
 
+def load_fresh_cube(q: JobQueries):
+    """
+    The analytics cube restricted to the cleaned dataset's sessions, if it holds each of
+    them with the same row count (cleaning refolds a session whose rows changed, so a cube
+    that disagrees was built from another version of the data). Sessions the cube keeps
+    from earlier runs but the dataset no longer holds are dropped from the loaded copy.
+    """
+    if not os.path.exists(CUBE) or os.path.getmtime(CUBE) < os.path.getmtime(CLEANED):
+        return None
+    try:
+        cube = AnalyticsCube.load(CUBE)
+    except (ValueError, KeyError):
+        return None
+    if not q.has(PARTITION_COL):
+        return cube if not cube.partitions else None
+    sessions = {str(p): int(n) for p, n in q.value_counts(PARTITION_COL).items()}
+    if any(cube.fingerprints.get(p, {}).get('rows') != n for p, n in sessions.items()):
+        return None
+    cube.drop([p for p in cube.partitions if p not in sessions])
+    return cube
+
+
 def savefig(name: str):
     os.makedirs(FIGDIR, exist_ok=True)
     path = os.path.join(FIGDIR, name)
@@ -58,132 +116,311 @@ def split_skills(s: str) -> List[str]:
     return [p.strip() for p in s.split(',') if p.strip()]
 
 
-def eda():
-    ensure_cleaned_ready()
-    df = pd.read_csv(CLEANED)
+# ----------------------------------------------------------------------
+# Plot tasks: each draws one figure from the data it is handed
+# ----------------------------------------------------------------------
+def plot_salary_distribution(salary: pd.Series):
+    fig, ax = plt.subplots(figsize=(7, 4))
+    sns.histplot(salary, bins=40, kde=True, ax=ax)
+    ax.set_xscale('log')
+    ax.set_xlabel('Avg Salary (INR, log scale)')
+    ax.set_title('Salary Distribution')
+
+
+def plot_salary_by_city(data: pd.DataFrame, city_col: str, order: List[str]):
+    fig, ax = plt.subplots(figsize=(9, 4))
+    sns.boxplot(data=data, x=city_col, y='avg_salary_inr_pos', order=order, ax=ax)
+    ax.set_yscale('log')
+    ax.set_xlabel('City')
+    ax.set_ylabel('Avg Salary (INR, log)')
+    ax.set_title('Salary by City (Top)')
+    plt.xticks(rotation=30, ha='right')
+
+
+def plot_top_counts(counts: pd.Series, title: str):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    counts.sort_values().plot(kind='barh', ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel('Count')
+
+
+def plot_skill_cooccurrence(skills: pd.Series, co: List[str]):
+    mat = pd.DataFrame(0, index=co, columns=co)
+    for s in skills:
+        lst = set(split_skills(s))
+        present = [sk for sk in co if sk in lst]
+        for i in range(len(present)):
+            for j in range(len(present)):
+                if i != j:
+                    mat.loc[present[i], present[j]] += 1
+    fig, ax = plt.subplots(figsize=(7, 6))
+    sns.heatmap(mat, cmap='Blues', ax=ax)
+    ax.set_title('Skill Co-occurrence (Top)')
+
+
+def plot_salary_by_level(data: pd.DataFrame):
+    fig, ax = plt.subplots(figsize=(7, 4))
+    sns.boxplot(data=data, x='experience_level', y='avg_salary_inr_pos', order=LEVEL_ORDER, ax=ax)
+    ax.set_yscale('log')
+    ax.set_title('Salary by Experience Level')
+    ax.set_xlabel('Experience Level')
+    ax.set_ylabel('Avg Salary (INR, log)')
+
+
+def plot_salary_vs_experience(data: pd.DataFrame):
+    fig, ax = plt.subplots(figsize=(6, 4))
+    sns.scatterplot(data=data, x='exp_min_years', y='avg_salary_inr_pos', alpha=0.4, ax=ax)
+    ax.set_yscale('log')
+    ax.set_xlabel('Min Experience (years)')
+    ax.set_ylabel('Avg Salary (INR, log)')
+    ax.set_title('Salary vs Experience')
+
+
+def plot_city_category(counts: pd.DataFrame):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.heatmap(counts, cmap='Greens', ax=ax)
+    ax.set_title('City vs Category (Counts)')
+
+
+# Binned variants: same figures drawn from pre-computed summaries
+def plot_salary_distribution_binned(hist: Dict[str, np.ndarray]):
+    fig, ax = plt.subplots(figsize=(7, 4))
+    edges, counts = hist['edges'], hist['counts']
+    ax.hist(edges[:-1], bins=edges, weights=counts, color=sns.color_palette()[0], alpha=0.75, edgecolor='white')
+    centers = np.sqrt(edges[:-1] * edges[1:])
+    ax.plot(centers, hist['smooth'], color=sns.color_palette()[0])
+    ax.set_xscale('log')
+    ax.set_xlabel('Avg Salary (INR, log scale)')
+    ax.set_ylabel('Count')
+    ax.set_title('Salary Distribution')
+
+
+def plot_box_stats(stats: List[dict], xlabel: str, title: str, figsize: tuple, rotate: bool = False):
+    fig, ax = plt.subplots(figsize=figsize)
+    palette = sns.color_palette(n_colors=max(len(stats), 1))
+    parts = ax.bxp(stats, patch_artist=True, showfliers=True,
+                   flierprops={'marker': 'd', 'markersize': 4, 'markerfacecolor': '0.3', 'markeredgecolor': '0.3'},
+                   medianprops={'color': '0.2'})
+    for patch, color in zip(parts['boxes'], palette):
+        patch.set_facecolor(color)
+    ax.set_yscale('log')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Avg Salary (INR, log)')
+    ax.set_title(title)
+    if rotate:
+        plt.xticks(rotation=30, ha='right')
+
+
+def plot_salary_vs_experience_binned(grid: Dict[str, np.ndarray], sample: pd.DataFrame):
+    fig, ax = plt.subplots(figsize=(6, 4))
+    counts = np.ma.masked_equal(grid['counts'].T, 0)
+    mesh = ax.pcolormesh(grid['x_edges'], grid['y_edges'], counts, cmap='Blues', shading='flat')
+    fig.colorbar(mesh, ax=ax, label='Jobs')
+    if not sample.empty:
+        ax.scatter(sample['exp_min_years'], sample['avg_salary_inr_pos'], s=6, alpha=0.3, color='0.2', linewidths=0)
+    ax.set_yscale('log')
+    ax.set_xlabel('Min Experience (years)')
+    ax.set_ylabel('Avg Salary (INR, log)')
+    ax.set_title('Salary vs Experience')
+
+
+def plot_cooccurrence_matrix(counts: pd.DataFrame):
+    fig, ax = plt.subplots(figsize=(7, 6))
+    sns.heatmap(counts, cmap='Blues', ax=ax)
+    ax.set_title('Skill Co-occurrence (Top)')
+
+
+@dataclass
+class PlotTask:
+    filename: str
+    func: Callable
+    kwargs: Dict[str, object] = field(default_factory=dict)
+
+    def data_hash(self) -> str:
+        """Hash of the plot code and its inputs; unchanged hash => identical figure."""
+        h = hashlib.sha1(inspect.getsource(self.func).encode('utf-8'))
+        for key in sorted(self.kwargs):
+            val = self.kwargs[key]
+            h.update(key.encode('utf-8'))
+            _hash_value(h, val)
+        return h.hexdigest()
+
+
+def _hash_value(h, val):
+    if isinstance(val, (pd.Series, pd.DataFrame)):
+        h.update(pd.util.hash_pandas_object(val, index=True).to_numpy().tobytes())
+        h.update(repr(list(val.columns) if isinstance(val, pd.DataFrame) else val.name).encode('utf-8'))
+    elif isinstance(val, np.ndarray):
+        h.update(np.ascontiguousarray(val).tobytes())
+    elif isinstance(val, dict):
+        for k in sorted(val):
+            h.update(str(k).encode('utf-8'))
+            _hash_value(h, val[k])
+    elif isinstance(val, (list, tuple)):
+        for item in val:
+            _hash_value(h, item)
+    else:
+        h.update(repr(val).encode('utf-8'))
+
+
+def render_task(task: PlotTask) -> tuple[str, float]:
+    """Draw and save one figure; runs inside a pool worker."""
+    t0 = time.perf_counter()
+    task.func(**task.kwargs)
+    savefig(task.filename)
+    return task.filename, time.perf_counter() - t0
+
+
+def render_tasks(tasks: List[PlotTask], workers: Optional[int] = None, force: bool = False) -> Dict[str, Optional[float]]:
+    """Render tasks in parallel; returns seconds per figure (None when skipped as unchanged)."""
+    try:
+        with open(FIG_HASHES, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    hashes = {t.filename: t.data_hash() for t in tasks}
+    todo = [t for t in tasks if force or previous.get(t.filename) != hashes[t.filename]
+            or not os.path.exists(os.path.join(FIGDIR, t.filename))]
+    timings: Dict[str, Optional[float]] = {t.filename: None for t in tasks}
 
-    # Basic safe casts
-    if 'avg_salary_inr' in df.columns:
-        # avoid non-positive for log plots
-        df['avg_salary_inr_pos'] = df['avg_salary_inr'].where(df['avg_salary_inr'] > 0)
+    os.makedirs(FIGDIR, exist_ok=True)
+    workers = workers or min(len(todo), os.cpu_count() or 1)
+    if workers <= 1 or len(todo) <= 1:
+        results = map(render_task, todo)
+        timings.update(dict(results))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            timings.update(dict(pool.map(render_task, todo)))
+
+    with open(FIG_HASHES, 'w', encoding='utf-8') as f:
+        json.dump({**previous, **{t.filename: hashes[t.filename] for t in todo}}, f, indent=2, sort_keys=True)
+    return timings
+
+
+def build_plot_tasks(q: JobQueries, cube: Optional[AnalyticsCube], binned: bool = False,
+                     sample: int = SCATTER_SAMPLE) -> tuple[List[PlotTask], Dict[str, Optional[str]]]:
+    """
+    Query the inputs of every figure; returns tasks plus the resolved column names.
+    binned=True hands tasks NumPy summaries (histograms, grid counts, box stats) instead of rows.
+    """
+    tasks: List[PlotTask] = []
+    has_salary = q.has('avg_salary_inr')
 
     # 1) Salary distribution
-    if 'avg_salary_inr_pos' in df.columns and df['avg_salary_inr_pos'].notna().any():
-        fig, ax = plt.subplots(figsize=(7, 4))
-        sns.histplot(df['avg_salary_inr_pos'].dropna(), bins=40, kde=True, ax=ax)
-        ax.set_xscale('log')
-        ax.set_xlabel('Avg Salary (INR, log scale)')
-        ax.set_title('Salary Distribution')
-        savefig('salary_distribution.png')
+    if has_salary:
+        sal = q.select(['avg_salary_inr'], positive=['avg_salary_inr'])['avg_salary_inr']
+        if binned and not sal.empty:
+            tasks.append(PlotTask('salary_distribution.png', plot_salary_distribution_binned,
+                                  {'hist': plot_binning.log_histogram(sal.to_numpy(), bins=40)}))
+        elif not sal.empty:
+            tasks.append(PlotTask('salary_distribution.png', plot_salary_distribution, {'salary': sal}))
 
     # 2) Salary by city (top cities by count)
-    city_col = 'city_clean' if 'city_clean' in df.columns else ('city' if 'city' in df.columns else None)
-    if city_col and 'avg_salary_inr_pos' in df.columns:
-        top_cities = df[city_col].value_counts().head(TOP_CITIES).index
-        sub = df[df[city_col].isin(top_cities)].copy()
+    city_col = q.first_present('city_clean', 'city')
+    if city_col and has_salary:
+        top_cities = q.top_values(city_col, TOP_CITIES)
+        sub = q.select([city_col, 'avg_salary_inr'], filters={city_col: top_cities}, positive=['avg_salary_inr'])
         if not sub.empty:
-            fig, ax = plt.subplots(figsize=(9, 4))
-            sns.boxplot(data=sub, x=city_col, y='avg_salary_inr_pos', ax=ax)
-            ax.set_yscale('log')
-            ax.set_xlabel('City')
-            ax.set_ylabel('Avg Salary (INR, log)')
-            ax.set_title('Salary by City (Top)')
-            plt.xticks(rotation=30, ha='right')
-            savefig('salary_by_city.png')
+            sub = sub.rename(columns={'avg_salary_inr': 'avg_salary_inr_pos'})
+            order = [c for c in top_cities if c in set(sub[city_col])]
+            if binned:
+                stats = plot_binning.box_stats(sub['avg_salary_inr_pos'], sub[city_col], order)
+                tasks.append(PlotTask('salary_by_city.png', plot_box_stats,
+                                      {'stats': stats, 'xlabel': 'City', 'title': 'Salary by City (Top)', 'figsize': (9, 4), 'rotate': True}))
+            else:
+                tasks.append(PlotTask('salary_by_city.png', plot_salary_by_city, {'data': sub, 'city_col': city_col, 'order': order}))
 
     # 3) Top categories
-    cat_col = 'category_searched_clean' if 'category_searched_clean' in df.columns else ('category_searched' if 'category_searched' in df.columns else None)
+    cat_col = q.first_present('category_searched_clean', 'category_searched')
     if cat_col:
-        vc = df[cat_col].value_counts().head(TOP_CATEGORIES)
+        vc = q.value_counts(cat_col, n=TOP_CATEGORIES)
         if not vc.empty:
-            fig, ax = plt.subplots(figsize=(8, 5))
-            vc.sort_values().plot(kind='barh', ax=ax)
-            ax.set_title('Top Categories')
-            ax.set_xlabel('Count')
-            savefig('top_categories.png')
+            tasks.append(PlotTask('top_categories.png', plot_top_counts, {'counts': vc, 'title': 'Top Categories'}))
 
     # 4) Top companies
-    comp_col = 'company_clean' if 'company_clean' in df.columns else ('company' if 'company' in df.columns else None)
+    comp_col = q.first_present('company_clean', 'company')
     if comp_col:
-        vc = df[comp_col].value_counts()
+        vc = q.value_counts(comp_col, n=TOP_COMPANIES + len(COMPANY_PLACEHOLDERS))
         # Exclude generic placeholders
-        vc = vc[[i for i in vc.index if isinstance(i, str) and i.strip().lower() not in {'not specified', 'none', 'na', 'n/a'}]].head(TOP_COMPANIES)
+        vc = vc[[i for i in vc.index if isinstance(i, str) and i.strip().lower() not in COMPANY_PLACEHOLDERS]].head(TOP_COMPANIES)
         if not vc.empty:
-            fig, ax = plt.subplots(figsize=(8, 5))
-            vc.sort_values().plot(kind='barh', ax=ax)
-            ax.set_title('Top Companies')
-            ax.set_xlabel('Count')
-            savefig('top_companies.png')
+            tasks.append(PlotTask('top_companies.png', plot_top_counts, {'counts': vc, 'title': 'Top Companies'}))
 
     # 5) Top skills
-    skills_col = 'skills_clean' if 'skills_clean' in df.columns else ('skills' if 'skills' in df.columns else None)
-    top_skills = []
+    skills_col = q.first_present('skills_clean', 'skills')
     if skills_col:
-        from collections import Counter
-        counter = Counter()
-        for s in df[skills_col].dropna():
-            for sk in split_skills(s):
-                counter[sk] += 1
-        top_skills = [sk for sk, _ in counter.most_common(TOP_SKILLS)]
-        if top_skills:
-            ser = pd.Series({sk: counter[sk] for sk in top_skills})
-            fig, ax = plt.subplots(figsize=(8, 5))
-            ser.sort_values().plot(kind='barh', ax=ax)
-            ax.set_title('Top Skills')
-            ax.set_xlabel('Count')
-            savefig('top_skills.png')
-
-    # 6) Skill co-occurrence heatmap (top CO_SKILLS)
-    if top_skills:
-        co = top_skills[:CO_SKILLS]
-        mat = pd.DataFrame(0, index=co, columns=co)
-        for s in df[skills_col].dropna():
-            lst = set(split_skills(s))
-            present = [sk for sk in co if sk in lst]
-            for i in range(len(present)):
-                for j in range(len(present)):
-                    if i != j:
-                        mat.loc[present[i], present[j]] += 1
-        fig, ax = plt.subplots(figsize=(7, 6))
-        sns.heatmap(mat, cmap='Blues', ax=ax)
-        ax.set_title('Skill Co-occurrence (Top)')
-        savefig('skills_cooccurrence.png')
+        ser = q.token_counts(skills_col, n=TOP_SKILLS)
+        if not ser.empty:
+            tasks.append(PlotTask('top_skills.png', plot_top_counts, {'counts': ser, 'title': 'Top Skills'}))
+            # 6) Skill co-occurrence heatmap (top CO_SKILLS)
+            skills = q.select([skills_col], not_null=[skills_col])[skills_col]
+            co = list(ser.index[:CO_SKILLS])
+            if binned:
+                tasks.append(PlotTask('skills_cooccurrence.png', plot_cooccurrence_matrix,
+                                      {'counts': plot_binning.cooccurrence(skills, co)}))
+            else:
+                tasks.append(PlotTask('skills_cooccurrence.png', plot_skill_cooccurrence, {'skills': skills, 'co': co}))
 
     # 7) Salary by experience level
-    if 'experience_level' in df.columns and 'avg_salary_inr_pos' in df.columns:
-        sub = df[['experience_level', 'avg_salary_inr_pos']].dropna()
+    if q.has('experience_level') and has_salary:
+        sub = q.select(['experience_level', 'avg_salary_inr'], not_null=['experience_level'], positive=['avg_salary_inr'])
         if not sub.empty:
-            fig, ax = plt.subplots(figsize=(7, 4))
-            sns.boxplot(data=sub, x='experience_level', y='avg_salary_inr_pos', order=['Entry','Junior','Mid','Senior'], ax=ax)
-            ax.set_yscale('log')
-            ax.set_title('Salary by Experience Level')
-            ax.set_xlabel('Experience Level')
-            ax.set_ylabel('Avg Salary (INR, log)')
-            savefig('salary_by_experience_level.png')
+            sub = sub.rename(columns={'avg_salary_inr': 'avg_salary_inr_pos'})
+            if binned:
+                stats = plot_binning.box_stats(sub['avg_salary_inr_pos'], sub['experience_level'], LEVEL_ORDER)
+                tasks.append(PlotTask('salary_by_experience_level.png', plot_box_stats,
+                                      {'stats': stats, 'xlabel': 'Experience Level', 'title': 'Salary by Experience Level', 'figsize': (7, 4)}))
+            else:
+                tasks.append(PlotTask('salary_by_experience_level.png', plot_salary_by_level, {'data': sub}))
 
     # 8) Salary vs experience (scatter)
-    if 'exp_min_years' in df.columns and 'avg_salary_inr_pos' in df.columns:
-        sub = df[['exp_min_years', 'avg_salary_inr_pos']].dropna()
+    if q.has('exp_min_years') and has_salary:
+        sub = q.select(['exp_min_years', 'avg_salary_inr'], not_null=['exp_min_years'], positive=['avg_salary_inr'])
         if not sub.empty:
-            fig, ax = plt.subplots(figsize=(6, 4))
-            sns.scatterplot(data=sub, x='exp_min_years', y='avg_salary_inr_pos', alpha=0.4, ax=ax)
-            ax.set_yscale('log')
-            ax.set_xlabel('Min Experience (years)')
-            ax.set_ylabel('Avg Salary (INR, log)')
-            ax.set_title('Salary vs Experience')
-            savefig('salary_vs_experience.png')
-
-    # 9) City-category heatmap
-    if city_col and cat_col:
-        ct = pd.crosstab(df[city_col], df[cat_col])
-        # Filter top cities/cats by totals
-        ct = ct.loc[ct.sum(axis=1).sort_values(ascending=False).head(12).index]
-        ct = ct[ct.sum(axis=0).sort_values(ascending=False).head(12).index]
-        if not ct.empty:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            sns.heatmap(ct, cmap='Greens', ax=ax)
-            ax.set_title('City vs Category (Counts)')
-            savefig('city_category_heatmap.png')
+            sub = sub.rename(columns={'avg_salary_inr': 'avg_salary_inr_pos'})
+            if binned:
+                grid = plot_binning.grid_counts(sub['exp_min_years'].to_numpy(), sub['avg_salary_inr_pos'].to_numpy())
+                tasks.append(PlotTask('salary_vs_experience.png', plot_salary_vs_experience_binned,
+                                      {'grid': grid, 'sample': plot_binning.sample_rows(sub, sample)}))
+            else:
+                tasks.append(PlotTask('salary_vs_experience.png', plot_salary_vs_experience, {'data': sub}))
+
+    # 9) City-category heatmap (top cities/cats by totals), on the cube's normalized dimensions
+    # either way; datasets cleaned before those columns existed fall back to the raw ones
+    heat_row, heat_col = q.first_present('city_norm', city_col), q.first_present('category_standard', cat_col)
+    if cube is not None:
+        ct = cube.crosstab('city_norm', 'category_standard', top_rows=12, top_cols=12)
+    elif heat_row and heat_col:
+        ct = q.crosstab(heat_row, heat_col, top_rows=12, top_cols=12)
+    else:
+        ct = pd.DataFrame()
+    if not ct.empty:
+        tasks.append(PlotTask('city_category_heatmap.png', plot_city_category, {'counts': ct}))
+
+    return tasks, {'city': city_col, 'category': cat_col, 'company': comp_col}
+
+
+def eda(workers: Optional[int] = None, force: bool = False, binned: bool = False,
+        sample: int = SCATTER_SAMPLE, metrics: Optional[RunMetrics] = None) -> Dict[str, Optional[float]]:
+    metrics = metrics or RunMetrics('eda')
+    ensure_cleaned_ready()
+    # Aggregates run inside DuckDB; only the columns a figure needs are materialized
+    q = JobQueries(CLEANED)
+    # Count-only aggregates come from the pre-aggregated cube when it is current
+    cube = load_fresh_cube(q)
+    has_salary = q.has('avg_salary_inr')
+
+    with metrics.stage('query_inputs'):
+        tasks, cols = build_plot_tasks(q, cube, binned=binned, sample=sample)
+    city_col, cat_col, comp_col = cols['city'], cols['category'], cols['company']
+    with metrics.stage('render_figures'):
+        timings = render_tasks(tasks, workers=workers, force=force)
+    print("Figure render times:")
+    for name, secs in timings.items():
+        print(f"  {name:<32} " + (f"{secs:.2f}s" if secs is not None else "skipped (inputs unchanged)"))
+        if secs is not None:
+            metrics.observe('figure_render', secs)
+    metrics.info['figure_seconds'] = timings
 
     # Append summary text to report
     lines = []
@@ -191,48 +428,64 @@ def eda():
     lines.append("## EDA Summary")
 
     # Text metrics (no dates/paths)
-    lines.append(f"Rows analyzed: {len(df)}")
-    nn_salary = int(df['avg_salary_inr'].notna().sum()) if 'avg_salary_inr' in df.columns else 0
+    lines.append(f"Rows analyzed: {q.row_count()}")
+    nn_salary = q.non_null_count('avg_salary_inr') if has_salary else 0
     lines.append(f"Rows with salary: {nn_salary}")
 
     if city_col:
-        city_counts = df[city_col].value_counts().head(5)
+        city_counts = q.value_counts(city_col, n=5)
         lines.append("Top cities: " + ", ".join([f"{c} ({n})" for c, n in city_counts.items()]))
 
     if cat_col:
-        cat_counts = df[cat_col].value_counts().head(5)
+        cat_counts = q.value_counts(cat_col, n=5)
         lines.append("Top categories: " + ", ".join([f"{c} ({n})" for c, n in cat_counts.items()]))
 
     if comp_col:
-        comp_counts = df[comp_col].value_counts().head(5)
+        comp_counts = q.value_counts(comp_col, n=5)
         lines.append("Top companies: " + ", ".join([f"{c} ({n})" for c, n in comp_counts.items()]))
 
-    if 'experience_level' in df.columns:
-        lvl_counts = df['experience_level'].value_counts()
-        items = [f"{lvl} ({lvl_counts.get(lvl, 0)})" for lvl in ['Entry','Junior','Mid','Senior'] if lvl in lvl_counts]
+    if cube is not None:
+        lvl_counts = cube.rollup(['experience_level'])['count']
+    elif q.has('experience_level'):
+        lvl_counts = q.value_counts('experience_level')
+    else:
+        lvl_counts = None
+    if lvl_counts is not None:
+        items = [f"{lvl} ({lvl_counts.get(lvl, 0)})" for lvl in LEVEL_ORDER if lvl in lvl_counts]
         if items:
             lines.append("Experience levels: " + ", ".join(items))
 
     # List created figures
-    figs = [
-        'salary_distribution.png',
-        'salary_by_city.png',
-        'top_categories.png',
-        'top_companies.png',
-        'top_skills.png',
-        'skills_cooccurrence.png',
-        'salary_by_experience_level.png',
-        'salary_vs_experience.png',
-        'city_category_heatmap.png'
-    ]
-    existing = [f for f in figs if os.path.exists(os.path.join(FIGDIR, f))]
+    existing = [f for f in FIGURES if os.path.exists(os.path.join(FIGDIR, f))]
     if existing:
         lines.append("Figures: " + ", ".join([os.path.join('reports','figures',f) for f in existing]))
 
+    lines.extend(metrics.markdown_lines('Performance (EDA)'))
+    rendered = [f"{name} {secs:.2f}s" for name, secs in timings.items() if secs is not None]
+    if rendered:
+        lines.append("- Figure render times: " + ", ".join(rendered))
+
     os.makedirs(os.path.dirname(REPORT), exist_ok=True)
     with open(REPORT, 'a', encoding='utf-8') as f:
         f.write("\n" + "\n".join(lines))
 
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render EDA figures and append the EDA summary')
+    parser.add_argument('--workers', type=int, default=None, help='Render processes (default: one per CPU, 1 = serial)')
+    parser.add_argument('--force', action='store_true', help='Re-render figures even if their inputs are unchanged')
+    parser.add_argument('--binned', action='store_true', help='Plot from NumPy pre-binned summaries (large datasets)')
+    parser.add_argument('--sample', type=int, default=SCATTER_SAMPLE, help='Max points in binned scatter overlays')
+    parser.add_argument('--metrics', default=None, help='Metrics JSON path (default: reports/metrics/eda_<timestamp>.json)')
+    parser.add_argument('--profile', default=None, help='Write a cProfile dump of the run to this path')
+    args = parser.parse_args()
+    metrics = RunMetrics('eda')
+    with maybe_profile(args.profile):
+        eda(workers=args.workers, force=args.force, binned=args.binned, sample=args.sample, metrics=metrics)
+    print(f"Metrics written to: {metrics.write_json(args.metrics)}")
+
 
 if __name__ == '__main__':
-    eda()
+    main()
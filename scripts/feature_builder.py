@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Vectorized feature building for data_preprocessing.py
+- One preallocated rows × features block filled column by column: numeric pass-through,
+  masked np.log1p salary logs, ordinal experience level, pd.cut salary bands,
+  categorical and top-skill indicators
+- Skills are tokenized once per distinct skills string rather than once per row and skill
+- Columns and values match the per-row builder it replaces
+  (data_preprocessing.build_features_reference)
+- write_feature_matrix: float32 memory-mapped matrix plus a JSON column manifest for
+  model training; load_feature_matrix maps it back read-only
+"""
+from __future__ import annotations
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_COLUMNS = ['min_salary_inr', 'max_salary_inr', 'avg_salary_inr', 'avg_salary_inr_capped', 'avg_salary_lpa',
+                   'avg_salary_lpa_capped', 'exp_min_years', 'exp_max_years']
+LOG_COLUMNS = {'log_avg_salary': 'avg_salary_inr', 'log_avg_salary_capped': 'avg_salary_inr_capped'}
+CATEGORICAL_COLUMNS = ['source', 'job_type', 'location_tier']
+ID_COLUMNS = ['job_id', 'title_clean', 'company_clean', 'city_clean', 'category_searched_clean']
+LEVEL_MAP = {'Entry': 0, 'Junior': 1, 'Mid': 2, 'Senior': 3}
+
+SALARY_BAND_BINS = [-np.inf, 3, 6, 10, 20, np.inf]
+SALARY_BAND_LABELS = ['<3 LPA', '3-6 LPA', '6-10 LPA', '10-20 LPA', '>=20 LPA']
+
+MANIFEST_SUFFIX = '.manifest.json'
+MATRIX_CHUNK_ROWS = 1 << 18
+
+
+def skill_column_name(skill: str) -> str:
+    return f"skill_{skill.replace(' ', '_').replace('/', '_')}"
+
+
+def _float_values(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _skill_tokens(text: str) -> List[str]:
+    return [p.strip() for p in text.split(',') if p.strip()]
+
+
+def top_skills(df: pd.DataFrame, skills_col: str = 'skills_clean', top_n: int = 30) -> List[str]:
+    """Most frequent skill tokens, ties in order of first appearance (as Counter.most_common)."""
+    if skills_col not in df.columns:
+        return []
+    counts = df[skills_col].dropna().astype(str).value_counts(sort=False)
+    totals: Dict[str, int] = {}
+    for text, n in counts.items():
+        for token in _skill_tokens(text):
+            totals[token] = totals.get(token, 0) + n
+    # value_counts(sort=False) keeps first-appearance order of the strings, and so of their tokens
+    return [sk for sk, _ in sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:top_n]]
+
+
+def _skill_indicators(series: pd.Series, skills: List[str]) -> np.ndarray:
+    """rows × len(skills) bool matrix: row's comma-separated skills contain the skill (case-insensitive)."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    targets: Dict[str, List[int]] = {}
+    for j, sk in enumerate(skills):
+        targets.setdefault(sk.lower(), []).append(j)
+    # one extra all-False row for missing values (code -1)
+    per_unique = np.zeros((len(uniques) + 1, len(skills)), dtype=bool)
+    for i, text in enumerate(uniques):
+        for token in str(text).split(','):
+            for j in targets.get(token.strip().lower(), ()):
+                per_unique[i, j] = True
+    return per_unique[codes]
+
+
+@dataclass
+class FeatureBlock:
+    """Feature values (rows × columns), their names, the indicator columns and the id columns."""
+    values: np.ndarray
+    columns: List[str]
+    indicator_columns: List[str]
+    ids: pd.DataFrame
+    top_skills: List[str]
+    index: Optional[pd.Index] = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """ids + features as a DataFrame (indicator columns as int, like pd.get_dummies(dtype=int))."""
+        frame = pd.DataFrame(self.values, columns=self.columns, index=self.index)
+        if self.indicator_columns:
+            frame = frame.astype({c: np.int64 for c in self.indicator_columns})
+        if len(self.ids.columns):
+            frame = pd.concat([self.ids, frame], axis=1)
+        return frame
+
+
+def build_feature_block(df: pd.DataFrame, top_n: int = 30, dtype=np.float64,
+                        out: Optional[np.ndarray] = None) -> FeatureBlock:
+    """
+    Compute every feature column into one rows × features array.
+    `out` may be a preallocated array (e.g. a float32 np.memmap) of the right shape;
+    use feature_columns() to size it.
+    """
+    plan, indicators, skills = _plan(df, top_n)
+    n = len(df)
+    if out is None:
+        out = np.empty((n, len(plan)), dtype=dtype)
+    elif out.shape != (n, len(plan)):
+        raise ValueError(f"out has shape {out.shape}, expected {(n, len(plan))}")
+    for j, fill in enumerate(plan.values()):
+        out[:, j] = fill()
+    ids = df[[c for c in ID_COLUMNS if c in df.columns]]
+    return FeatureBlock(out, list(plan), [c for c in plan if c in indicators], ids, skills, df.index)
+
+
+def feature_columns(df: pd.DataFrame, top_n: int = 30) -> List[str]:
+    return list(_plan(df, top_n)[0])
+
+
+def _plan(df: pd.DataFrame, top_n: int) -> Tuple[Dict[str, Callable[[], np.ndarray]], set, List[str]]:
+    """Ordered column name -> function producing that column; later duplicates replace earlier ones in place."""
+    plan: Dict[str, Callable[[], np.ndarray]] = {}
+    indicators = set()
+
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            plan[col] = lambda col=col: _float_values(df[col])
+
+    for name, col in LOG_COLUMNS.items():
+        if col in df.columns:
+            def log1p_positive(col=col):
+                v = _float_values(df[col])
+                out = np.full(len(v), np.nan)
+                np.log1p(v, out=out, where=v > 0)
+                return out
+            plan[name] = log1p_positive
+
+    if 'experience_level' in df.columns:
+        plan['experience_level_code'] = lambda: _float_values(df['experience_level'].map(LEVEL_MAP))
+
+    if 'avg_salary_lpa' in df.columns:
+        bands = pd.cut(_float_values(df['avg_salary_lpa']), SALARY_BAND_BINS, right=False, labels=SALARY_BAND_LABELS)
+        band_codes = np.asarray(bands.codes)
+        present = np.unique(band_codes[band_codes >= 0])
+        # pd.get_dummies orders the labels as strings
+        for label in sorted(SALARY_BAND_LABELS[i] for i in present):
+            name = f"salary_band_{label}"
+            plan[name] = lambda i=SALARY_BAND_LABELS.index(label), codes=band_codes: codes == i
+            indicators.add(name)
+
+    for cat_col in CATEGORICAL_COLUMNS:
+        if cat_col in df.columns:
+            codes, cats = pd.factorize(df[cat_col].fillna('Unknown'), sort=True)
+            for i, value in enumerate(cats):
+                name = f"{cat_col}_{value}"
+                plan[name] = lambda i=i, codes=codes: codes == i
+                indicators.add(name)
+
+    skills = top_skills(df, 'skills_clean', top_n=top_n)
+    if skills:
+        skill_matrix: Dict[str, np.ndarray] = {}
+
+        def skill_column(j):
+            if 'm' not in skill_matrix:
+                skill_matrix['m'] = _skill_indicators(df['skills_clean'], skills)
+            return skill_matrix['m'][:, j]
+
+        for j, sk in enumerate(skills):
+            name = skill_column_name(sk)
+            plan[name] = lambda j=j: skill_column(j)
+            indicators.add(name)
+    return plan, indicators, skills
+
+
+def write_feature_matrix(path: str, block: FeatureBlock, **meta) -> str:
+    """
+    Write block.values as a row-major float32 memmap at `path`, plus `path` + MANIFEST_SUFFIX
+    (shape, dtype, columns, indicator columns, top skills). Returns the manifest path.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    n, k = block.values.shape
+    if n:
+        mm = np.memmap(path, dtype=np.float32, mode='w+', shape=(n, k))
+        for start in range(0, n, MATRIX_CHUNK_ROWS):
+            mm[start:start + MATRIX_CHUNK_ROWS] = block.values[start:start + MATRIX_CHUNK_ROWS]
+        mm.flush()
+        del mm
+    else:
+        open(path, 'wb').close()
+    manifest = {
+        'format': 'float32-row-major',
+        'dtype': 'float32',
+        'shape': [n, k],
+        'columns': block.columns,
+        'indicator_columns': block.indicator_columns,
+        'top_skills': block.top_skills,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        **meta,
+    }
+    manifest_path = path + MANIFEST_SUFFIX
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+
+def load_feature_matrix(path: str, columns: Optional[List[str]] = None) -> Tuple[np.ndarray, dict]:
+    """Read-only memmap of a matrix written by write_feature_matrix (optionally a column subset, copied)."""
+    with open(path + MANIFEST_SUFFIX, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    n, k = manifest['shape']
+    matrix = np.memmap(path, dtype=np.float32, mode='r', shape=(n, k)) if n else np.empty((0, k), np.float32)
+    if columns is not None:
+        pos = {c: i for i, c in enumerate(manifest['columns'])}
+        matrix = matrix[:, [pos[c] for c in columns]]
+    return matrix, manifest
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Versioned, memory-mapped feature store published by data_preprocessing.py
+- One directory per version (v0001, v0002, ...) under the store root; CURRENT names the
+  latest complete version, so readers never see a half-written one
+- dense.npy: float32 numeric + indicator features, column-major, so every column is a
+  contiguous zero-copy view of the mapped file
+- skills_indptr.npy / skills_indices.npy: CSR matrix of every skill token per row
+  (binary, lowercased), vocabulary in skills_vocab.json ordered by frequency
+- ids.arrow: id columns (job_id, title, company, ...) as an uncompressed Arrow IPC file,
+  memory-mapped on read
+- manifest.json: version, row count, columns, dtypes and provenance
+
+    python scripts/feature_store.py --show
+    python scripts/feature_store.py --show --version 3
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from feature_builder import FeatureBlock
+
+DEFAULT_STORE = os.path.join('data', 'processed', 'feature_store')
+CURRENT_FILE = 'CURRENT'
+FORMAT_VERSION = 1
+
+
+def _version_dirs(root: str) -> List[int]:
+    if not os.path.isdir(root):
+        return []
+    return sorted(int(d[1:]) for d in os.listdir(root) if d.startswith('v') and d[1:].isdigit())
+
+
+def _version_name(version: int) -> str:
+    return f"v{version:04d}"
+
+
+def skill_csr(series: pd.Series) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Binary CSR of lowercased, stripped comma-separated skill tokens per row.
+    Returns (indptr int64, indices int32, vocabulary by descending frequency).
+    Each distinct skills string is tokenized once.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    row_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    token_ids: Dict[str, int] = {}
+    per_unique: List[List[int]] = []
+    for text in uniques:
+        ids = {token_ids.setdefault(t, len(token_ids)) for t in (p.strip().lower() for p in str(text).split(',')) if t}
+        per_unique.append(sorted(ids))
+
+    # renumber tokens by descending row frequency (ties by first appearance)
+    freq = np.zeros(len(token_ids), dtype=np.int64)
+    for ids, n in zip(per_unique, row_counts):
+        freq[ids] += n
+    order = np.argsort(-freq, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    names = list(token_ids)
+    vocab = [names[i] for i in order]
+
+    per_unique = [sorted(rank[i] for i in ids) for ids in per_unique]
+    u_lens = np.array([len(ids) for ids in per_unique] + [0], dtype=np.int64)  # last entry: missing rows
+    u_indptr = np.concatenate([[0], np.cumsum(u_lens)])
+    u_indices = np.array([i for ids in per_unique for i in ids], dtype=np.int32)
+
+    lens = u_lens[codes]
+    indptr = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(lens, out=indptr[1:])
+    starts = u_indptr[codes]
+    gather = np.repeat(starts - indptr[:-1], lens) + np.arange(indptr[-1])
+    return indptr, u_indices[gather], vocab
+
+
+def publish_feature_store(block: FeatureBlock, skills: Optional[pd.Series] = None, root: str = DEFAULT_STORE,
+                          keep: int = 3, **meta) -> str:
+    """
+    Write a new version of the store from a FeatureBlock (plus the raw skills column for
+    the CSR matrix), point CURRENT at it and drop all but the newest `keep` versions.
+    Returns the version directory.
+    """
+    versions = _version_dirs(root)
+    version = (versions[-1] + 1) if versions else 1
+    final_dir = os.path.join(root, _version_name(version))
+    tmp_dir = final_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    n, k = block.values.shape
+    dense = np.lib.format.open_memmap(os.path.join(tmp_dir, 'dense.npy'), mode='w+', dtype=np.float32,
+                                      shape=(n, k), fortran_order=True)
+    for j in range(k):
+        dense[:, j] = block.values[:, j]
+    dense.flush()
+    del dense
+
+    nnz, vocab = 0, []
+    if skills is not None:
+        indptr, indices, vocab = skill_csr(skills)
+        np.save(os.path.join(tmp_dir, 'skills_indptr.npy'), indptr)
+        np.save(os.path.join(tmp_dir, 'skills_indices.npy'), indices)
+        with open(os.path.join(tmp_dir, 'skills_vocab.json'), 'w', encoding='utf-8') as f:
+            json.dump(vocab, f, ensure_ascii=False)
+        nnz = int(indptr[-1])
+
+    ids = pa.Table.from_pandas(block.ids.reset_index(drop=True).astype('string'), preserve_index=False)
+    with pa.OSFile(os.path.join(tmp_dir, 'ids.arrow'), 'wb') as sink:
+        with pa.ipc.new_file(sink, ids.schema) as writer:
+            writer.write_table(ids)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'version': version,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'rows': n,
+        'dense': {'file': 'dense.npy', 'dtype': 'float32', 'order': 'F', 'columns': block.columns,
+                  'indicator_columns': block.indicator_columns},
+        'skills': {'indptr': 'skills_indptr.npy', 'indices': 'skills_indices.npy', 'vocab': 'skills_vocab.json',
+                   'vocab_size': len(vocab), 'nnz': nnz} if skills is not None else None,
+        'ids': {'file': 'ids.arrow', 'columns': list(block.ids.columns)},
+        'top_skills': block.top_skills,
+        **meta,
+    }
+    with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(tmp_dir, final_dir)
+    current_tmp = os.path.join(root, CURRENT_FILE + '.tmp')
+    with open(current_tmp, 'w', encoding='utf-8') as f:
+        f.write(_version_name(version) + '\n')
+    os.replace(current_tmp, os.path.join(root, CURRENT_FILE))
+
+    for old in _version_dirs(root)[:-keep] if keep else []:
+        shutil.rmtree(os.path.join(root, _version_name(old)), ignore_errors=True)
+    return final_dir
+
+
+class FeatureStore:
+    """
+    Read-only view of one store version. Arrays are memory-mapped: opening costs a few
+    file maps regardless of row count, and columns are only paged in when touched.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE, version: Optional[int] = None):
+        if version is None:
+            with open(os.path.join(root, CURRENT_FILE), 'r', encoding='utf-8') as f:
+                name = f.read().strip()
+        else:
+            name = _version_name(version)
+        self.path = os.path.join(root, name)
+        with open(os.path.join(self.path, 'manifest.json'), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.version = self.manifest['version']
+        self.rows = self.manifest['rows']
+        self.columns: List[str] = self.manifest['dense']['columns']
+        self._pos = {c: i for i, c in enumerate(self.columns)}
+        self.dense = np.load(os.path.join(self.path, self.manifest['dense']['file']), mmap_mode='r')
+        self._skills = None
+        self._ids = None
+
+    def column(self, name: str) -> np.ndarray:
+        """One feature column as a zero-copy view."""
+        return self.dense[:, self._pos[name]]
+
+    def select(self, columns: List[str]) -> Dict[str, np.ndarray]:
+        """Zero-copy views for a subset of columns."""
+        return {c: self.column(c) for c in columns}
+
+    def matrix(self, columns: Optional[List[str]] = None) -> np.ndarray:
+        """rows × columns matrix: a view for all columns or a contiguous run, otherwise a copy."""
+        if columns is None:
+            return self.dense
+        pos = [self._pos[c] for c in columns]
+        if pos == list(range(pos[0], pos[0] + len(pos))):
+            return self.dense[:, pos[0]:pos[0] + len(pos)]
+        return np.asfortranarray(self.dense[:, pos])
+
+    def skills(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """(indptr, indices, vocabulary) of the skill CSR matrix, memory-mapped."""
+        if self._skills is None:
+            spec = self.manifest['skills']
+            if spec is None:
+                raise KeyError(f"Feature store {self.path} has no skill matrix")
+            with open(os.path.join(self.path, spec['vocab']), 'r', encoding='utf-8') as f:
+                vocab = json.load(f)
+            self._skills = (np.load(os.path.join(self.path, spec['indptr']), mmap_mode='r'),
+                            np.load(os.path.join(self.path, spec['indices']), mmap_mode='r'), vocab)
+        return self._skills
+
+    def skills_csr(self):
+        """The skill matrix as scipy.sparse.csr_matrix (requires scipy; shares the mapped arrays)."""
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError as e:
+            raise ImportError("skills_csr() requires scipy; use skills() for the raw CSR arrays") from e
+        indptr, indices, vocab = self.skills()
+        data = np.ones(len(indices), dtype=np.float32)
+        return csr_matrix((data, indices, indptr), shape=(self.rows, len(vocab)), copy=False)
+
+    def ids(self) -> pa.Table:
+        """Id columns as a memory-mapped Arrow table."""
+        if self._ids is None:
+            source = pa.memory_map(os.path.join(self.path, self.manifest['ids']['file']), 'r')
+            self._ids = pa.ipc.open_file(source).read_all()
+        return self._ids
+
+    def frame(self, columns: Optional[List[str]] = None, with_ids: bool = True) -> pd.DataFrame:
+        """Copy of (ids +) feature columns as a DataFrame."""
+        columns = columns or self.columns
+        data = {c: self.column(c) for c in columns}
+        out = pd.DataFrame(data)
+        if with_ids:
+            out = pd.concat([self.ids().to_pandas(), out], axis=1)
+        return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the feature store')
+    parser.add_argument('--store', default=DEFAULT_STORE)
+    parser.add_argument('--version', type=int, default=None)
+    parser.add_argument('--show', action='store_true', help='Print the manifest summary (default action)')
+    args = parser.parse_args()
+
+    versions = _version_dirs(args.store)
+    if not versions:
+        print(f"No feature store at {args.store}")
+        return
+    store = FeatureStore(args.store, args.version)
+    m = store.manifest
+    skills = m['skills'] or {}
+    print(f"{store.path}: version {store.version} of {', '.join(map(str, versions))}, created {m['created']}")
+    print(f"   {store.rows:,} rows, {len(store.columns)} dense columns ({len(m['dense']['indicator_columns'])} indicators), "
+          f"{skills.get('vocab_size', 0):,} skills / {skills.get('nnz', 0):,} non-zeros, ids: {', '.join(m['ids']['columns'])}")
+
+
+if __name__ == '__main__':
+    main()
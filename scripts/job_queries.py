@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Embedded analytical query layer for Cross Platform Job Analytics
+- Runs DuckDB in-process (no server) directly over the Parquet/CSV outputs
+- Prepared aggregate queries for EDA and data quality (value counts, missing
+  counts, duplicates, salary stats by group, city x category counts)
+- Filters and projections are pushed into the scan, so a query only reads the
+  columns it touches; prefers a fresh Parquet sibling of a CSV when present
+"""
+from __future__ import annotations
+import argparse
+import os
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import duckdb
+import pandas as pd
+
+DEFAULT_INPUT = os.path.join('data', 'processed', 'cleaned_jobs_dataset.csv')
+
+# DuckDB logical types -> pandas dtype names used in the markdown reports
+DTYPE_NAMES = {
+    'BIGINT': 'int64', 'INTEGER': 'int64', 'SMALLINT': 'int64', 'TINYINT': 'int64', 'HUGEINT': 'int64',
+    'DOUBLE': 'float64', 'FLOAT': 'float64', 'BOOLEAN': 'bool',
+    'VARCHAR': 'object', 'DATE': 'object', 'TIMESTAMP': 'datetime64[ns]', 'TIMESTAMP_NS': 'datetime64[ns]',
+}
+
+
+def parquet_sibling(path: str) -> Optional[str]:
+    """Return the .parquet twin of a CSV if it exists and is at least as new."""
+    if not path.lower().endswith('.csv'):
+        return None
+    pq = path[:-4] + '.parquet'
+    if os.path.exists(pq) and os.path.getmtime(pq) >= os.path.getmtime(path):
+        return pq
+    return None
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class JobQueries:
+    """Aggregate queries over a jobs dataset file, executed lazily by DuckDB."""
+
+    def __init__(self, path: str, prefer_parquet: bool = True):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        src = (parquet_sibling(path) if prefer_parquet else None) or path
+        self.path = src
+        self.con = duckdb.connect(database=':memory:')
+        if src.lower().endswith('.parquet'):
+            self.source = f"read_parquet({_quote_literal(src)})"
+        else:
+            # Full-file type sniffing: columns that are empty in the first rows
+            # (e.g. posting_date_text) must not be typed from a short sample.
+            self.source = f"read_csv({_quote_literal(src)}, header=true, auto_detect=true, sample_size=-1)"
+        self._schema: Optional[Dict[str, str]] = None
+
+    # ------------------------------------------------------------------
+    # Schema helpers
+    # ------------------------------------------------------------------
+    @property
+    def schema(self) -> Dict[str, str]:
+        if self._schema is None:
+            rows = self.con.execute(f"DESCRIBE SELECT * FROM {self.source}").fetchall()
+            self._schema = {r[0]: r[1] for r in rows}
+        return self._schema
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.schema)
+
+    def has(self, col: Optional[str]) -> bool:
+        return col is not None and col in self.schema
+
+    def first_present(self, *cols: str) -> Optional[str]:
+        for c in cols:
+            if self.has(c):
+                return c
+        return None
+
+    def dtypes(self) -> pd.Series:
+        return pd.Series({c: DTYPE_NAMES.get(t, 'object') for c, t in self.schema.items()})
+
+    def _col(self, col: str) -> str:
+        if col not in self.schema:
+            raise KeyError(f"Column '{col}' not found in {self.path}")
+        return _quote_ident(col)
+
+    def _where(self, filters: Optional[Dict[str, object]], extra: Iterable[str] = ()) -> tuple[str, list]:
+        clauses = list(extra)
+        params: list = []
+        for col, val in (filters or {}).items():
+            if isinstance(val, (list, tuple, set, pd.Index)):
+                vals = list(val)
+                if not vals:
+                    clauses.append('FALSE')
+                    continue
+                clauses.append(f"{self._col(col)} IN ({', '.join('?' * len(vals))})")
+                params.extend(vals)
+            elif val is None:
+                clauses.append(f"{self._col(col)} IS NULL")
+            else:
+                clauses.append(f"{self._col(col)} = ?")
+                params.append(val)
+        sql = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+        return sql, params
+
+    # ------------------------------------------------------------------
+    # Prepared aggregates
+    # ------------------------------------------------------------------
+    def row_count(self, filters: Optional[Dict[str, object]] = None) -> int:
+        where, params = self._where(filters)
+        return int(self.con.execute(f"SELECT count(*) FROM {self.source}{where}", params).fetchone()[0])
+
+    def non_null_count(self, col: str) -> int:
+        return int(self.con.execute(f"SELECT count({self._col(col)}) FROM {self.source}").fetchone()[0])
+
+    def missing_counts(self) -> pd.Series:
+        """Null count per column, sorted descending (pandas isnull().sum() equivalent)."""
+        exprs = ', '.join(f"count(*) - count({_quote_ident(c)})" for c in self.columns)
+        row = self.con.execute(f"SELECT {exprs} FROM {self.source}").fetchone()
+        return pd.Series(dict(zip(self.columns, (int(v) for v in row)))).sort_values(ascending=False, kind='stable')
+
+    def duplicate_count(self, subset: Sequence[str]) -> int:
+        """Rows that repeat an earlier row on `subset` (NULLs compare equal, like pandas)."""
+        if not subset:
+            return 0
+        cols = ', '.join(self._col(c) for c in subset)
+        sql = f"SELECT count(*) - (SELECT count(*) FROM (SELECT DISTINCT {cols} FROM {self.source})) FROM {self.source}"
+        return int(self.con.execute(sql).fetchone()[0])
+
+    def value_counts(self, col: str, n: Optional[int] = None, filters: Optional[Dict[str, object]] = None,
+                     dropna: bool = True, as_text: bool = False) -> pd.Series:
+        """
+        Counts per distinct value, most frequent first.
+        as_text=True mirrors `astype(str).value_counts()` (nulls reported as 'nan').
+        """
+        c = self._col(col)
+        expr = f"coalesce(CAST({c} AS VARCHAR), 'nan')" if as_text else c
+        extra = [] if (as_text or not dropna) else [f"{c} IS NOT NULL"]
+        where, params = self._where(filters, extra)
+        limit = f" LIMIT {int(n)}" if n is not None else ''
+        sql = f"SELECT {expr} AS v, count(*) AS n FROM {self.source}{where} GROUP BY v ORDER BY n DESC, v{limit}"
+        rows = self.con.execute(sql, params).fetchall()
+        return pd.Series([r[1] for r in rows], index=pd.Index([r[0] for r in rows], name=col), name='count', dtype='int64')
+
+    def top_values(self, col: str, n: int, exclude: Iterable[str] = ()) -> List[str]:
+        excl = {e.lower() for e in exclude}
+        vc = self.value_counts(col, n=n + len(excl))
+        return [v for v in vc.index if not (isinstance(v, str) and v.strip().lower() in excl)][:n]
+
+    def token_counts(self, col: str, n: Optional[int] = None, sep: str = ',') -> pd.Series:
+        """Counts of trimmed tokens inside a delimited text column (e.g. skills)."""
+        c = self._col(col)
+        limit = f" LIMIT {int(n)}" if n is not None else ''
+        sql = (
+            f"SELECT tok, count(*) AS n FROM ("
+            f"SELECT trim(unnest(string_split({c}, ?))) AS tok FROM {self.source} WHERE {c} IS NOT NULL"
+            f") WHERE tok <> '' GROUP BY tok ORDER BY n DESC, tok{limit}"
+        )
+        rows = self.con.execute(sql, [sep]).fetchall()
+        return pd.Series([r[1] for r in rows], index=pd.Index([r[0] for r in rows], name=col), name='count', dtype='int64')
+
+    def salary_stats_by(self, group_col: str, value_col: str = 'avg_salary_inr',
+                        groups: Optional[Sequence[object]] = None, positive_only: bool = True) -> pd.DataFrame:
+        """Count, mean and quartiles of a salary column per group."""
+        g, v = self._col(group_col), self._col(value_col)
+        extra = [f"{g} IS NOT NULL", f"{v} IS NOT NULL"] + ([f"{v} > 0"] if positive_only else [])
+        where, params = self._where({group_col: list(groups)} if groups is not None else None, extra)
+        sql = (
+            f"SELECT {g} AS grp, count(*) AS count, avg({v}) AS mean, min({v}) AS min, "
+            f"quantile_cont({v}, 0.25) AS q1, median({v}) AS median, quantile_cont({v}, 0.75) AS q3, max({v}) AS max "
+            f"FROM {self.source}{where} GROUP BY grp ORDER BY count DESC, grp"
+        )
+        out = self.con.execute(sql, params).df().set_index('grp')
+        out.index.name = group_col
+        return out
+
+    def crosstab(self, row_col: str, col_col: str, top_rows: Optional[int] = None,
+                 top_cols: Optional[int] = None) -> pd.DataFrame:
+        """City x category style count matrix, optionally limited to the largest rows/columns."""
+        r, c = self._col(row_col), self._col(col_col)
+        sql = (
+            f"SELECT {r} AS r, {c} AS c, count(*) AS n FROM {self.source} "
+            f"WHERE {r} IS NOT NULL AND {c} IS NOT NULL GROUP BY r, c"
+        )
+        long = self.con.execute(sql).df()
+        ct = long.pivot(index='r', columns='c', values='n').fillna(0).astype('int64')
+        ct.index.name, ct.columns.name = row_col, col_col
+        if top_rows is not None:
+            ct = ct.loc[ct.sum(axis=1).sort_values(ascending=False).head(top_rows).index]
+        if top_cols is not None:
+            ct = ct[ct.sum(axis=0).sort_values(ascending=False).head(top_cols).index]
+        return ct
+
+    def select(self, columns: Sequence[str], filters: Optional[Dict[str, object]] = None,
+               limit: Optional[int] = None, not_null: Sequence[str] = (), positive: Sequence[str] = ()) -> pd.DataFrame:
+        """Projected rows as a DataFrame; `not_null`/`positive` columns are filtered in the scan."""
+        cols = ', '.join(self._col(c) for c in columns)
+        extra = [f"{self._col(c)} IS NOT NULL" for c in not_null] + [f"{self._col(c)} > 0" for c in positive]
+        where, params = self._where(filters, extra)
+        lim = f" LIMIT {int(limit)}" if limit is not None else ''
+        return self.con.execute(f"SELECT {cols} FROM {self.source}{where}{lim}", params).df()
+
+    def close(self):
+        self.con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run prepared aggregate queries over a jobs dataset')
+    parser.add_argument('--input', default=DEFAULT_INPUT)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    q = JobQueries(args.input)
+    print(f"Source: {q.path} ({q.row_count()} rows)")
+    city_col = q.first_present('city_norm', 'city_clean', 'city')
+    cat_col = q.first_present('category_standard', 'category_searched_clean', 'category_searched')
+    if city_col:
+        print("\nTop cities:")
+        print(q.value_counts(city_col, n=args.top).to_string())
+        if q.has('avg_salary_inr'):
+            print("\nSalary by city:")
+            print(q.salary_stats_by(city_col, groups=q.top_values(city_col, args.top)).round(0).to_string())
+    if q.has('experience_level') and q.has('avg_salary_inr'):
+        print("\nSalary by experience level:")
+        print(q.salary_stats_by('experience_level').round(0).to_string())
+    if city_col and cat_col:
+        print("\nCity x category (top):")
+        print(q.crosstab(city_col, cat_col, top_rows=args.top, top_cols=6).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Historical job store: every collection run upserted into one SQLite file, nothing overwritten
+- Each posting (job_id) is kept as versions with a validity interval [valid_from, valid_to);
+  a run that sees different field values closes the current version and opens a new one
+  (slowly changing dimension, type 2). Unchanged postings cost no write
+- Runs are staged into a TEMP table with batched executemany, then applied with three
+  set-based statements in one transaction: close changed (and, for full snapshots, missing)
+  postings, insert new versions, record the run
+- Changes are detected on a 64-bit hash of the posting's own fields computed in pandas, so
+  no text column is compared in SQL. Search metadata (which category the posting was found
+  under, its URL) is stored with each version but not hashed: a posting seen by several
+  concurrent combinations takes whichever saw it first, which must not open a new version
+- as_of(): postings live at an instant; time_series(): counts and salaries per
+  category/city at every run; history(): all versions of one posting
+
+    python scripts/job_store.py ingest --input data/raw/complete_jobs_data_<session>.csv
+    python scripts/job_store.py as-of --date 2025-01-15
+    python scripts/job_store.py series --by city
+"""
+from __future__ import annotations
+import argparse
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from salary_parser import parse_salary_text
+from schema_validation import MAX_SALARY_INR, MIN_SALARY_INR
+
+DEFAULT_STORE = os.path.join('data', 'processed', 'job_store.sqlite')
+FORMAT_VERSION = 2
+BATCH_ROWS = 50_000
+
+KEY_COLUMN = 'job_id'
+SESSION_COLUMN = 'collection_session'
+SESSION_FORMAT = '%Y%m%d_%H%M%S'
+TRACKED_COLUMNS = ['title', 'company', 'city', 'salary_text', 'experience_text', 'job_type', 'skills', 'source']
+SEARCH_COLUMNS = ['category_searched', 'job_url']
+TEXT_COLUMNS = TRACKED_COLUMNS + SEARCH_COLUMNS
+SALARY_COLUMNS = ['min_salary_inr', 'max_salary_inr', 'avg_salary_inr']
+SERIES_GROUPS = ('category_searched', 'city', 'source', 'job_type')
+
+_VALUE_COLUMNS = TEXT_COLUMNS + SALARY_COLUMNS
+
+
+def _instant(value, end_of_day: bool = True) -> str:
+    """ISO-8601 text (sorts like time); a bare date means the end (or start) of that day."""
+    if isinstance(value, str) and len(value) == 10:
+        return f"{value}T{'23:59:59' if end_of_day else '00:00:00'}"
+    return pd.Timestamp(value).isoformat(timespec='seconds')
+
+
+def session_instant(session: str) -> str:
+    return datetime.strptime(session, SESSION_FORMAT).isoformat(timespec='seconds')
+
+
+def _parse_salaries(texts: pd.Series) -> pd.DataFrame:
+    uniques = pd.unique(texts.dropna().to_numpy(dtype=object))
+    parsed = {t: parse_salary_text(t) for t in uniques}
+    rows = [parsed.get(t, (None, None, None)) if isinstance(t, str) else (None, None, None) for t in texts]
+    return pd.DataFrame(rows, columns=SALARY_COLUMNS, index=texts.index, dtype='float64')
+
+
+def prepare_run(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per job_id (the last scraped), sorted by job_id, with the stored columns and the content hash."""
+    frame = df.drop_duplicates(KEY_COLUMN, keep='last')
+    out = pd.DataFrame({KEY_COLUMN: frame[KEY_COLUMN].astype(str)}, index=frame.index)
+    for col in TEXT_COLUMNS:
+        out[col] = frame[col].astype(object).where(frame[col].notna(), None) if col in frame.columns else None
+    salary = frame['salary_text'] if 'salary_text' in frame.columns else pd.Series(None, index=frame.index, dtype=object)
+    out[SALARY_COLUMNS] = _parse_salaries(salary)
+    hashed = pd.util.hash_pandas_object(out[TRACKED_COLUMNS].astype(str), index=False).to_numpy(np.uint64)
+    out.insert(1, 'content_hash', hashed.view(np.int64))  # SQLite integers are signed
+    # key order turns the staging and version-table index inserts into B-tree appends
+    return out.sort_values(KEY_COLUMN, kind='stable', ignore_index=True)
+
+
+def _batches(frame: pd.DataFrame, size: int) -> Iterable[List[tuple]]:
+    values = frame.astype(object).where(frame.notna(), None)
+    for start in range(0, len(values), size):
+        yield list(values.iloc[start:start + size].itertuples(index=False, name=None))
+
+
+class JobStore:
+    """SQLite store of posting versions; see the module docstring for the layout."""
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -65536;
+        """)
+        cols = ', '.join(f'{c} TEXT' for c in TEXT_COLUMNS) + ', ' + ', '.join(f'{c} REAL' for c in SALARY_COLUMNS)
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS job_versions (
+                job_id TEXT NOT NULL, valid_from TEXT NOT NULL, valid_to TEXT, session TEXT NOT NULL,
+                content_hash INTEGER NOT NULL, {cols},
+                PRIMARY KEY (job_id, valid_from)
+            );
+            CREATE INDEX IF NOT EXISTS job_versions_current ON job_versions (job_id) WHERE valid_to IS NULL;
+            CREATE INDEX IF NOT EXISTS job_versions_interval ON job_versions (valid_from, valid_to);
+            CREATE TABLE IF NOT EXISTS runs (
+                session TEXT PRIMARY KEY, collected_at TEXT NOT NULL, rows INTEGER NOT NULL,
+                added INTEGER NOT NULL, changed INTEGER NOT NULL, closed INTEGER NOT NULL, unchanged INTEGER NOT NULL,
+                full_snapshot INTEGER NOT NULL
+            );
+        """)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'format_version'").fetchone()
+        if row is None:
+            with self._conn:
+                self._conn.execute("INSERT INTO meta VALUES ('format_version', ?)", (str(FORMAT_VERSION),))
+        elif int(row[0]) != FORMAT_VERSION:
+            raise ValueError(f"{path}: job store format {row[0]}, expected {FORMAT_VERSION}")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+    def ingest(self, df: pd.DataFrame, session: Optional[str] = None, collected_at=None,
+               full_snapshot: bool = True, batch_rows: int = BATCH_ROWS) -> dict:
+        """
+        Upsert one collection run. full_snapshot=True means the run saw the whole market, so
+        current postings it did not see are closed; partial runs only add and change.
+        Runs must arrive in time order (history is only ever appended).
+        """
+        if session is None:
+            sessions = df[SESSION_COLUMN].dropna().unique() if SESSION_COLUMN in df.columns else []
+            if len(sessions) != 1:
+                raise ValueError(f"Pass a session: the frame holds {len(sessions)} collection sessions")
+            session = str(sessions[0])
+        at = _instant(collected_at) if collected_at is not None else session_instant(session)
+        if self._conn.execute("SELECT 1 FROM runs WHERE session = ?", (session,)).fetchone():
+            raise ValueError(f"Session {session} is already in {self.path}")
+        last = self._conn.execute("SELECT max(collected_at) FROM runs").fetchone()[0]
+        if last is not None and at <= last:
+            raise ValueError(f"Session {session} ({at}) is not after the latest stored run ({last})")
+
+        run = prepare_run(df)
+        names = [KEY_COLUMN, 'content_hash'] + _VALUE_COLUMNS
+        placeholders = ', '.join('?' * len(names))
+        value_list = ', '.join(_VALUE_COLUMNS)
+        with self._conn:
+            self._conn.execute("DROP TABLE IF EXISTS temp.staging")
+            self._conn.execute(f"CREATE TEMP TABLE staging ({KEY_COLUMN} TEXT PRIMARY KEY, content_hash INTEGER, "
+                               f"{', '.join(_VALUE_COLUMNS)})")
+            for batch in _batches(run[names], batch_rows):
+                self._conn.executemany(f"INSERT INTO staging VALUES ({placeholders})", batch)
+            closed = 0
+            if full_snapshot:
+                closed = self._conn.execute("""
+                    UPDATE job_versions SET valid_to = ?
+                    WHERE valid_to IS NULL AND NOT EXISTS (SELECT 1 FROM staging s WHERE s.job_id = job_versions.job_id)
+                """, (at,)).rowcount
+            changed = self._conn.execute("""
+                UPDATE job_versions SET valid_to = ?
+                WHERE valid_to IS NULL AND EXISTS (
+                    SELECT 1 FROM staging s WHERE s.job_id = job_versions.job_id AND s.content_hash != job_versions.content_hash)
+            """, (at,)).rowcount
+            inserted = self._conn.execute(f"""
+                INSERT INTO job_versions (job_id, valid_from, valid_to, session, content_hash, {value_list})
+                SELECT s.job_id, ?, NULL, ?, s.content_hash, {', '.join('s.' + c for c in _VALUE_COLUMNS)}
+                FROM staging s
+                WHERE NOT EXISTS (SELECT 1 FROM job_versions v WHERE v.job_id = s.job_id AND v.valid_to IS NULL)
+            """, (at, session)).rowcount
+            stats = {'session': session, 'collected_at': at, 'rows': len(run), 'added': inserted - changed,
+                     'changed': changed, 'closed': closed, 'unchanged': len(run) - inserted,
+                     'full_snapshot': int(full_snapshot)}
+            self._conn.execute(f"INSERT INTO runs VALUES ({', '.join('?' * len(stats))})", tuple(stats.values()))
+            self._conn.execute("DROP TABLE temp.staging")
+        return stats
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def runs(self) -> pd.DataFrame:
+        return pd.read_sql_query("SELECT * FROM runs ORDER BY collected_at", self._conn)
+
+    def as_of(self, when, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Postings live at `when` (a timestamp, or a date meaning the end of that day)."""
+        cols = ', '.join([KEY_COLUMN, 'valid_from', 'valid_to'] + list(columns or _VALUE_COLUMNS))
+        at = _instant(when)
+        return pd.read_sql_query(
+            f"SELECT {cols} FROM job_versions WHERE valid_from <= ? AND (valid_to IS NULL OR valid_to > ?) "
+            f"ORDER BY {KEY_COLUMN}", self._conn, params=(at, at))
+
+    def history(self, job_id: str) -> pd.DataFrame:
+        return pd.read_sql_query("SELECT * FROM job_versions WHERE job_id = ? ORDER BY valid_from",
+                                 self._conn, params=(str(job_id),))
+
+    def time_series(self, by: str = 'category_searched', start=None, end=None) -> pd.DataFrame:
+        """
+        Per stored run and `by` value: live postings, postings with a plausible parsed salary
+        (the cleaned contract's salary range) and their mean/min/max average salary (INR), as
+        the market stood at that run.
+        """
+        if by not in SERIES_GROUPS:
+            raise ValueError(f"time_series groups by one of {SERIES_GROUPS}, not {by!r}")
+        salary = "CASE WHEN v.avg_salary_inr BETWEEN ? AND ? THEN v.avg_salary_inr END"
+        where, params = [], [MIN_SALARY_INR, MAX_SALARY_INR] * 4
+        if start is not None:
+            where.append("r.collected_at >= ?")
+            params.append(_instant(start, end_of_day=False))
+        if end is not None:
+            where.append("r.collected_at <= ?")
+            params.append(_instant(end))
+        sql = f"""
+            SELECT r.collected_at, v.{by} AS {by}, count(*) AS postings, count({salary}) AS with_salary,
+                   avg({salary}) AS mean_salary_inr, min({salary}) AS min_salary_inr,
+                   max({salary}) AS max_salary_inr
+            FROM runs r JOIN job_versions v
+              ON v.valid_from <= r.collected_at AND (v.valid_to IS NULL OR v.valid_to > r.collected_at)
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            GROUP BY r.collected_at, v.{by}
+            ORDER BY r.collected_at, postings DESC, {by}
+        """
+        return pd.read_sql_query(sql, self._conn, params=params)
+
+    def counts(self) -> dict:
+        row = self._conn.execute(
+            "SELECT count(*), count(DISTINCT job_id), sum(valid_to IS NULL) FROM job_versions").fetchone()
+        return {'versions': row[0], 'postings': row[1], 'current': row[2] or 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Historical job store with validity intervals')
+    parser.add_argument('--store', default=DEFAULT_STORE)
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('ingest', help='Upsert one collection run from a raw CSV')
+    p.add_argument('--input', required=True)
+    p.add_argument('--session', default=None, help='collection_session to ingest (default: the only one in the file)')
+    p.add_argument('--partial', action='store_true', help='The run did not cover the whole grid; keep unseen postings open')
+    p = sub.add_parser('as-of', help='Postings live at a date or timestamp')
+    p.add_argument('--date', required=True)
+    p.add_argument('--output', default=None, help='CSV path (default: print a summary)')
+    p = sub.add_parser('series', help='Counts and salaries per run and group')
+    p.add_argument('--by', default='category_searched', choices=SERIES_GROUPS)
+    p = sub.add_parser('history', help='Every version of one posting')
+    p.add_argument('--job-id', required=True)
+    sub.add_parser('runs', help='Stored runs and what each changed')
+    args = parser.parse_args()
+
+    with JobStore(args.store) as store:
+        if args.command == 'ingest':
+            df = pd.read_csv(args.input, dtype={KEY_COLUMN: str, SESSION_COLUMN: str})
+            if args.session is not None:
+                df = df[df[SESSION_COLUMN] == args.session]
+            stats = store.ingest(df, args.session, full_snapshot=not args.partial)
+            print(f"Ingested {stats['session']}: {stats['rows']} postings, {stats['added']} added, "
+                  f"{stats['changed']} changed, {stats['closed']} closed, {stats['unchanged']} unchanged")
+            print(f"{args.store}: {store.counts()}")
+        elif args.command == 'as-of':
+            live = store.as_of(args.date)
+            if args.output:
+                live.to_csv(args.output, index=False)
+                print(f"{len(live)} postings live at {args.date} written to {args.output}")
+            else:
+                print(f"{len(live)} postings live at {args.date}")
+                print(live['category_searched'].value_counts().head(15).to_string())
+        elif args.command == 'series':
+            print(store.time_series(args.by).to_string(index=False))
+        elif args.command == 'history':
+            print(store.history(args.job_id).to_string(index=False))
+        else:
+            print(store.runs().to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Pre-binning helpers for large-n EDA plots
+- Log-space histograms with a smoothed density curve (KDE stand-in)
+- 2D counts on a regular x / log-y grid (hexbin-style density)
+- Box statistics computed once with NumPy, ready for matplotlib's Axes.bxp
+- Deterministic row sampling for scatter overlays
+Plots drawn from these summaries cost the same no matter how many rows fed them.
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+MAX_FLIERS = 50  # per box; fliers beyond this are subsampled
+
+
+def log_histogram(values: np.ndarray, bins: int = 40, smooth: float = 1.5) -> Dict[str, np.ndarray]:
+    """
+    Histogram of positive values on log-spaced edges.
+    Also returns a Gaussian-smoothed copy of the counts (sigma in bins), used as the density line.
+    """
+    v = np.asarray(values, dtype=np.float64)
+    v = v[np.isfinite(v) & (v > 0)]
+    if v.size == 0:
+        return {'edges': np.empty(0), 'counts': np.empty(0), 'smooth': np.empty(0)}
+    lo, hi = np.log10(v.min()), np.log10(v.max())
+    if hi <= lo:
+        hi = lo + 1e-6
+    edges = np.logspace(lo, hi, bins + 1)
+    counts, _ = np.histogram(v, bins=edges)
+    return {'edges': edges, 'counts': counts, 'smooth': gaussian_smooth(counts.astype(np.float64), smooth)}
+
+
+def gaussian_smooth(counts: np.ndarray, sigma: float) -> np.ndarray:
+    if sigma <= 0 or counts.size < 3:
+        return counts
+    radius = max(1, int(round(3 * sigma)))
+    x = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (x / sigma) ** 2)
+    kernel /= kernel.sum()
+    padded = np.pad(counts, radius, mode='constant')
+    return np.convolve(padded, kernel, mode='valid')
+
+
+def grid_counts(x: np.ndarray, y: np.ndarray, x_bins: int = 30, y_bins: int = 30, log_y: bool = True) -> Dict[str, np.ndarray]:
+    """2D histogram over (x, y); y edges are log-spaced when log_y is set."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    ok = np.isfinite(x) & np.isfinite(y) & ((y > 0) if log_y else True)
+    x, y = x[ok], y[ok]
+    if x.size == 0:
+        return {'x_edges': np.empty(0), 'y_edges': np.empty(0), 'counts': np.empty((0, 0))}
+    x_edges = np.linspace(x.min(), x.max() if x.max() > x.min() else x.min() + 1, x_bins + 1)
+    if log_y:
+        lo, hi = np.log10(y.min()), np.log10(y.max())
+        y_edges = np.logspace(lo, hi if hi > lo else lo + 1e-6, y_bins + 1)
+    else:
+        y_edges = np.linspace(y.min(), y.max() if y.max() > y.min() else y.min() + 1, y_bins + 1)
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    return {'x_edges': x_edges, 'y_edges': y_edges, 'counts': counts}
+
+
+def box_stats(values: pd.Series, groups: pd.Series, order: Optional[Sequence[str]] = None,
+              max_fliers: int = MAX_FLIERS, seed: int = 0) -> List[dict]:
+    """Per-group quartiles and 1.5 IQR whiskers (matplotlib semantics) for Axes.bxp."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'v': pd.to_numeric(values, errors='coerce'), 'g': groups}).dropna()
+    labels = list(order) if order is not None else list(pd.unique(df['g']))
+    stats = []
+    by_group = {g: part['v'].to_numpy() for g, part in df.groupby('g', sort=False)}
+    for label in labels:
+        v = by_group.get(label)
+        if v is None or v.size == 0:
+            continue
+        q1, med, q3 = np.percentile(v, [25, 50, 75])
+        iqr = q3 - q1
+        inside = v[(v >= q1 - 1.5 * iqr) & (v <= q3 + 1.5 * iqr)]
+        fliers = v[(v < q1 - 1.5 * iqr) | (v > q3 + 1.5 * iqr)]
+        if fliers.size > max_fliers:
+            fliers = rng.choice(fliers, size=max_fliers, replace=False)
+        stats.append({
+            'label': label, 'q1': q1, 'med': med, 'q3': q3,
+            'whislo': inside.min() if inside.size else q1,
+            'whishi': inside.max() if inside.size else q3,
+            'fliers': fliers,
+        })
+    return stats
+
+
+def sample_rows(df: pd.DataFrame, n: int, seed: int = 0) -> pd.DataFrame:
+    """At most n rows, drawn deterministically."""
+    if n <= 0:
+        return df.iloc[0:0]
+    return df if len(df) <= n else df.sample(n=n, random_state=seed)
+
+
+def cooccurrence(skills: pd.Series, vocab: Sequence[str], sep: str = ',') -> pd.DataFrame:
+    """
+    Symmetric co-occurrence counts of vocab tokens per row (diagonal zeroed).
+    Pairs are counted with one bincount over pair ids (left code * V + right code) of the
+    distinct vocab tokens in each row, so no rows x vocab indicator frame is built.
+    """
+    vocab = list(vocab)
+    v = len(vocab)
+    tokens = skills.dropna().reset_index(drop=True).str.split(sep).explode().str.strip()
+    codes = pd.Categorical(tokens, categories=vocab).codes
+    keep = codes >= 0
+    # distinct (row, token) keys, sorted by row
+    keys = np.unique(tokens.index.to_numpy()[keep].astype(np.int64) * v + codes[keep])
+    rows, codes = keys // v, keys % v
+    per_row = np.bincount(rows)
+    size = per_row[rows]  # tokens in each token's row
+    row_start = (np.cumsum(per_row) - per_row)[rows]
+    left = np.repeat(codes, size)
+    within = np.arange(int(size.sum())) - np.repeat(np.cumsum(size) - size, size)
+    right = codes[np.repeat(row_start, size) + within]
+    mat = np.bincount(left * v + right, minlength=v * v).reshape(v, v).astype(np.int64)
+    np.fill_diagonal(mat, 0)
+    return pd.DataFrame(mat, index=vocab, columns=vocab)
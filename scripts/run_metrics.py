@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Lightweight run instrumentation for Cross Platform Job Analytics
+- Stage timers (context manager / decorator) with wall time and peak RSS per stage
+- Log-bucket latency histograms (e.g. per-request scraper latency)
+- Counters, one structured JSON metrics file per run, optional cProfile dump
+- Markdown "Performance" section for the pipeline report
+Standard library only, so the scraper and every script can use it.
+
+    python scripts/run_metrics.py   # self-check: serialize a run with and without getrusage
+"""
+from __future__ import annotations
+import cProfile
+import functools
+import json
+import math
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_METRICS_DIR = os.path.join('reports', 'metrics')
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (Linux /proc; None elsewhere)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1e6
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def max_rss_mb() -> Optional[float]:
+    """Lifetime peak RSS of this process in MB (None where getrusage is unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+class RssSampler:
+    """Background thread tracking the peak RSS seen since the last reset."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_mb = current_rss_mb() or 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = current_rss_mb()
+            if rss is not None and rss > self.peak_mb:
+                self.peak_mb = rss
+
+    def start(self) -> 'RssSampler':
+        if current_rss_mb() is not None:
+            self._thread.start()
+        return self
+
+    def reset(self) -> float:
+        """Return the peak since the previous reset and start a new window."""
+        rss = current_rss_mb() or 0.0
+        peak, self.peak_mb = max(self.peak_mb, rss), rss
+        return peak
+
+    def stop(self):
+        self._stop.set()
+
+
+class LatencyHistogram:
+    """Log-bucket histogram of durations (seconds); ~10% relative bucket width (about ±5% around the midpoint)."""
+
+    GAMMA = 1.1
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        ms = max(seconds * 1000.0, 1e-3)
+        b = int(math.floor(math.log(ms, self.GAMMA)))
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile in seconds (bucket geometric midpoint)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                ms = self.GAMMA ** (b + 0.5)
+                return min(max(ms / 1000.0, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'mean_s': (self.total / self.count) if self.count else None,
+            'min_s': self.min if self.count else None,
+            'p50_s': self.quantile(0.5),
+            'p90_s': self.quantile(0.9),
+            'p99_s': self.quantile(0.99),
+            'max_s': self.max if self.count else None,
+            'buckets_ms': {f"{self.GAMMA ** b:.3f}": n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class RunMetrics:
+    """Collects stage timings, latency histograms and counters for one run."""
+
+    def __init__(self, run: str, sample_rss: bool = True):
+        self.run = run
+        self.started = datetime.now()
+        self._t0 = time.perf_counter()
+        self.stages: List[dict] = []
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.info: Dict[str, object] = {}
+        self._sampler = RssSampler().start() if sample_rss else None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block; records wall seconds and peak RSS observed inside it."""
+        if self._sampler is not None:
+            self._sampler.reset()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            peak = self._sampler.reset() if self._sampler is not None else None
+            with self._lock:
+                self.stages.append({'name': name, 'seconds': elapsed, 'peak_rss_mb': peak})
+
+    def timed(self, name: Optional[str] = None):
+        """Decorator form of stage()."""
+        def deco(fn):
+            label = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.observe(seconds)
+
+    def incr(self, name: str, n: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def stage_seconds(self) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for s in self.stages:
+            out[s['name']] = out.get(s['name'], 0.0) + s['seconds']
+        return out
+
+    def to_dict(self) -> dict:
+        peak = max_rss_mb()
+        if peak is None and self._sampler is not None and current_rss_mb() is not None:
+            # no getrusage: best effort from the sampler windows
+            peak = max([self._sampler.peak_mb] + [s['peak_rss_mb'] or 0.0 for s in self.stages])
+        return {
+            'run': self.run,
+            'started': self.started.isoformat(timespec='seconds'),
+            'wall_seconds': time.perf_counter() - self._t0,
+            'max_rss_mb': peak,
+            'python': platform.python_version(),
+            'stages': self.stages,
+            'histograms': {k: h.to_dict() for k, h in self.histograms.items()},
+            'counters': self.counters,
+            'info': self.info,
+        }
+
+    def write_json(self, path: Optional[str] = None) -> str:
+        if path is None:
+            path = os.path.join(DEFAULT_METRICS_DIR, f"{self.run}_{self.started.strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if self._sampler is not None:
+            self._sampler.stop()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return path
+
+    def markdown_lines(self, title: str = 'Performance') -> List[str]:
+        d = self.to_dict()
+        lines = ["\n---\n", f"## {title}"]
+        rss = f"{d['max_rss_mb']:.0f} MB" if d['max_rss_mb'] is not None else 'n/a'
+        lines.append(f"Run: {self.run} — wall {d['wall_seconds']:.2f}s, peak RSS {rss}")
+        if self.stages:
+            lines.append("")
+            lines.append("| Stage | Seconds | Peak RSS (MB) |")
+            lines.append("|---|---:|---:|")
+            for s in self.stages:
+                rss = f"{s['peak_rss_mb']:.0f}" if s['peak_rss_mb'] is not None else '-'
+                lines.append(f"| {s['name']} | {s['seconds']:.3f} | {rss} |")
+        for name, h in d['histograms'].items():
+            if h['count']:
+                lines.append(f"- {name}: n={h['count']}, mean {h['mean_s'] * 1000:.0f} ms, "
+                             f"p50 {h['p50_s'] * 1000:.0f} ms, p90 {h['p90_s'] * 1000:.0f} ms, max {h['max_s'] * 1000:.0f} ms")
+        for name, v in self.counters.items():
+            lines.append(f"- {name}: {v:g}")
+        return lines
+
+
+@contextmanager
+def maybe_profile(path: Optional[str]) -> Iterator[None]:
+    """cProfile the block and dump stats to path (no-op when path is falsy)."""
+    if not path:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        prof.dump_stats(path)
+        print(f"Profile written to: {path} (inspect with: python -m pstats {path})")
+
+
+def self_check():
+    """Serialize a run with a stage, a histogram and a counter, with and without getrusage."""
+    global resource
+    saved = resource
+    try:
+        for available in (True, False):
+            resource = saved if available else None
+            m = RunMetrics('self_check')
+            with m.stage('work'):
+                m.observe('latency', 0.1)
+                m.incr('items', 3)
+            d = json.loads(json.dumps(m.to_dict(), default=str))
+            assert d['histograms']['latency']['count'] == 1, d
+            assert d['max_rss_mb'] is not None or not (available and saved), d
+            m.markdown_lines()
+            if m._sampler is not None:
+                m._sampler.stop()
+            print(f"ok (resource {'available' if available else 'unavailable'}): "
+                  f"peak RSS {d['max_rss_mb'] if d['max_rss_mb'] is not None else 'n/a'}")
+    finally:
+        resource = saved
+
+
+if __name__ == '__main__':
+    self_check()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Persistent memo of salary parse results, shared across cleaning runs
+- SQLite table keyed by (parser version, normalized salary text); the version is a
+  hash of salary_parser.py, so any parser change invalidates old results
+- parse_series(): batch mode for a column — parses each distinct normalized text at
+  most once per run, and only when it is not already in the table
+- Keeps hit/miss counts and an estimate of the parse time saved (hits × mean parse
+  time per text measured for this parser version)
+- Stores the parser branch with each result, so salary_parser's branch counts cover
+  every row (hits included), as they would without the cache
+
+    python scripts/salary_cache.py --stats
+    python scripts/salary_cache.py --clear
+"""
+from __future__ import annotations
+import argparse
+import os
+import sqlite3
+import time
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from salary_parser import PARSER_VERSION, count_salary_branch, normalize_salary_text, parse_normalized_salary_branch
+
+DEFAULT_SALARY_CACHE = os.path.join('data', 'cache', 'salary_parse.sqlite')
+
+ParseResult = Tuple[Optional[int], Optional[int], Optional[int]]
+EMPTY_RESULT: ParseResult = (None, None, None)
+
+
+class SalaryParseCache:
+    """Parse results for one parser version, loaded into memory and written back on flush()."""
+
+    def __init__(self, path: str = DEFAULT_SALARY_CACHE, version: str = PARSER_VERSION):
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.parse_seconds = 0.0
+        self.load_seconds = 0.0
+        self._pending: Dict[str, Tuple[ParseResult, str]] = {}
+        t0 = time.perf_counter()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(salary_parse)")]
+        if columns and 'branch' not in columns:
+            with self._conn:
+                self._conn.execute("DROP TABLE salary_parse")  # written before branches were stored
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS salary_parse (
+                version TEXT NOT NULL, text TEXT NOT NULL,
+                min_inr INTEGER, max_inr INTEGER, avg_inr INTEGER, branch TEXT NOT NULL,
+                PRIMARY KEY (version, text)
+            );
+            CREATE TABLE IF NOT EXISTS parser_stats (
+                version TEXT PRIMARY KEY, parsed INTEGER NOT NULL, parse_seconds REAL NOT NULL
+            );
+        """)
+        with self._conn:
+            self.invalidated = self._conn.execute("DELETE FROM salary_parse WHERE version != ?", (version,)).rowcount
+            self._conn.execute("DELETE FROM parser_stats WHERE version != ?", (version,))
+        rows = self._conn.execute("SELECT text, min_inr, max_inr, avg_inr, branch FROM salary_parse WHERE version = ?",
+                                  (version,))
+        self._results: Dict[str, Tuple[ParseResult, str]] = {text: ((lo, hi, avg), branch)
+                                                             for text, lo, hi, avg, branch in rows}
+        row = self._conn.execute("SELECT parsed, parse_seconds FROM parser_stats WHERE version = ?", (version,)).fetchone()
+        self._stats_parsed, self._stats_seconds = row if row else (0, 0.0)
+        self.load_seconds = time.perf_counter() - t0
+
+    def __len__(self):
+        return len(self._results)
+
+    def mean_parse_seconds(self) -> Optional[float]:
+        """Mean seconds per parsed text for this parser version (this run plus earlier ones)."""
+        parsed = self._stats_parsed + self.misses
+        return (self._stats_seconds + self.parse_seconds) / parsed if parsed else None
+
+    def seconds_saved(self) -> float:
+        mean = self.mean_parse_seconds()
+        return self.hits * mean if mean is not None else 0.0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _lookup(self, text: Optional[str]) -> Tuple[ParseResult, str]:
+        tl = normalize_salary_text(text)
+        if tl is None:
+            return EMPTY_RESULT, 'empty'
+        cached = self._results.get(tl)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        t0 = time.perf_counter()
+        cached = parse_normalized_salary_branch(tl)
+        self.parse_seconds += time.perf_counter() - t0
+        self._results[tl] = self._pending[tl] = cached
+        return cached
+
+    def get(self, text: Optional[str]) -> ParseResult:
+        """Cached parse_salary_text(text), branch counts included."""
+        result, branch = self._lookup(text)
+        count_salary_branch(branch)
+        return result
+
+    def parse_series(self, texts: pd.Series) -> pd.Series:
+        """
+        Batch mode: parse results (tuples) aligned with `texts`. Each distinct raw text is
+        looked up once, so hit/miss counts are per distinct text; branch counts are per row.
+        """
+        counts = texts.map(lambda t: t if isinstance(t, str) else None).value_counts(dropna=False)
+        results = {}
+        for text, n in counts.items():
+            text = text if isinstance(text, str) else None
+            results[text], branch = self._lookup(text)
+            count_salary_branch(branch, int(n))
+        return texts.map(lambda t: results[t] if isinstance(t, str) else results[None])
+
+    def flush(self):
+        """Write results parsed since the last flush, and this run's parse timing."""
+        with self._conn:
+            if self._pending:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO salary_parse (version, text, min_inr, max_inr, avg_inr, branch) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(self.version, text, *result, branch) for text, (result, branch) in self._pending.items()])
+            if self.misses:
+                self._stats_parsed += self.misses
+                self._stats_seconds += self.parse_seconds
+                self._conn.execute("INSERT OR REPLACE INTO parser_stats (version, parsed, parse_seconds) VALUES (?, ?, ?)",
+                                   (self.version, self._stats_parsed, self._stats_seconds))
+                self.misses, self.parse_seconds = 0, 0.0
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def summary_line(self) -> str:
+        return (f"Salary parse cache: {self.hits + self.misses:,} distinct texts, {self.hits:,} hits "
+                f"({self.hit_rate() * 100:.1f}%), {self.misses:,} parsed, est. {self.seconds_saved():.3f}s parse time saved "
+                f"(cache load {self.load_seconds:.3f}s, parser version {self.version})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or clear the persistent salary parse cache')
+    parser.add_argument('--cache', default=DEFAULT_SALARY_CACHE)
+    parser.add_argument('--clear', action='store_true', help='Delete every cached result')
+    parser.add_argument('--stats', action='store_true', help='Print entry counts (default action)')
+    args = parser.parse_args()
+
+    if args.clear:
+        if os.path.exists(args.cache):
+            os.remove(args.cache)
+        print(f"Cleared {args.cache}")
+        return
+    with SalaryParseCache(args.cache) as cache:
+        mean = cache.mean_parse_seconds()
+        print(f"{args.cache}: {len(cache):,} texts for parser version {cache.version}"
+              f"{f', {cache.invalidated:,} stale entries dropped' if cache.invalidated else ''}"
+              f"{f', mean parse {mean * 1e6:.1f} us/text' if mean is not None else ''}")
+
+
+if __name__ == '__main__':
+    main()
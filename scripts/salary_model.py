@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Out-of-core salary estimation on the feature store
+- Linear model on log1p(salary) over non-salary features only: experience
+  (years + level code), categorical indicators (source, job type, location tier) and the
+  sparse skill matrix (every skill token, not just the top-N one-hots)
+- Trained with mini-batch AdaGrad over row batches streamed from the memory-mapped
+  store, so memory is bounded by the batch size rather than the dataset
+- Every 10th row is held out for evaluation (against a predict-the-mean baseline)
+- Predicts annual salary for rows whose salary could not be parsed (avg_salary_inr missing)
+
+    python scripts/salary_model.py train --epochs 3
+    python scripts/salary_model.py predict --output data/processed/salary_predictions.csv
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from feature_store import DEFAULT_STORE, FeatureStore
+from schema_validation import MAX_SALARY_INR, MIN_SALARY_INR
+
+DEFAULT_MODEL = os.path.join('data', 'processed', 'salary_model.npz')
+DEFAULT_PREDICTIONS = os.path.join('data', 'processed', 'salary_predictions.csv')
+
+# Capped (1st/99th percentile) salary when available, so parse outliers do not dominate the loss
+TARGET_COLUMNS = ['avg_salary_inr_capped', 'avg_salary_inr']
+# Anything derived from the salary itself would leak the target
+SALARY_COLUMNS = {'min_salary_inr', 'max_salary_inr', 'avg_salary_inr', 'avg_salary_inr_capped', 'avg_salary_lpa',
+                  'avg_salary_lpa_capped', 'log_avg_salary', 'log_avg_salary_capped'}
+EXCLUDED_PREFIXES = ('salary_band_', 'skill_')  # skill one-hots are covered by the sparse skill matrix
+HOLDOUT_EVERY = 10
+
+
+def model_columns(columns: List[str]) -> List[str]:
+    return [c for c in columns if c not in SALARY_COLUMNS and not c.startswith(EXCLUDED_PREFIXES)]
+
+
+def labelled_rows(y: np.ndarray) -> np.ndarray:
+    """Rows whose target lies within the schema salary range (1st-percentile capping alone keeps mis-parsed values)."""
+    return (y >= MIN_SALARY_INR) & (y <= MAX_SALARY_INR)
+
+
+def target_column(columns: List[str]) -> str:
+    for c in TARGET_COLUMNS:
+        if c in columns:
+            return c
+    raise KeyError(f"Feature store has none of the target columns {TARGET_COLUMNS}")
+
+
+Batch = Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _csr_rows(indptr: np.ndarray, indices: np.ndarray, row_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR arrays restricted to the rows in row_mask."""
+    lens = np.diff(indptr)
+    keep = np.repeat(row_mask, lens)
+    return np.concatenate([[0], np.cumsum(lens[row_mask])]), indices[keep]
+
+
+def _csr_entries(indptr: np.ndarray, indices: np.ndarray, entry_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR arrays keeping only the entries in entry_mask (all rows kept)."""
+    lens = np.diff(indptr)
+    row_of = np.repeat(np.arange(len(lens)), lens)
+    lens = np.bincount(row_of[entry_mask], minlength=len(lens))
+    return np.concatenate([[0], np.cumsum(lens)]), indices[entry_mask]
+
+
+def iter_batches(store: FeatureStore, columns: List[str], batch_rows: int = 65_536,
+                 vocab: Optional[List[str]] = None) -> Iterator[Batch]:
+    """
+    Yield (start row, dense X, skill indptr, skill indices, target) per row batch of the store.
+    With `vocab`, skill ids are translated to positions in that vocabulary (unknown skills dropped).
+    """
+    pos = [store.columns.index(c) for c in columns]
+    target = store.column(target_column(store.columns))
+    indptr, indices, store_vocab = store.skills()
+    remap = None
+    if vocab is not None and vocab != store_vocab:
+        known = {sk: i for i, sk in enumerate(vocab)}
+        remap = np.array([known.get(sk, -1) for sk in store_vocab], dtype=np.int64)
+    for start in range(0, store.rows, batch_rows):
+        end = min(start + batch_rows, store.rows)
+        x = np.asarray(store.dense[start:end][:, pos], dtype=np.float32)
+        ptr = np.asarray(indptr[start:end + 1])
+        ptr, idx = ptr - ptr[0], np.asarray(indices[ptr[0]:ptr[-1]])
+        if remap is not None:
+            idx = remap[idx]
+            ptr, idx = _csr_entries(ptr, idx, idx >= 0)
+        yield start, x, ptr, idx, np.asarray(target[start:end])
+
+
+class SalaryModel:
+    """Linear model over standardized dense features plus binary skill features."""
+
+    def __init__(self, columns: List[str], vocab: List[str], learning_rate: float = 0.1, l2: float = 1e-5):
+        self.columns = list(columns)
+        self.vocab = list(vocab)
+        self.vocab_size = len(self.vocab)
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        d = len(self.columns)
+        self.mean = np.zeros(d)
+        self.scale = np.ones(d)
+        self.w_dense = np.zeros(d)
+        self.w_skill = np.zeros(self.vocab_size)
+        self.bias = 0.0
+        self._g_dense = np.zeros(d)
+        self._g_skill = np.zeros(self.vocab_size)
+        self._g_bias = 0.0
+        self.target_mean = 0.0
+        self.rows_seen = 0
+
+    def fit_scaling(self, batches: Iterator[Batch]):
+        """One streaming pass: per-column mean/std of the dense features (NaN ignored) and the target mean."""
+        d = len(self.columns)
+        n, s, ss = np.zeros(d), np.zeros(d), np.zeros(d)
+        t_n, t_s = 0, 0.0
+        for _, x, _, _, y in batches:
+            ok = ~np.isnan(x)
+            xv = np.where(ok, x, 0.0).astype(np.float64)
+            n += ok.sum(axis=0)
+            s += xv.sum(axis=0)
+            ss += (xv * xv).sum(axis=0)
+            labelled = y[labelled_rows(y)]
+            t_n += len(labelled)
+            t_s += np.log1p(labelled).sum()
+        self.mean = np.divide(s, n, out=np.zeros(d), where=n > 0)
+        var = np.divide(ss, n, out=np.zeros(d), where=n > 0) - self.mean ** 2
+        self.scale = np.where(var > 1e-12, np.sqrt(np.maximum(var, 0)), 1.0)
+        self.bias = self.target_mean = t_s / t_n if t_n else 0.0
+
+    def _transform(self, x: np.ndarray) -> np.ndarray:
+        z = (x - self.mean) / self.scale
+        return np.nan_to_num(z, nan=0.0)  # missing -> column mean
+
+    def _raw_predict(self, z, indptr, indices):
+        rows = len(z)
+        out = z @ self.w_dense + self.bias
+        if len(indices):
+            row_of = np.repeat(np.arange(rows), np.diff(indptr))
+            out += np.bincount(row_of, weights=self.w_skill[indices], minlength=rows)
+        return out
+
+    def partial_fit(self, x, indptr, indices, y) -> float:
+        """One AdaGrad step on the labelled rows of a batch; returns the batch MSE (log space)."""
+        labelled = labelled_rows(y)
+        if not labelled.any():
+            return float('nan')
+        if not labelled.all():
+            indptr, indices = _csr_rows(indptr, indices, labelled)
+            x, y = x[labelled], y[labelled]
+        z = self._transform(x)
+        err = self._raw_predict(z, indptr, indices) - np.log1p(y)
+        m = len(err)
+        g_dense = z.T @ err / m + self.l2 * self.w_dense
+        g_bias = err.mean()
+        g_skill = np.bincount(indices, weights=np.repeat(err, np.diff(indptr)), minlength=self.vocab_size) / m
+        touched = g_skill != 0
+        g_skill[touched] += self.l2 * self.w_skill[touched]
+
+        self._g_dense += g_dense ** 2
+        self._g_bias += g_bias ** 2
+        self._g_skill += g_skill ** 2
+        lr = self.learning_rate
+        self.w_dense -= lr * g_dense / (np.sqrt(self._g_dense) + 1e-8)
+        self.bias -= lr * g_bias / (np.sqrt(self._g_bias) + 1e-8)
+        self.w_skill[touched] -= lr * g_skill[touched] / (np.sqrt(self._g_skill[touched]) + 1e-8)
+        self.rows_seen += m
+        return float((err ** 2).mean())
+
+    def predict(self, x, indptr, indices) -> np.ndarray:
+        """Predicted annual salary (INR)."""
+        return np.expm1(self._raw_predict(self._transform(x), indptr, indices))
+
+    def save(self, path: str, **meta):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        info = {'columns': self.columns, 'vocab': self.vocab, 'learning_rate': self.learning_rate,
+                'l2': self.l2, 'rows_seen': self.rows_seen, **meta}
+        np.savez(path, mean=self.mean, scale=self.scale, w_dense=self.w_dense, w_skill=self.w_skill,
+                 bias=np.array([self.bias]), info=np.array(json.dumps(info)))
+
+    @classmethod
+    def load(cls, path: str) -> 'SalaryModel':
+        with np.load(path) as data:
+            info = json.loads(str(data['info']))
+            model = cls(info['columns'], info['vocab'], info['learning_rate'], info['l2'])
+            model.mean, model.scale = data['mean'], data['scale']
+            model.w_dense, model.w_skill = data['w_dense'], data['w_skill']
+            model.bias = float(data['bias'][0])
+        model.rows_seen = info.get('rows_seen', 0)
+        model.info = info
+        return model
+
+
+def evaluate(model: SalaryModel, batches: Iterator[Batch]) -> dict:
+    """
+    Error on labelled rows: RMSE of log salary and mean absolute error in LPA, plus the
+    RMSE of always predicting the mean log salary.
+    """
+    n, se, ae, base = 0, 0.0, 0.0, 0.0
+    for _, x, indptr, indices, y in batches:
+        pred = model.predict(x, indptr, indices)
+        ok = labelled_rows(y)
+        log_y = np.log1p(y[ok])
+        n += int(ok.sum())
+        se += float(((np.log1p(pred[ok]) - log_y) ** 2).sum())
+        ae += float(np.abs(pred[ok] - y[ok]).sum())
+        base += float(((log_y - model.target_mean) ** 2).sum())
+    if not n:
+        return {'rows': 0, 'rmse_log': None, 'mae_lpa': None, 'baseline_rmse_log': None}
+    return {'rows': n, 'rmse_log': (se / n) ** 0.5, 'mae_lpa': ae / n / 1e5, 'baseline_rmse_log': (base / n) ** 0.5}
+
+
+def train(store: FeatureStore, epochs: int = 3, batch_rows: int = 65_536, learning_rate: float = 0.1,
+          l2: float = 1e-5, holdout_every: Optional[int] = HOLDOUT_EVERY) -> Tuple[SalaryModel, dict]:
+    """Stream the store `epochs` times (plus one scaling pass); returns (model, stats)."""
+    columns = model_columns(store.columns)
+    model = SalaryModel(columns, store.skills()[2], learning_rate, l2)
+
+    def split(holdout):
+        """Batches with the targets of the other side of the split blanked out (NaN rows are skipped)."""
+        for start, x, indptr, indices, y in iter_batches(store, columns, batch_rows):
+            if holdout_every:
+                held = (np.arange(start, start + len(y)) % holdout_every) == holdout_every - 1
+                y = np.where(held if not holdout else ~held, np.nan, y)
+            yield start, x, indptr, indices, y
+
+    t0 = time.perf_counter()
+    model.fit_scaling(split(False))
+    for _ in range(epochs):
+        for _, x, indptr, indices, y in split(False):
+            model.partial_fit(x, indptr, indices, y)
+    seconds = time.perf_counter() - t0
+    stats = {'epochs': epochs, 'train_seconds': seconds, 'train_rows': model.rows_seen,
+             'train_rows_per_s': store.rows * (epochs + 1) / seconds if seconds else None}
+    if holdout_every:
+        stats['holdout'] = evaluate(model, split(True))
+    stats['train'] = evaluate(model, split(False))
+    return model, stats
+
+
+def predict_missing(store: FeatureStore, model: SalaryModel, batch_rows: int = 65_536) -> pd.DataFrame:
+    """job_id + predicted annual salary for every row without a parsed salary."""
+    job_ids = store.ids().column('job_id') if 'job_id' in store.manifest['ids']['columns'] else None
+    rows, preds = [], []
+    for start, x, indptr, indices, y in iter_batches(store, model.columns, batch_rows, vocab=model.vocab):
+        missing = np.flatnonzero(np.isnan(y))
+        if len(missing):
+            rows.append(start + missing)
+            preds.append(model.predict(x, indptr, indices)[missing])
+    rows = np.concatenate(rows) if rows else np.empty(0, np.int64)
+    out = pd.DataFrame({'row': rows})
+    if job_ids is not None:
+        out['job_id'] = job_ids.take(rows).to_pandas() if len(rows) else pd.Series(dtype='string')
+    pred = np.concatenate(preds) if preds else np.empty(0)
+    out['predicted_avg_salary_inr'] = np.round(pred).astype(np.int64)
+    out['predicted_avg_salary_lpa'] = np.round(pred / 1e5, 2)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the salary model on the feature store or predict missing salaries')
+    sub = parser.add_subparsers(dest='command', required=True)
+    tr = sub.add_parser('train', help='Train on the latest feature store version')
+    tr.add_argument('--epochs', type=int, default=3)
+    tr.add_argument('--batch-rows', type=int, default=65_536)
+    tr.add_argument('--learning-rate', type=float, default=0.1)
+    tr.add_argument('--l2', type=float, default=1e-5)
+    pr = sub.add_parser('predict', help='Predict salaries for rows without a parsed salary')
+    pr.add_argument('--output', default=DEFAULT_PREDICTIONS)
+    pr.add_argument('--batch-rows', type=int, default=65_536)
+    for p in (tr, pr):
+        p.add_argument('--store', default=DEFAULT_STORE)
+        p.add_argument('--version', type=int, default=None)
+        p.add_argument('--model', default=DEFAULT_MODEL)
+    args = parser.parse_args()
+
+    store = FeatureStore(args.store, args.version)
+    if args.command == 'train':
+        model, stats = train(store, args.epochs, args.batch_rows, args.learning_rate, args.l2)
+        model.save(args.model, store_version=store.version, stats=stats)
+        hold = stats.get('holdout') or {}
+        print(f"Trained on {store.rows:,} rows x {args.epochs} epoch(s) in {stats['train_seconds']:.1f}s "
+              f"({stats['train_rows_per_s']:,.0f} rows/s); holdout RMSE(log) {hold.get('rmse_log') or float('nan'):.3f} "
+              f"(mean baseline {hold.get('baseline_rmse_log') or float('nan'):.3f}), "
+              f"MAE {hold.get('mae_lpa') or float('nan'):.2f} LPA -> {args.model}")
+        return
+
+    model = SalaryModel.load(args.model)
+    missing = [c for c in model.columns if c not in store.columns]
+    if missing:
+        raise SystemExit(f"Feature store version {store.version} lacks model columns: {', '.join(missing)}; retrain")
+    t0 = time.perf_counter()
+    out = predict_missing(store, model, args.batch_rows)
+    elapsed = time.perf_counter() - t0
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    out.to_csv(args.output, index=False)
+    print(f"Predicted {len(out):,} missing salaries in {elapsed:.2f}s -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
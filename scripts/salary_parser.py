@@ -4,10 +4,16 @@ Salary parsing utilities for Cross Platform Job Analytics
 - Handles LPA/lakh/lac formats
 - Handles INR with monthly or yearly denominations (e.g., "₹ 50,000 /month", "₹6-8 LPA")
 - Produces min, max, avg annual salary in INR
+- Common formats are matched by one anchored alternation grammar (ordered by observed
+  format frequency); anything it does not fully match falls back to the sequential
+  pattern chain, so results are identical to the chain on every input
+- Counts which branch handled each call (salary_branch_counts) for telemetry
 """
 from __future__ import annotations
+import hashlib
 import re
-from typing import Optional, Tuple
+from collections import Counter
+from typing import Dict, Optional, Tuple
 
 LAKH_VALUE = 100_000  # 1 Lakh INR
 
@@ -31,6 +37,57 @@ _single_crore_pattern = re.compile(r"(?P<val>\d+(?:\.\d+)?)\s*crore(s)?", re.IGN
 _single_inr_pattern = re.compile(r"(?:\u20B9|rs\.?|inr)?\s*(?P<val>[\d,.]+)\s*(?:/|per\s*)?(?P<period>month|yr|year|annum|pa|day|hour)?", re.IGNORECASE)
 
 
+# Tokens blanked before matching (one pass; same result as replacing them one by one)
+_noise_pattern = re.compile(r"ctc|per annum|p\.a\.|p\.a|pa")
+_digit_pattern = re.compile(r"\d")
+
+# Whole-string grammar for the common formats, most frequent first. Each branch mirrors
+# the chain pattern that would have produced the result, so a full match here gives the
+# same groups. Note "N LPA" loses its "pa" in normalization and is left to the chain.
+_fast_pattern = re.compile(
+    r"\s*(?:"
+    r"(?:\u20B9|rs\.?|inr)?\s*(?P<inr_min>\d[\d,]*(?:\.\d+)?(?![\d,.]))\s*(?:-|to|–|—)?\s*(?P<inr_max>\d[\d,]*(?:\.\d+)?(?![\d,.]))?"
+    r"\s*(?:/|per\s*)?(?P<inr_period>month|yr|year|annum|day|hour)?"
+    r"|(?P<lpa_min>\d+(?:\.\d+)?)\s*(?:-|to|–|—)?\s*(?P<lpa_max>\d+(?:\.\d+)?)?\s*(?:lpa|lac|lakh)s?"
+    r"|(?P<k_min>\d+(?:\.\d+)?)\s*(?:-|to|–|—)?\s*(?P<k_max>\d+(?:\.\d+)?)?\s*k\b\s*(?:/|per\s*)?(?P<k_period>month|yr|year|annum)?"
+    r"|(?P<crore_min>\d+(?:\.\d+)?)\s*(?:-|to|–|—)?\s*(?P<crore_max>\d+(?:\.\d+)?)?\s*crore(?:s)?"
+    r")\s*"
+)
+
+# branch name -> (unit multiplier, has period group)
+_FAST_BRANCHES = {
+    'inr': (1, True),
+    'lpa': (LAKH_VALUE, False),
+    'k': (1_000, True),
+    'crore': (10_000_000, False),
+}
+
+_branch_counts: Counter = Counter()
+
+
+def _source_hash() -> str:
+    with open(__file__, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+# Changes whenever this file changes; keys persisted parse results (see salary_cache.py)
+PARSER_VERSION = _source_hash()
+
+
+def salary_branch_counts() -> Dict[str, int]:
+    """Calls per parser branch since the last reset (fast:<format>, chain:<pattern>, no_digits, empty)."""
+    return dict(_branch_counts)
+
+
+def reset_salary_branch_counts():
+    _branch_counts.clear()
+
+
+def count_salary_branch(branch: str, n: int = 1):
+    """Credit n calls to a branch without parsing (results served from a cache)."""
+    _branch_counts[branch] += n
+
+
 def _to_number(val: str) -> Optional[float]:
     if val is None:
         return None
@@ -56,23 +113,8 @@ def _period_to_year_multiplier(period: Optional[str]) -> float:
     return 1.0
 
 
-def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
-    """
-    Parse a salary string and return (min_annual_inr, max_annual_inr, avg_annual_inr)
-    Returns (None, None, None) if parsing fails.
-    """
-    if not text or not isinstance(text, str):
-        return (None, None, None)
-
-    t = text.strip()
-    if not t:
-        return (None, None, None)
-
-    # Normalize trivial tokens
-    tl = t.lower()
-    for bad in ["ctc", "per annum", "p.a.", "p.a", "pa"]:
-        tl = tl.replace(bad, " ")
-
+def _parse_chain(tl: str) -> Tuple[Tuple[Optional[int], Optional[int], Optional[int]], Optional[str]]:
+    """Sequential pattern chain over normalized text; returns (result, matched pattern name)."""
     # Try LPA ranges first
     m = _lpa_pattern.search(tl)
     if m:
@@ -82,7 +124,7 @@ def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
             min_inr = int(round(min_val * LAKH_VALUE))
             max_inr = int(round(max_val * LAKH_VALUE))
             avg_inr = int(round((min_inr + max_inr) / 2))
-            return (min_inr, max_inr, avg_inr)
+            return (min_inr, max_inr, avg_inr), 'lpa'
 
     # Try crore ranges
     m = _crore_pattern.search(tl)
@@ -93,7 +135,7 @@ def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
             min_inr = int(round(min_val * 10_000_000))
             max_inr = int(round(max_val * 10_000_000))
             avg_inr = int(round((min_inr + max_inr) / 2))
-            return (min_inr, max_inr, avg_inr)
+            return (min_inr, max_inr, avg_inr), 'crore'
 
     # Try K ranges (e.g., 20k per month)
     m = _k_pattern.search(tl)
@@ -106,7 +148,7 @@ def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
             min_inr = int(round(min_val * 1_000 * mult))
             max_inr = int(round(max_val * 1_000 * mult))
             avg_inr = int(round((min_inr + max_inr) / 2))
-            return (min_inr, max_inr, avg_inr)
+            return (min_inr, max_inr, avg_inr), 'k'
 
     # Try INR ranges with period
     m = _inr_pattern.search(tl)
@@ -119,7 +161,7 @@ def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
             min_inr = int(round(min_val * mult))
             max_inr = int(round(max_val * mult))
             avg_inr = int(round((min_inr + max_inr) / 2))
-            return (min_inr, max_inr, avg_inr)
+            return (min_inr, max_inr, avg_inr), 'inr'
 
     # Single LPA value
     m = _single_lpa_pattern.search(tl)
@@ -127,7 +169,7 @@ def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
         v = _to_number(m.group("val"))
         if v is not None:
             val_inr = int(round(v * LAKH_VALUE))
-            return (val_inr, val_inr, val_inr)
+            return (val_inr, val_inr, val_inr), 'single_lpa'
 
     # Single crore value
     m = _single_crore_pattern.search(tl)
@@ -135,7 +177,7 @@ def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
         v = _to_number(m.group("val"))
         if v is not None:
             val_inr = int(round(v * 10_000_000))
-            return (val_inr, val_inr, val_inr)
+            return (val_inr, val_inr, val_inr), 'single_crore'
 
     # Single K value
     m = _single_k_pattern.search(tl)
@@ -145,7 +187,7 @@ def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
         mult = _period_to_year_multiplier(period)
         if v is not None:
             val_inr = int(round(v * 1_000 * mult))
-            return (val_inr, val_inr, val_inr)
+            return (val_inr, val_inr, val_inr), 'single_k'
 
     # Single INR value (assume annual if no period)
     m = _single_inr_pattern.search(tl)
@@ -155,9 +197,85 @@ def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
         mult = _period_to_year_multiplier(period)
         if v is not None:
             val_inr = int(round(v * mult))
-            return (val_inr, val_inr, val_inr)
+            return (val_inr, val_inr, val_inr), 'single_inr'
+
+    return (None, None, None), None
+
 
-    return (None, None, None)
+def _parse_fast(tl: str):
+    """Full match of the common-format grammar -> (result, branch), else None."""
+    m = _fast_pattern.fullmatch(tl)
+    if m is None:
+        return None
+    for branch, (unit, has_period) in _FAST_BRANCHES.items():
+        min_text = m.group(branch + '_min')
+        if min_text is not None:
+            break
+    min_val = _to_number(min_text)
+    max_val = _to_number(m.group(branch + '_max')) or min_val
+    mult = _period_to_year_multiplier(m.group(branch + '_period')) if has_period else 1.0
+    min_inr = int(round(min_val * unit * mult))
+    max_inr = int(round(max_val * unit * mult))
+    return (min_inr, max_inr, int(round((min_inr + max_inr) / 2))), branch
+
+
+def normalize_salary_text(text: Optional[str]) -> Optional[str]:
+    """
+    The text the patterns run on (lowercased, trivial tokens blanked), or None for
+    missing/blank input. parse_salary_text's result depends only on this value.
+    """
+    if not text or not isinstance(text, str):
+        return None
+    t = text.strip()
+    if not t:
+        return None
+    return _noise_pattern.sub(" ", t.lower())
+
+
+def parse_salary_text(text: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """
+    Parse a salary string and return (min_annual_inr, max_annual_inr, avg_annual_inr)
+    Returns (None, None, None) if parsing fails.
+    """
+    tl = normalize_salary_text(text)
+    if tl is None:
+        _branch_counts['empty'] += 1
+        return (None, None, None)
+    return parse_normalized_salary(tl)
+
+
+def parse_normalized_salary(tl: str) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """parse_salary_text on text already passed through normalize_salary_text."""
+    result, branch = parse_normalized_salary_branch(tl)
+    _branch_counts[branch] += 1
+    return result
+
+
+def parse_normalized_salary_branch(tl: str) -> Tuple[Tuple[Optional[int], Optional[int], Optional[int]], str]:
+    """(result, branch) for normalized text, without touching the branch counts."""
+    # No digits: no pattern can produce a number ("Competitive salary", "Not disclosed")
+    if _digit_pattern.search(tl) is None:
+        return (None, None, None), 'no_digits'
+
+    fast = _parse_fast(tl)
+    if fast is not None:
+        return fast[0], 'fast:' + fast[1]
+
+    result, branch = _parse_chain(tl)
+    return result, 'chain:' + (branch or 'none')
+
+
+def parse_salary_text_reference(text: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """The original sequential parser (per-token replace + pattern chain), kept for compatibility checks."""
+    if not text or not isinstance(text, str):
+        return (None, None, None)
+    t = text.strip()
+    if not t:
+        return (None, None, None)
+    tl = t.lower()
+    for bad in ["ctc", "per annum", "p.a.", "p.a", "pa"]:
+        tl = tl.replace(bad, " ")
+    return _parse_chain(tl)[0]
 
 
 if __name__ == "__main__":
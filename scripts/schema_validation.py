@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Declarative column contracts for the raw and cleaned job datasets
+- A contract is a list of Rules (not null, regex, range, ordered pair, date format,
+  allowed values, unique), each evaluated on whole columns: regexes run in Arrow
+  compute, dates through one pd.to_datetime call, ranges as array comparisons
+- validate() returns a violation mask per rule plus summary counts; NULLs only
+  violate not_null rules, and rules whose columns are absent are skipped
+- 'error' rules mark rows for quarantine (data_cleaning.py --quarantine writes them to
+  a side CSV with the violated rule names); 'warn' rules are only counted
+
+    python scripts/schema_validation.py --input data/raw/unified_jobs_dataset.csv --contract raw
+"""
+from __future__ import annotations
+import argparse
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_QUARANTINE = os.path.join('data', 'processed', 'quarantined_jobs.csv')
+
+URL_PATTERN = r'https?://[^\s/]+(?:/\S*)?'
+MAX_EXPERIENCE_YEARS = 50
+MIN_SALARY_INR = 1_000  # annual; below this the text was not a salary
+MAX_SALARY_INR = 100_000_000
+
+
+@dataclass
+class Rule:
+    """One column check; `kind` picks the vectorized test and `params` configure it."""
+    name: str
+    kind: str
+    columns: List[str]
+    params: Dict[str, object] = field(default_factory=dict)
+    severity: str = 'error'
+
+    def describe(self) -> str:
+        cols = ', '.join(self.columns)
+        detail = ', '.join(f'{k}={v}' for k, v in self.params.items() if k != 'pattern')
+        if 'pattern' in self.params:
+            detail = f"pattern {self.params['pattern']}" + (f', {detail}' if detail else '')
+        return f"{self.kind}({cols}{'; ' + detail if detail else ''})"
+
+
+def not_null(column: str, severity: str = 'error') -> Rule:
+    return Rule(f'{column}_present', 'not_null', [column], severity=severity)
+
+
+def matches(column: str, pattern: str, severity: str = 'error') -> Rule:
+    return Rule(f'{column}_format', 'matches', [column], {'pattern': pattern}, severity)
+
+
+def in_range(column: str, lo: Optional[float] = None, hi: Optional[float] = None, severity: str = 'error') -> Rule:
+    return Rule(f'{column}_range', 'in_range', [column], {'lo': lo, 'hi': hi}, severity)
+
+
+def ordered(lo_column: str, hi_column: str, dates: bool = False, severity: str = 'error') -> Rule:
+    return Rule(f'{lo_column}_le_{hi_column}', 'ordered', [lo_column, hi_column], {'dates': dates}, severity)
+
+
+def date_format(column: str, fmt: str, severity: str = 'error') -> Rule:
+    return Rule(f'{column}_date', 'date_format', [column], {'format': fmt}, severity)
+
+
+def one_of(column: str, values: Sequence[str], severity: str = 'error') -> Rule:
+    return Rule(f'{column}_allowed', 'one_of', [column], {'values': sorted(values)}, severity)
+
+
+def unique(column: str, severity: str = 'error') -> Rule:
+    return Rule(f'{column}_unique', 'unique', [column], severity=severity)
+
+
+RAW_CONTRACT = [
+    not_null('job_id'),
+    not_null('title'),
+    not_null('collection_session'),
+    matches('job_url', URL_PATTERN),
+    date_format('scrape_timestamp', 'ISO8601'),
+    date_format('collection_date', '%Y-%m-%d'),
+    date_format('collection_session', '%Y%m%d_%H%M%S'),
+    in_range('page_found', lo=1),
+    not_null('company', severity='warn'),
+    not_null('city', severity='warn'),
+]
+
+CLEANED_CONTRACT = RAW_CONTRACT + [
+    unique('job_id'),
+    # warn only: the parser reads "N-M LPA" as rupees, so valid postings fall below the floor
+    in_range('min_salary_inr', MIN_SALARY_INR, MAX_SALARY_INR, severity='warn'),
+    in_range('max_salary_inr', MIN_SALARY_INR, MAX_SALARY_INR, severity='warn'),
+    ordered('min_salary_inr', 'max_salary_inr'),
+    ordered('min_salary_inr', 'avg_salary_inr'),
+    ordered('avg_salary_inr', 'max_salary_inr'),
+    in_range('exp_min_years', 0, MAX_EXPERIENCE_YEARS),
+    in_range('exp_max_years', 0, MAX_EXPERIENCE_YEARS),
+    ordered('exp_min_years', 'exp_max_years'),
+    date_format('posting_date', '%Y-%m-%d'),
+    ordered('posting_date', 'scrape_timestamp', dates=True, severity='warn'),
+    one_of('experience_level', ['Entry', 'Junior', 'Mid', 'Senior'], severity='warn'),
+    one_of('location_tier', ['Tier 1', 'Tier 2/3'], severity='warn'),
+]
+
+CONTRACTS = {'raw': RAW_CONTRACT, 'cleaned': CLEANED_CONTRACT}
+
+
+def _as_datetime(series: pd.Series, fmt: Optional[str] = None) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, errors='coerce', format=fmt or 'mixed')
+
+
+def _violations(df: pd.DataFrame, rule: Rule) -> np.ndarray:
+    """Boolean mask of rows breaking `rule` (NULLs pass everything but not_null)."""
+    col = df[rule.columns[0]]
+    if rule.kind == 'not_null':
+        return col.isna().to_numpy()
+    notna = col.notna().to_numpy()
+    if rule.kind == 'matches':
+        # Arrow's regex kernel runs over the whole column instead of one re.match per row
+        text = col.astype('string[pyarrow]')
+        ok = text.str.fullmatch(rule.params['pattern']).fillna(True)
+        return ~ok.to_numpy(dtype=bool) & notna
+    if rule.kind == 'in_range':
+        values = pd.to_numeric(col, errors='coerce').to_numpy(dtype=np.float64)
+        bad = notna & np.isnan(values)  # non-numeric text
+        with np.errstate(invalid='ignore'):
+            if rule.params['lo'] is not None:
+                bad |= values < rule.params['lo']
+            if rule.params['hi'] is not None:
+                bad |= values > rule.params['hi']
+        return bad
+    if rule.kind == 'ordered':
+        other = df[rule.columns[1]]
+        if rule.params['dates']:
+            lo = _as_datetime(col).dt.normalize().to_numpy()
+            hi = _as_datetime(other).dt.normalize().to_numpy()
+        else:
+            lo = pd.to_numeric(col, errors='coerce').to_numpy(dtype=np.float64)
+            hi = pd.to_numeric(other, errors='coerce').to_numpy(dtype=np.float64)
+        return lo > hi  # NaN/NaT compare False
+    if rule.kind == 'date_format':
+        fmt = rule.params['format']
+        if pd.api.types.is_datetime64_any_dtype(col):
+            return np.zeros(len(col), dtype=bool)
+        return _as_datetime(col.astype(str).where(notna), fmt).isna().to_numpy() & notna
+    if rule.kind == 'one_of':
+        return ~col.isin(rule.params['values']).to_numpy() & notna
+    if rule.kind == 'unique':
+        return col.duplicated(keep='first').to_numpy() & notna
+    raise ValueError(f"Unknown rule kind: {rule.kind}")
+
+
+@dataclass
+class ValidationResult:
+    """Per-rule violation masks (aligned with the validated frame) and the rules behind them."""
+    masks: pd.DataFrame
+    rules: List[Rule]
+    skipped: List[Rule]
+
+    @property
+    def rows(self) -> int:
+        return len(self.masks)
+
+    def invalid(self, severity: str = 'error') -> pd.Series:
+        """Rows breaking at least one rule of `severity` (what --quarantine removes)."""
+        cols = [r.name for r in self.rules if r.severity == severity]
+        if not cols:
+            return pd.Series(False, index=self.masks.index)
+        return self.masks[cols].any(axis=1)
+
+    def summary(self) -> pd.DataFrame:
+        counts = self.masks.sum(axis=0).astype('int64')
+        frame = pd.DataFrame({
+            'rule': [r.name for r in self.rules],
+            'check': [r.describe() for r in self.rules],
+            'severity': [r.severity for r in self.rules],
+            'violations': [int(counts[r.name]) for r in self.rules],
+        })
+        frame['share_pct'] = (frame['violations'] / max(self.rows, 1) * 100).round(2)
+        return frame.sort_values(['violations', 'rule'], ascending=[False, True], kind='stable').reset_index(drop=True)
+
+    def violation_labels(self, rows: pd.Series) -> pd.Series:
+        """Semicolon-joined names of the rules each selected row breaks."""
+        sub = self.masks.loc[rows]
+        labels = pd.Series('', index=sub.index)
+        for name in sub.columns:
+            hit = sub[name].to_numpy()
+            if hit.any():
+                labels[hit] = labels[hit] + np.where(labels[hit] == '', '', ';') + name
+        return labels
+
+    def markdown_lines(self, title: str) -> List[str]:
+        lines = ["", f"## {title}"]
+        lines.append(f"- Rows checked: {self.rows}")
+        lines.append(f"- Rows with errors: {int(self.invalid('error').sum())}")
+        lines.append(f"- Rows with warnings: {int(self.invalid('warn').sum())}")
+        if self.skipped:
+            lines.append(f"- Skipped (columns absent): {', '.join(r.name for r in self.skipped)}")
+        lines.append("```")
+        lines.append(self.summary().to_string(index=False))
+        lines.append("```")
+        return lines
+
+
+def validate(df: pd.DataFrame, contract: Sequence[Rule]) -> ValidationResult:
+    applied, skipped, masks = [], [], {}
+    for rule in contract:
+        if not all(c in df.columns for c in rule.columns):
+            skipped.append(rule)
+            continue
+        applied.append(rule)
+        masks[rule.name] = _violations(df, rule)
+    return ValidationResult(pd.DataFrame(masks, index=df.index), applied, skipped)
+
+
+def quarantine(df: pd.DataFrame, result: ValidationResult, path: str = DEFAULT_QUARANTINE) -> pd.DataFrame:
+    """Write rows failing an 'error' rule to `path` (with their rule names) and return the rest."""
+    bad = result.invalid('error')
+    rejected = df.loc[bad].copy()
+    rejected['violations'] = result.violation_labels(bad)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    rejected.to_csv(path, index=False)
+    return df.loc[~bad]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a jobs dataset against a column contract')
+    parser.add_argument('--input', default=os.path.join('data', 'raw', 'unified_jobs_dataset.csv'))
+    parser.add_argument('--contract', choices=sorted(CONTRACTS), default='raw')
+    parser.add_argument('--quarantine', default=None, help='Write rows failing error rules to this CSV')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    result = validate(df, CONTRACTS[args.contract])
+    print("\n".join(result.markdown_lines(f'Validation ({args.contract})')))
+    if args.quarantine:
+        kept = quarantine(df, result, args.quarantine)
+        print(f"Quarantined {len(df) - len(kept)} rows to {args.quarantine}")
+
+
+if __name__ == '__main__':
+    main()
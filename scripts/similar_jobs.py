@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Similar-job search over the cleaned jobs dataset
+- Each posting becomes a sparse, L2-normalized TF-IDF vector over title words, whole
+  skills (skills_clean) and description words, each field with its own weight
+- Random-hyperplane LSH: TABLES tables of `bits` sign bits each; a table's bucket key is
+  the bit pattern of the vector's projections. Query candidates are the union of the
+  query's buckets (plus buckets one bit away with multi-probe), re-ranked by exact cosine
+- `bits` defaults to log2(rows / BUCKET_TARGET), so buckets stay small as the dataset
+  grows and candidate sets grow only logarithmically with it
+- Persisted as one .npz (CSR vectors, vocabulary, idf, per-table sorted bucket keys);
+  the hyperplanes are regenerated from the stored seed
+
+    python scripts/similar_jobs.py build
+    python scripts/similar_jobs.py query --job-id 12345 --top 10
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from feature_store import skill_csr
+from text_index import STOPWORDS, field_terms
+
+DEFAULT_INPUT = os.path.join('data', 'processed', 'cleaned_jobs_dataset.csv')
+DEFAULT_INDEX = os.path.join('data', 'processed', 'similar_jobs.npz')
+
+# field -> (cleaned column, fallback column, weight)
+FIELDS = {'title': ('title_clean', 'title', 2.0), 'skills': ('skills_clean', 'skills', 1.5),
+          'description': ('description', None, 1.0)}
+MIN_DF = 2
+TABLES = 16
+BUCKET_TARGET = 4  # expected postings per bucket when bits is chosen automatically
+SEED = 0
+PROJECT_BATCH_ROWS = 2048
+FORMAT_VERSION = 1
+
+
+def _column(df: pd.DataFrame, field: str) -> Optional[pd.Series]:
+    col, fallback, _ = FIELDS[field]
+    for c in (col, fallback):
+        if c is not None and c in df.columns:
+            return df[c]
+    return None
+
+
+def _term_pairs(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(row, feature name, field weight) for every term occurrence, feature names prefixed by field."""
+    rows, names, weights = [], [], []
+    for field, (_, _, weight) in FIELDS.items():
+        series = _column(df, field)
+        if series is None:
+            continue
+        if field == 'skills':
+            indptr, codes, vocab = skill_csr(series)
+            r = np.repeat(np.arange(len(series), dtype=np.int64), np.diff(indptr))
+            vocab = np.asarray(vocab, dtype=object)
+        else:
+            r, codes, vocab = field_terms(series)
+            keep = ~pd.Index(vocab).isin(STOPWORDS)[codes]
+            r, codes = r[keep], codes[keep]
+        prefixed = np.array([f'{field[0]}:{v}' for v in vocab], dtype=object)
+        rows.append(r)
+        names.append(prefixed[codes])
+        weights.append(np.full(len(r), weight, dtype=np.float32))
+    if not rows:
+        return np.empty(0, np.int64), np.empty(0, dtype=object), np.empty(0, np.float32)
+    return np.concatenate(rows), np.concatenate(names), np.concatenate(weights)
+
+
+def tfidf_vectors(df: pd.DataFrame, vocab: Optional[np.ndarray] = None, idf: Optional[np.ndarray] = None
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    CSR TF-IDF rows for df: (indptr, indices, data float32, vocab, idf).
+    Fits the vocabulary (terms in at least MIN_DF postings) and idf unless both are given.
+    Weights are field weight x (1 + log tf) x idf, rows L2-normalized.
+    """
+    n = len(df)
+    rows, names, weights = _term_pairs(df)
+    if vocab is None:
+        codes, uniques = pd.factorize(names)
+        pair_keys = np.unique(codes.astype(np.int64) * max(n, 1) + rows)
+        doc_freq = np.bincount(pair_keys // max(n, 1), minlength=len(uniques))
+        keep_terms = np.flatnonzero(doc_freq >= MIN_DF)
+        vocab = np.asarray(uniques, dtype=object)[keep_terms]
+        idf = (np.log((1.0 + n) / (1.0 + doc_freq[keep_terms])) + 1.0).astype(np.float32)
+    codes = pd.Index(vocab).get_indexer(names)
+    known = codes >= 0
+    rows, codes, weights = rows[known], codes[known], weights[known]
+
+    # one entry per (row, term): tf counts and the field weight (a term name belongs to one field)
+    keys = rows * len(vocab) + codes
+    keys, first, tf = np.unique(keys, return_index=True, return_counts=True)
+    rows, codes = keys // max(len(vocab), 1), keys % max(len(vocab), 1)
+    data = weights[first] * (1.0 + np.log(tf)).astype(np.float32) * idf[codes]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    norms = np.sqrt(np.add.reduceat(data.astype(np.float64) ** 2, indptr[:-1])) if len(data) else np.zeros(n)
+    norms = np.where(np.diff(indptr) > 0, norms, 1.0)
+    data = (data / np.repeat(norms, np.diff(indptr))).astype(np.float32)
+    return indptr, codes.astype(np.int32), data, vocab, idf
+
+
+def auto_bits(rows: int) -> int:
+    return int(np.clip(np.round(np.log2(max(rows, 1) / BUCKET_TARGET)), 8, 24))
+
+
+def hyperplanes(vocab_size: int, tables: int, bits: int, seed: int = SEED) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((vocab_size, tables * bits), dtype=np.float32)
+
+
+def bucket_keys(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, planes: np.ndarray,
+                tables: int, bits: int) -> np.ndarray:
+    """rows x tables int32 bucket keys: the sign bits of each row's projections, packed per table."""
+    n = len(indptr) - 1
+    keys = np.zeros((n, tables), dtype=np.int32)
+    weights = (1 << np.arange(bits)).astype(np.int32)
+    for start in range(0, n, PROJECT_BATCH_ROWS):
+        stop = min(start + PROJECT_BATCH_ROWS, n)
+        lo, hi = indptr[start], indptr[stop]
+        lens = np.diff(indptr[start:stop + 1])
+        proj = np.zeros((stop - start, planes.shape[1]), dtype=np.float32)
+        if hi > lo:
+            contrib = planes[indices[lo:hi]] * data[lo:hi, None]
+            nonempty = np.flatnonzero(lens)
+            proj[nonempty] = np.add.reduceat(contrib, (indptr[start:stop] - lo)[nonempty], axis=0)
+        signs = (proj > 0).reshape(stop - start, tables, bits)
+        keys[start:stop] = signs.astype(np.int32) @ weights
+    return keys
+
+
+class SimilarJobs:
+    """TF-IDF vectors plus LSH bucket tables for top-k cosine similarity queries."""
+
+    def __init__(self, indptr, indices, data, vocab, idf, job_ids, keys, tables: int, bits: int, seed: int = SEED):
+        self.indptr, self.indices, self.data = indptr, indices, data
+        self.vocab, self.idf = np.asarray(vocab, dtype=object), idf
+        self.job_ids = np.asarray(job_ids, dtype=object)
+        self.tables, self.bits, self.seed = tables, bits, seed
+        self.keys = keys
+        self.order = np.argsort(keys, axis=0, kind='stable').T.astype(np.int32).copy()  # tables x rows
+        self.sorted_keys = np.take_along_axis(keys, self.order.T, axis=0).T.copy()
+        self._planes: Optional[np.ndarray] = None
+        self._row_of: Optional[pd.Index] = None
+
+    @property
+    def rows(self) -> int:
+        return len(self.indptr) - 1
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, tables: int = TABLES, bits: Optional[int] = None,
+              seed: int = SEED) -> 'SimilarJobs':
+        bits = bits or auto_bits(len(df))
+        if tables * bits > 1024 or bits > 30:
+            raise ValueError("Use at most 30 bits per table and 1024 in total")
+        indptr, indices, data, vocab, idf = tfidf_vectors(df)
+        planes = hyperplanes(len(vocab), tables, bits, seed)
+        keys = bucket_keys(indptr, indices, data, planes, tables, bits)
+        job_ids = df['job_id'].astype(str).to_numpy(dtype=object) if 'job_id' in df.columns else \
+            np.arange(len(df)).astype(str).astype(object)
+        index = cls(indptr, indices, data, vocab, idf, job_ids, keys, tables, bits, seed)
+        index._planes = planes
+        return index
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        meta = {'format_version': FORMAT_VERSION, 'tables': self.tables, 'bits': self.bits, 'seed': self.seed,
+                'fields': FIELDS, 'min_df': MIN_DF}
+        tmp = path + '.tmp.npz'
+        np.savez(tmp, indptr=self.indptr, indices=self.indices, data=self.data, vocab=self.vocab.astype(str),
+                 idf=self.idf, job_id=self.job_ids.astype(str), keys=self.keys, meta=np.array(json.dumps(meta)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SimilarJobs':
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z['meta']))
+            if meta.get('format_version') != FORMAT_VERSION:
+                raise ValueError(f"Similar-jobs index {path} does not match this version; rebuild it")
+            return cls(z['indptr'], z['indices'], z['data'], z['vocab'], z['idf'], z['job_id'], z['keys'],
+                       meta['tables'], meta['bits'], meta['seed'])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def row_of(self, job_id: str) -> int:
+        if self._row_of is None:
+            self._row_of = pd.Index(self.job_ids)
+        pos = self._row_of.get_indexer([str(job_id)])[0]
+        if pos < 0:
+            raise KeyError(f"job_id {job_id} is not in the similar-jobs index")
+        return int(pos)
+
+    def _planes_for_queries(self) -> np.ndarray:
+        if self._planes is None:
+            self._planes = hyperplanes(len(self.vocab), self.tables, self.bits, self.seed)
+        return self._planes
+
+    def candidates(self, keys: np.ndarray, multiprobe: bool = True) -> np.ndarray:
+        """Rows sharing a bucket with `keys` (one key per table), optionally also buckets one bit away."""
+        flips = np.concatenate([[0], 1 << np.arange(self.bits)]) if multiprobe else np.zeros(1, dtype=np.int64)
+        parts = []
+        for t in range(self.tables):
+            probes = np.bitwise_xor(int(keys[t]), flips)
+            lo = np.searchsorted(self.sorted_keys[t], probes, side='left')
+            hi = np.searchsorted(self.sorted_keys[t], probes, side='right')
+            parts.extend(self.order[t, a:b] for a, b in zip(lo, hi) if b > a)
+        return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int32)
+
+    def cosine(self, q_indices: np.ndarray, q_data: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Exact cosine between one normalized query vector and the given rows."""
+        if not len(rows):
+            return np.empty(0, dtype=np.float32)
+        dense = np.zeros(len(self.vocab), dtype=np.float32)
+        dense[q_indices] = q_data
+        starts, lens = self.indptr[rows], np.diff(self.indptr)[rows]
+        offsets = np.concatenate([[0], np.cumsum(lens)])
+        gather = np.repeat(starts - offsets[:-1], lens) + np.arange(offsets[-1])
+        products = self.data[gather] * dense[self.indices[gather]]
+        out = np.zeros(len(rows), dtype=np.float32)
+        nonempty = np.flatnonzero(lens)
+        if len(nonempty):
+            out[nonempty] = np.add.reduceat(products, offsets[:-1][nonempty])
+        return out
+
+    def _top(self, q_indices, q_data, rows, k, exclude: Optional[int] = None) -> pd.DataFrame:
+        if exclude is not None:
+            rows = rows[rows != exclude]
+        scores = self.cosine(q_indices, q_data, rows)
+        order = np.lexsort((rows, -scores))[:k]
+        return pd.DataFrame({'job_id': self.job_ids[rows[order]], 'row': rows[order].astype(np.int64),
+                             'similarity': scores[order]})
+
+    def similar(self, job_id: Optional[str] = None, k: int = 10, row: Optional[int] = None,
+                multiprobe: bool = True, exact: bool = False) -> pd.DataFrame:
+        """
+        Top-k postings most similar to an indexed posting (by job_id or row), itself excluded.
+        exact=True compares against every posting instead of the LSH candidates.
+        """
+        row = self.row_of(job_id) if row is None else int(row)
+        lo, hi = self.indptr[row], self.indptr[row + 1]
+        q_indices, q_data = self.indices[lo:hi], self.data[lo:hi]
+        rows = np.arange(self.rows, dtype=np.int32) if exact else self.candidates(self.keys[row], multiprobe)
+        return self._top(q_indices, q_data, rows, k, exclude=row)
+
+    def similar_to(self, posting: dict, k: int = 10, multiprobe: bool = True, exact: bool = False) -> pd.DataFrame:
+        """Top-k indexed postings most similar to a new posting given as {column: value}."""
+        frame = pd.DataFrame([posting])
+        indptr, q_indices, q_data, _, _ = tfidf_vectors(frame, self.vocab, self.idf)
+        if exact:
+            rows = np.arange(self.rows, dtype=np.int32)
+        else:
+            keys = bucket_keys(indptr, q_indices, q_data, self._planes_for_queries(), self.tables, self.bits)
+            rows = self.candidates(keys[0], multiprobe)
+        return self._top(q_indices, q_data, rows, k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the similar-jobs LSH index')
+    sub = parser.add_subparsers(dest='command', required=True)
+    b = sub.add_parser('build', help='Vectorize the cleaned dataset and build the LSH tables')
+    b.add_argument('--input', default=DEFAULT_INPUT)
+    b.add_argument('--tables', type=int, default=TABLES)
+    b.add_argument('--bits', type=int, default=None, help='Bits per table (default: log2(rows / 4))')
+    b.add_argument('--seed', type=int, default=SEED)
+    q = sub.add_parser('query', help='Most similar postings to an indexed job_id')
+    q.add_argument('--job-id', required=True)
+    q.add_argument('--top', type=int, default=10)
+    q.add_argument('--exact', action='store_true', help='Brute-force cosine over every posting')
+    for p in (b, q):
+        p.add_argument('--index', default=DEFAULT_INDEX)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        df = pd.read_parquet(args.input) if args.input.endswith('.parquet') else pd.read_csv(args.input)
+        index = SimilarJobs.build(df, args.tables, args.bits, args.seed)
+        index.save(args.index)
+        print(f"Similar-jobs index: {index.rows:,} postings, {len(index.vocab):,} terms, "
+              f"{index.tables} tables x {index.bits} bits -> {args.index}")
+        return
+    index = SimilarJobs.load(args.index)
+    print(index.similar(args.job_id, args.top, exact=args.exact).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
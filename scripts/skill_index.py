@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Inverted skill index over the cleaned jobs dataset
+- Normalized skill (lowercased, whitespace collapsed) -> sorted int32 posting list of
+  document ids; documents carry job_id plus city, category, experience level and years
+- Built after cleaning; new collection sessions are appended incrementally (a re-scraped
+  job_id replaces its earlier document, which is tombstoned until the next compaction)
+- Boolean queries ("python AND (sql OR postgresql) AND NOT php") are answered by
+  intersecting/merging posting lists, then filtered by city/category/experience on the
+  matching documents only
+
+    python scripts/skill_index.py --query "python AND sql" --city Bangalore
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from feature_store import skill_csr
+
+DEFAULT_INPUT = os.path.join('data', 'processed', 'cleaned_jobs_dataset.csv')
+DEFAULT_INDEX = os.path.join('data', 'processed', 'skill_index.npz')
+
+PARTITION_COL = 'collection_session'
+SKILLS_COL = 'skills_clean'
+# filter name -> (cleaned column, fallback column)
+FILTER_COLUMNS = {'city': ('city_norm', 'city_clean'), 'category': ('category_standard', 'category_searched_clean'),
+                  'experience_level': ('experience_level', None)}
+FORMAT_VERSION = 1
+# compact once this share of documents is tombstoned
+COMPACT_DEAD_SHARE = 0.25
+
+_query_token = re.compile(r'(\(|\)|"[^"]*"|\b(?:AND|OR|NOT)\b)')
+_spaces = re.compile(r'\s+')
+
+
+def normalize_skill(text: str) -> str:
+    return _spaces.sub(' ', text.strip().lower())
+
+
+def _intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    if len(b) > 16 * len(a):
+        # galloping-style: binary-search the short list in the long one
+        pos = np.minimum(np.searchsorted(b, a), len(b) - 1)
+        return a[b[pos] == a]
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+def parse_query(text: str):
+    """
+    Parse a boolean skill query into a tree of ('term', skill), ('not', node),
+    ('and', [nodes]) and ('or', [nodes]). Operators are upper-case AND/OR/NOT with
+    parentheses; AND binds tighter than OR. Quote skills containing operator words.
+    """
+    tokens = [t.strip() for t in _query_token.split(text) if t and t.strip()]
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def or_expr():
+        nodes = [and_expr()]
+        while peek() == 'OR':
+            take()
+            nodes.append(and_expr())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def and_expr():
+        nodes = [unary()]
+        while peek() == 'AND':
+            take()
+            nodes.append(unary())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def unary():
+        tok = peek()
+        if tok is None:
+            raise ValueError(f"Unexpected end of query: {text!r}")
+        if tok == 'NOT':
+            take()
+            return ('not', unary())
+        if tok == '(':
+            take()
+            node = or_expr()
+            if peek() != ')':
+                raise ValueError(f"Missing ')' in query: {text!r}")
+            take()
+            return node
+        if tok in ('AND', 'OR', ')'):
+            raise ValueError(f"Unexpected {tok!r} in query: {text!r}")
+        take()
+        return ('term', normalize_skill(tok.strip('"')))
+
+    tree = or_expr()
+    if peek() is not None:
+        raise ValueError(f"Unexpected {peek()!r} in query: {text!r}")
+    return tree
+
+
+def compact_strings(values: np.ndarray) -> np.ndarray:
+    """Fixed-width bytes when every value is ASCII (a quarter of the unicode size), else unicode."""
+    try:
+        return values.astype('S')
+    except UnicodeEncodeError:
+        return values.astype(str)
+
+
+class SkillIndex:
+    """Posting lists per skill plus per-document filter columns, all as NumPy arrays."""
+
+    def __init__(self):
+        self.postings: Dict[str, np.ndarray] = {}
+        self.job_ids = np.empty(0, dtype=object)
+        self.live = np.empty(0, dtype=bool)
+        self.exp_min = np.empty(0, dtype=np.float32)
+        self.exp_max = np.empty(0, dtype=np.float32)
+        # filter name -> (codes int32, values); code -1 is missing
+        self.codes: Dict[str, np.ndarray] = {k: np.empty(0, dtype=np.int32) for k in FILTER_COLUMNS}
+        self.values: Dict[str, List[str]] = {k: [] for k in FILTER_COLUMNS}
+        self.partitions: List[str] = []
+        self._lookup: Optional[Dict[str, Dict[str, int]]] = None
+
+    @property
+    def docs(self) -> int:
+        return len(self.job_ids)
+
+    @property
+    def live_docs(self) -> int:
+        return int(self.live.sum())
+
+    # ------------------------------------------------------------------
+    # Building / incremental maintenance
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> 'SkillIndex':
+        index = cls()
+        index.update(df, partition_col)
+        return index
+
+    def update(self, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> List[str]:
+        """
+        Append rows of partitions not yet indexed. Without a partition column the
+        index is rebuilt from df. Returns the partitions that were added.
+        """
+        if partition_col not in df.columns:
+            self.__init__()
+            self._append(df)
+            return []
+        parts = df[partition_col].astype(str)
+        new_parts = [p for p in pd.unique(parts) if p not in self.partitions]
+        if new_parts:
+            self._append(df[parts.isin(new_parts)])
+            self.partitions.extend(new_parts)
+        return new_parts
+
+    def _append(self, df: pd.DataFrame):
+        base = self.docs
+        n = len(df)
+        job_ids = df['job_id'].astype(str).to_numpy(dtype=object) if 'job_id' in df.columns else \
+            np.array([str(base + i) for i in range(n)], dtype=object)
+
+        # a re-scraped job replaces its earlier document (and the last copy within df wins)
+        if base:
+            live_docs = np.flatnonzero(self.live)
+            old = pd.Index(self.job_ids[live_docs]).get_indexer(job_ids)
+            self.live[live_docs[old[old >= 0]]] = False
+        last = ~pd.Series(job_ids).duplicated(keep='last').to_numpy()
+
+        skills = df[SKILLS_COL] if SKILLS_COL in df.columns else pd.Series(None, index=df.index, dtype=object)
+        indptr, indices, vocab = skill_csr(skills.astype(object).str.replace(_spaces, ' ', regex=True))
+        if len(indices):
+            docs = np.repeat(np.arange(base, base + n, dtype=np.int32), np.diff(indptr))
+            order = np.argsort(indices, kind='stable')  # stable: doc ids stay sorted within a skill
+            term_ptr = np.concatenate([[0], np.cumsum(np.bincount(indices, minlength=len(vocab)))])
+            sorted_docs = docs[order]
+            for t, skill in enumerate(vocab):
+                new = sorted_docs[term_ptr[t]:term_ptr[t + 1]]
+                prev = self.postings.get(skill)
+                # new documents have the largest ids, so appending keeps the list sorted
+                self.postings[skill] = new if prev is None else np.concatenate([prev, new])
+
+        self.job_ids = np.concatenate([self.job_ids, job_ids])
+        self.live = np.concatenate([self.live, last])
+        for name, cols in FILTER_COLUMNS.items():
+            col = next((c for c in cols if c is not None and c in df.columns), None)
+            values = df[col] if col else pd.Series(None, index=df.index, dtype=object)
+            self.codes[name] = np.concatenate([self.codes[name], self._encode(name, values)])
+        for attr, col in (('exp_min', 'exp_min_years'), ('exp_max', 'exp_max_years')):
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(np.float32, na_value=np.nan) \
+                if col in df.columns else np.full(n, np.nan, dtype=np.float32)
+            setattr(self, attr, np.concatenate([getattr(self, attr), values]))
+        self._lookup = None
+        if self.docs and (self.docs - self.live_docs) > COMPACT_DEAD_SHARE * self.docs:
+            self.compact()
+
+    def _encode(self, name: str, values: pd.Series) -> np.ndarray:
+        known = self.values[name]
+        pos = {v: i for i, v in enumerate(known)}
+        codes, uniques = pd.factorize(values.astype(object).where(values.notna()), use_na_sentinel=True)
+        remap = np.empty(len(uniques) + 1, dtype=np.int32)
+        remap[-1] = -1
+        for i, v in enumerate(uniques):
+            v = str(v)
+            if v not in pos:
+                pos[v] = len(known)
+                known.append(v)
+            remap[i] = pos[v]
+        return remap[codes]
+
+    def compact(self):
+        """Drop tombstoned documents and renumber the rest (posting lists stay sorted)."""
+        keep = self.live
+        if keep.all():
+            return
+        new_id = np.cumsum(keep, dtype=np.int64).astype(np.int32) - 1
+        postings = {}
+        for skill, docs in self.postings.items():
+            docs = new_id[docs[keep[docs]]]
+            if len(docs):
+                postings[skill] = docs
+        self.postings = postings
+        self.job_ids, self.exp_min, self.exp_max = self.job_ids[keep], self.exp_min[keep], self.exp_max[keep]
+        for name in self.codes:
+            self.codes[name] = self.codes[name][keep]
+        self.live = np.ones(len(self.job_ids), dtype=bool)
+        self._lookup = None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        vocab = list(self.postings)
+        lengths = np.array([len(self.postings[s]) for s in vocab], dtype=np.int64)
+        arrays = {
+            'post_ptr': np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            'post_docs': np.concatenate([self.postings[s] for s in vocab]) if vocab else np.empty(0, np.int32),
+            'vocab': np.array(vocab, dtype=str),
+            'job_id': compact_strings(self.job_ids),
+            'live': self.live,
+            'exp_min': self.exp_min,
+            'exp_max': self.exp_max,
+            'meta': np.array(json.dumps({'format_version': FORMAT_VERSION, 'partitions': self.partitions,
+                                         'values': self.values})),
+        }
+        arrays.update({f'codes_{k}': v for k, v in self.codes.items()})
+        tmp = path + '.tmp.npz'
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SkillIndex':
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z['meta']))
+            if meta.get('format_version') != FORMAT_VERSION or set(meta.get('values', {})) != set(FILTER_COLUMNS):
+                raise ValueError(f"Skill index layout in {path} does not match this version; rebuild it")
+            index = cls()
+            ptr, docs = z['post_ptr'], z['post_docs']
+            index.postings = {s: docs[ptr[i]:ptr[i + 1]] for i, s in enumerate(z['vocab'].tolist())}
+            index.job_ids = z['job_id'].astype(str).astype(object)
+            index.live, index.exp_min, index.exp_max = z['live'], z['exp_min'], z['exp_max']
+            index.codes = {k: z[f'codes_{k}'] for k in FILTER_COLUMNS}
+        index.values = meta['values']
+        index.partitions = meta['partitions']
+        return index
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def posting(self, skill: str) -> np.ndarray:
+        return self.postings.get(normalize_skill(skill), np.empty(0, dtype=np.int32))
+
+    def _universe(self) -> np.ndarray:
+        return np.flatnonzero(self.live).astype(np.int32)
+
+    def _eval(self, node) -> np.ndarray:
+        kind = node[0]
+        if kind == 'term':
+            return self.posting(node[1])
+        if kind == 'not':
+            return np.setdiff1d(self._universe(), self._eval(node[1]), assume_unique=True)
+        if kind == 'or':
+            out = self._eval(node[1][0])
+            for child in node[1][1:]:
+                out = np.union1d(out, self._eval(child))
+            return out
+        # AND: intersect positive lists shortest first, then subtract the negated ones
+        positives = [self._eval(c) for c in node[1] if c[0] != 'not']
+        negatives = [self._eval(c[1]) for c in node[1] if c[0] == 'not']
+        positives.sort(key=len)
+        out = positives[0] if positives else self._universe()
+        for lst in positives[1:]:
+            if not len(out):
+                break
+            out = _intersect(out, lst)
+        for lst in negatives:
+            out = np.setdiff1d(out, lst, assume_unique=True)
+        return out
+
+    def _filter_mask(self, docs: np.ndarray, name: str, value) -> np.ndarray:
+        if self._lookup is None:
+            self._lookup = {k: {v.lower(): i for i, v in enumerate(vals)} for k, vals in self.values.items()}
+        vals = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        wanted = [self._lookup[name].get(str(v).lower(), -2) for v in vals]
+        return np.isin(self.codes[name][docs], wanted)
+
+    def query_docs(self, expr: Optional[str] = None, city: Union[str, Sequence[str], None] = None,
+                   category: Union[str, Sequence[str], None] = None,
+                   experience_level: Union[str, Sequence[str], None] = None,
+                   experience_years: Optional[float] = None) -> np.ndarray:
+        """
+        Sorted document ids of live jobs matching the skill expression and filters.
+        Filters accept one value or a list (case-insensitive); experience_years keeps jobs
+        whose stated range admits that many years (unknown bounds always pass).
+        """
+        docs = self._eval(parse_query(expr)) if expr and expr.strip() else self._universe()
+        mask = self.live[docs]
+        for name, value in (('city', city), ('category', category), ('experience_level', experience_level)):
+            if value is not None:
+                mask &= self._filter_mask(docs, name, value)
+        if experience_years is not None:
+            lo, hi = self.exp_min[docs], self.exp_max[docs]
+            mask &= ~(lo > experience_years) & ~(hi < experience_years)
+        return docs[mask]
+
+    def query(self, expr: Optional[str] = None, **filters) -> np.ndarray:
+        """job_ids of matching jobs (see query_docs for the arguments)."""
+        return self.job_ids[self.query_docs(expr, **filters)]
+
+    def count(self, expr: Optional[str] = None, **filters) -> int:
+        return len(self.query_docs(expr, **filters))
+
+    def top_skills(self, n: int = 20) -> pd.Series:
+        """Skills by number of live jobs."""
+        counts = {s: int(self.live[d].sum()) for s, d in self.postings.items()}
+        return pd.Series(counts, dtype='int64').sort_values(ascending=False, kind='stable').head(n)
+
+
+def load_or_build(path: str, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> tuple[SkillIndex, List[str]]:
+    """Load the index at path (if compatible) and append new partitions of df."""
+    index = SkillIndex()
+    if os.path.exists(path):
+        try:
+            index = SkillIndex.load(path)
+        except (ValueError, KeyError) as e:
+            print(f"Rebuilding skill index: {e}")
+    added = index.update(df, partition_col)
+    return index, added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build/update and query the inverted skill index')
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='Cleaned dataset (CSV or Parquet); skipped if missing')
+    parser.add_argument('--index', default=DEFAULT_INDEX)
+    parser.add_argument('--rebuild', action='store_true', help='Discard the stored index before ingesting')
+    parser.add_argument('--query', default=None, help='Boolean skill query, e.g. "python AND (sql OR mysql)"')
+    parser.add_argument('--city', action='append', default=None)
+    parser.add_argument('--category', action='append', default=None)
+    parser.add_argument('--experience-level', action='append', default=None)
+    parser.add_argument('--experience-years', type=float, default=None)
+    parser.add_argument('--limit', type=int, default=20, help='job_ids to print')
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(args.index):
+        os.remove(args.index)
+    if os.path.exists(args.input):
+        df = pd.read_parquet(args.input) if args.input.endswith('.parquet') else pd.read_csv(args.input)
+        index, added = load_or_build(args.index, df)
+        index.save(args.index)
+        print(f"Skill index: {index.live_docs:,} jobs, {len(index.postings):,} skills, "
+              f"partitions added: {len(added)} (total {len(index.partitions)})")
+    else:
+        index = SkillIndex.load(args.index)
+    if args.query is None and not any([args.city, args.category, args.experience_level, args.experience_years is not None]):
+        print(index.top_skills().to_string())
+        return
+    ids = index.query(args.query, city=args.city, category=args.category, experience_level=args.experience_level,
+                      experience_years=args.experience_years)
+    print(f"{len(ids):,} matching jobs")
+    for job_id in ids[:args.limit]:
+        print(f"   {job_id}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Session-to-session snapshot diff: which postings appeared, disappeared or changed
+- Each snapshot (a CSV, optionally filtered to one collection_session) is read in chunks
+  and reduced to fixed-width fingerprints: a 64-bit hash of job_id, the row number and one
+  64-bit hash per tracked field. No text column is ever joined or compared directly
+- Fingerprints are range-partitioned on the top bits of the key hash and spilled to .npy
+  runs once more than --spill-rows are buffered (external sort), so each partition can be
+  sorted and merged on its own in bounded memory
+- Sorted keys are merged with searchsorted: new-only keys are added, old-only keys removed,
+  and shared keys whose field hashes differ are changed (with the changed fields)
+- Only the rows in the diff are read back as text, in a second chunked pass
+- Repeated job_ids within a snapshot keep their last row (the latest scrape)
+
+    python scripts/snapshot_diff.py --old data/raw/complete_jobs_data_<A>.csv --new data/raw/complete_jobs_data_<B>.csv
+"""
+from __future__ import annotations
+import argparse
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from salary_parser import parse_salary_text
+from schema_validation import MAX_SALARY_INR, MIN_SALARY_INR
+
+KEY_COLUMN = 'job_id'
+SESSION_COLUMN = 'collection_session'
+TRACKED_FIELDS = ['title', 'company', 'city', 'salary_text', 'experience_text', 'job_type', 'skills', 'description']
+GROUP_COLUMN = 'category_searched'
+DEFAULT_CHUNK_ROWS = 200_000
+DEFAULT_SPILL_ROWS = 2_000_000  # buffered fingerprints per snapshot before spilling runs to disk
+PARTITION_BITS = 4
+DEFAULT_OUTPUT_DIR = os.path.join('data', 'processed', 'snapshot_diff')
+DEFAULT_REPORT = os.path.join('reports', 'data_cleaning_report.md')
+
+
+def _hash_column(series: pd.Series) -> np.ndarray:
+    # NULLs hash alike, so a field going from missing to missing is not a change
+    return pd.util.hash_array(series.to_numpy(dtype=object))
+
+
+def read_snapshot(path: str, session: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                  columns: Optional[Sequence[str]] = None) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """
+    (first row number, chunk) pairs, row numbers counting only rows of `session`. Every column
+    is read as text so values hash the same whichever dtype a chunk would have inferred.
+    """
+    usecols = None
+    if columns is not None:
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [c for c in list(columns) + [SESSION_COLUMN] if c in header]
+    start = 0
+    for chunk in pd.read_csv(path, chunksize=chunk_rows, usecols=usecols, dtype=str):
+        if session is not None:
+            chunk = chunk[chunk[SESSION_COLUMN] == session]
+        chunk = chunk.reset_index(drop=True)
+        yield start, chunk
+        start += len(chunk)
+
+
+def list_sessions(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[str]:
+    sessions = set()
+    for chunk in pd.read_csv(path, chunksize=chunk_rows, usecols=[SESSION_COLUMN], dtype=str):
+        sessions.update(chunk[SESSION_COLUMN].dropna().unique())
+    return sorted(sessions)
+
+
+class Fingerprints:
+    """
+    Range-partitioned fingerprint matrix of one snapshot: columns are the key hash, the row
+    number and one hash per field. Partitions are buffered in memory and spilled as unsorted
+    .npy runs; partition() loads one partition's runs and sorts them by key.
+    """
+
+    def __init__(self, workdir: str, fields: Sequence[str], bits: int = PARTITION_BITS,
+                 spill_rows: int = DEFAULT_SPILL_ROWS):
+        self.workdir = workdir
+        self.fields = list(fields)
+        self.bits = bits
+        self.spill_rows = spill_rows
+        self.rows = 0
+        self.runs = 0
+        self._buffer: Dict[int, List[np.ndarray]] = {}
+        self._buffered = 0
+        os.makedirs(workdir, exist_ok=True)
+
+    @property
+    def partitions(self) -> int:
+        return 1 << self.bits
+
+    def add(self, start: int, chunk: pd.DataFrame):
+        if chunk.empty:
+            return
+        block = np.empty((len(chunk), 2 + len(self.fields)), dtype=np.uint64)
+        block[:, 0] = pd.util.hash_array(chunk[KEY_COLUMN].to_numpy(dtype=object))
+        block[:, 1] = np.arange(start, start + len(chunk), dtype=np.uint64)
+        for j, field in enumerate(self.fields):
+            block[:, 2 + j] = _hash_column(chunk[field]) if field in chunk.columns else 0
+        part = (block[:, 0] >> np.uint64(64 - self.bits)).astype(np.intp)
+        order = np.argsort(part, kind='stable')
+        bounds = np.searchsorted(part[order], np.arange(self.partitions + 1))
+        for p in range(self.partitions):
+            if bounds[p] < bounds[p + 1]:
+                self._buffer.setdefault(p, []).append(block[order[bounds[p]:bounds[p + 1]]])
+        self.rows += len(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= self.spill_rows:
+            self.spill()
+
+    def spill(self):
+        if not self._buffered:
+            return
+        for p, blocks in self._buffer.items():
+            np.save(os.path.join(self.workdir, f'p{p:03d}_r{self.runs:04d}.npy'), np.concatenate(blocks))
+        self.runs += 1
+        self._buffer, self._buffered = {}, 0
+
+    def partition(self, p: int) -> np.ndarray:
+        """Fingerprints of partition p sorted by key, keeping the last row per key."""
+        blocks = list(self._buffer.get(p, []))
+        for r in range(self.runs):
+            path = os.path.join(self.workdir, f'p{p:03d}_r{r:04d}.npy')
+            if os.path.exists(path):
+                blocks.append(np.load(path))
+        if not blocks:
+            return np.empty((0, 2 + len(self.fields)), dtype=np.uint64)
+        block = np.concatenate(blocks)
+        block = block[np.lexsort((block[:, 1], block[:, 0]))]
+        last = np.ones(len(block), dtype=bool)
+        last[:-1] = block[1:, 0] != block[:-1, 0]
+        return block[last]
+
+
+def merge_partition(old: np.ndarray, new: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sorted-merge one partition: (added new rows, removed old rows, changed old rows,
+    changed new rows, changed-field mask). Field columns start at index 2.
+    """
+    old_keys, new_keys = old[:, 0], new[:, 0]
+    pos = np.searchsorted(old_keys, new_keys)
+    found = pos < len(old_keys)
+    found[found] = old_keys[pos[found]] == new_keys[found]
+    in_new = np.zeros(len(old_keys), dtype=bool)
+    in_new[pos[found]] = True
+    shared_old, shared_new = old[pos[found]], new[found]
+    differs = shared_old[:, 2:] != shared_new[:, 2:]
+    changed = differs.any(axis=1)
+    return new[~found, 1], old[~in_new, 1], shared_old[changed, 1], shared_new[changed, 1], differs[changed]
+
+
+@dataclass
+class SnapshotDiff:
+    """Row numbers of the diff in each snapshot plus, for changes, which fields differ."""
+    fields: List[str]
+    old_rows: int  # distinct job_ids
+    new_rows: int
+    added: np.ndarray
+    removed: np.ndarray
+    changed_old: np.ndarray
+    changed_new: np.ndarray
+    changed_fields: np.ndarray
+
+    @property
+    def unchanged(self) -> int:
+        return self.new_rows - len(self.added) - len(self.changed_new)
+
+    def field_change_counts(self) -> pd.Series:
+        return pd.Series(self.changed_fields.sum(axis=0), index=self.fields, dtype='int64').sort_values(
+            ascending=False, kind='stable')
+
+
+def diff_fingerprints(old: Fingerprints, new: Fingerprints) -> SnapshotDiff:
+    parts, old_rows, new_rows = [], 0, 0
+    for p in range(old.partitions):
+        old_part, new_part = old.partition(p), new.partition(p)
+        old_rows, new_rows = old_rows + len(old_part), new_rows + len(new_part)
+        parts.append(merge_partition(old_part, new_part))
+    added, removed, changed_old, changed_new = (np.concatenate([part[i] for part in parts]) for i in range(4))
+    changed_fields = np.concatenate([part[4] for part in parts])
+    order = np.argsort(changed_new, kind='stable')
+    return SnapshotDiff(list(old.fields), old_rows, new_rows, np.sort(added), np.sort(removed),
+                        changed_old[order], changed_new[order], changed_fields[order])
+
+
+def fingerprint(path: str, session: Optional[str], workdir: str, fields: Sequence[str],
+                chunk_rows: int = DEFAULT_CHUNK_ROWS, spill_rows: int = DEFAULT_SPILL_ROWS) -> Fingerprints:
+    prints = Fingerprints(workdir, fields, spill_rows=spill_rows)
+    for start, chunk in read_snapshot(path, session, chunk_rows, [KEY_COLUMN] + list(fields)):
+        prints.add(start, chunk)
+    return prints
+
+
+def diff_snapshots(old_path: str, new_path: str, old_session: Optional[str] = None, new_session: Optional[str] = None,
+                   fields: Sequence[str] = TRACKED_FIELDS, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   spill_rows: int = DEFAULT_SPILL_ROWS, workdir: Optional[str] = None) -> SnapshotDiff:
+    tmp = workdir or tempfile.mkdtemp(prefix='snapshot_diff_')
+    try:
+        old = fingerprint(old_path, old_session, os.path.join(tmp, 'old'), fields, chunk_rows, spill_rows)
+        new = fingerprint(new_path, new_session, os.path.join(tmp, 'new'), fields, chunk_rows, spill_rows)
+        return diff_fingerprints(old, new)
+    finally:
+        if workdir is None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def fetch_rows(path: str, rows: np.ndarray, session: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+               columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Rows at the given (sorted) row numbers of a snapshot, in one chunked pass."""
+    wanted = np.sort(rows.astype(np.int64))
+    frames = []
+    for start, chunk in read_snapshot(path, session, chunk_rows, columns):
+        lo, hi = np.searchsorted(wanted, [start, start + len(chunk)])
+        if lo < hi:
+            frames.append(chunk.iloc[wanted[lo:hi] - start].assign(_row=wanted[lo:hi]))
+        if hi == len(wanted):
+            break
+    if not frames:
+        return pd.DataFrame(columns=list(columns or []) + ['_row'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def field_changes(diff: SnapshotDiff, old_path: str, new_path: str, old_session: Optional[str] = None,
+                  new_session: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    """Long table (job_id, field, old, new) of every changed field."""
+    cols = [KEY_COLUMN, GROUP_COLUMN] + diff.fields
+    old = fetch_rows(old_path, diff.changed_old, old_session, chunk_rows, cols).set_index('_row')
+    new = fetch_rows(new_path, diff.changed_new, new_session, chunk_rows, cols).set_index('_row')
+    old, new = old.loc[diff.changed_old], new.loc[diff.changed_new]
+    frames = []
+    for j, field in enumerate(diff.fields):
+        hit = diff.changed_fields[:, j]
+        if hit.any() and field in new.columns:
+            frames.append(pd.DataFrame({
+                KEY_COLUMN: new[KEY_COLUMN].to_numpy()[hit],
+                GROUP_COLUMN: new[GROUP_COLUMN].to_numpy()[hit] if GROUP_COLUMN in new.columns else None,
+                'field': field,
+                'old': old[field].to_numpy()[hit],
+                'new': new[field].to_numpy()[hit],
+            }))
+    if not frames:
+        return pd.DataFrame(columns=[KEY_COLUMN, GROUP_COLUMN, 'field', 'old', 'new'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def salary_change_summary(changes: pd.DataFrame) -> Dict[str, float]:
+    """
+    Direction and median relative change of postings whose parsed average salary moved.
+    Only pairs where both parses fall within the schema's salary range are compared.
+    """
+    sal = changes[changes['field'] == 'salary_text']
+    if sal.empty:
+        return {}
+    old = np.array([parse_salary_text(t)[2] for t in sal['old']], dtype=np.float64)
+    new = np.array([parse_salary_text(t)[2] for t in sal['new']], dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        both = ((old >= MIN_SALARY_INR) & (old <= MAX_SALARY_INR)
+                & (new >= MIN_SALARY_INR) & (new <= MAX_SALARY_INR))
+    rel = (new[both] - old[both]) / old[both]
+    return {
+        'salary_text_changes': len(sal),
+        'comparable': int(both.sum()),
+        'raised': int((rel > 0).sum()),
+        'cut': int((rel < 0).sum()),
+        'median_change_pct': float(np.median(rel) * 100) if len(rel) else float('nan'),
+    }
+
+
+def churn_markdown_lines(diff: SnapshotDiff, changes: pd.DataFrame, added: pd.DataFrame, removed: pd.DataFrame,
+                         old_label: str, new_label: str) -> List[str]:
+    lines = ["", "## Market Churn", f"{old_label} → {new_label}"]
+    lines.append(f"- Postings: {diff.old_rows} → {diff.new_rows}")
+    lines.append(f"- Added: {len(diff.added)}, removed: {len(diff.removed)}, changed: {len(diff.changed_new)}, "
+                 f"unchanged: {diff.unchanged}")
+    if diff.old_rows:
+        lines.append(f"- Churn rate: {(len(diff.added) + len(diff.removed)) / diff.old_rows * 100:.1f}% of the earlier snapshot")
+    salary = salary_change_summary(changes)
+    if salary:
+        lines.append(f"- Salary text changed on {salary['salary_text_changes']} postings; {salary['raised']} raised, "
+                     f"{salary['cut']} cut (median {salary['median_change_pct']:+.1f}% where both parse)")
+    lines.append("### Changed fields")
+    lines.append("```")
+    counts = diff.field_change_counts()
+    lines.append(counts[counts > 0].to_string() if counts.any() else 'none')
+    lines.append("```")
+    if GROUP_COLUMN in added.columns and GROUP_COLUMN in removed.columns:
+        net = pd.DataFrame({'added': added[GROUP_COLUMN].value_counts(), 'removed': removed[GROUP_COLUMN].value_counts()})
+        net = net.fillna(0).astype('int64')
+        net['net'] = net['added'] - net['removed']
+        net.index.name = GROUP_COLUMN
+        lines.append(f"### Net change by {GROUP_COLUMN}")
+        lines.append("```")
+        lines.append(net.sort_values(['net', 'added'], ascending=False, kind='stable').to_string())
+        lines.append("```")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff two job snapshots (added/removed/changed postings)')
+    parser.add_argument('--old', required=True, help='Earlier snapshot CSV')
+    parser.add_argument('--new', required=True, help='Later snapshot CSV')
+    parser.add_argument('--old-session', default=None, help='collection_session to take from --old')
+    parser.add_argument('--new-session', default=None, help='collection_session to take from --new')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help='Where added/removed/changes CSVs go')
+    parser.add_argument('--report', default=DEFAULT_REPORT, help='Markdown report to append the churn section to')
+    parser.add_argument('--no-report', action='store_true', help='Print the churn section instead of appending it')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--spill-rows', type=int, default=DEFAULT_SPILL_ROWS)
+    args = parser.parse_args()
+
+    old_path, new_path = args.old, args.new
+    old_session, new_session = args.old_session, args.new_session
+    if old_path == new_path and (old_session is None or new_session is None):
+        sessions = list_sessions(old_path, args.chunk_rows)
+        if len(sessions) < 2:
+            parser.error(f"{old_path} holds {len(sessions)} session(s); pass two different snapshots")
+        old_session, new_session = old_session or sessions[-2], new_session or sessions[-1]
+
+    diff = diff_snapshots(old_path, new_path, old_session, new_session, chunk_rows=args.chunk_rows,
+                          spill_rows=args.spill_rows)
+    changes = field_changes(diff, old_path, new_path, old_session, new_session, args.chunk_rows)
+    added = fetch_rows(new_path, diff.added, new_session, args.chunk_rows).drop(columns='_row')
+    removed = fetch_rows(old_path, diff.removed, old_session, args.chunk_rows).drop(columns='_row')
+
+    old_label = old_session or os.path.basename(old_path)
+    new_label = new_session or os.path.basename(new_path)
+    out_dir = os.path.join(args.output_dir, f'{old_label}__{new_label}'.replace(os.sep, '_'))
+    os.makedirs(out_dir, exist_ok=True)
+    added.to_csv(os.path.join(out_dir, 'added.csv'), index=False)
+    removed.to_csv(os.path.join(out_dir, 'removed.csv'), index=False)
+    changes.to_csv(os.path.join(out_dir, 'changes.csv'), index=False)
+    print(f"Diff written to: {out_dir}")
+
+    lines = churn_markdown_lines(diff, changes, added, removed, old_label, new_label)
+    if args.no_report:
+        print("\n".join(lines))
+    else:
+        os.makedirs(os.path.dirname(args.report) or '.', exist_ok=True)
+        with open(args.report, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+        print(f"Churn section appended to: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
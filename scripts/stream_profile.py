@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Single-pass, bounded-memory data quality profile of a jobs CSV
+- Reads the file in chunks and folds each chunk into per-column summaries:
+  exact null counts and dtype, a HyperLogLog distinct-count sketch, Space-Saving
+  heavy hitters for the distribution columns, and a string-length histogram
+- Duplicates on the key columns are counted exactly from 64-bit row hashes until
+  DUPLICATE_EXACT_LIMIT distinct keys, then estimated from a HyperLogLog
+- Memory depends on the chunk size and the sketch sizes, not on the row count
+- data_quality_assessment.py --streaming renders the same report sections from it
+
+    python scripts/stream_profile.py --input data/raw/unified_jobs_dataset.csv
+"""
+from __future__ import annotations
+import argparse
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 200_000
+HLL_PRECISION = 14  # 2**14 registers per column: ~0.8% standard error
+SPACE_SAVING_CAPACITY = 1_000
+LENGTH_CAP = 4_096  # longer strings share the last histogram bin
+DUPLICATE_EXACT_LIMIT = 8_000_000  # 64 MB of uint64 hashes
+MISSING_TEXT = 'nan'  # how astype(str) / the DuckDB query layer render nulls
+
+
+def _hash_values(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _lengths(values: np.ndarray) -> np.ndarray:
+    try:
+        return np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    except TypeError:  # mixed object column (e.g. numbers among strings)
+        return np.fromiter((len(str(v)) for v in values), dtype=np.int64, count=len(values))
+
+
+def _text_counts(series: pd.Series) -> pd.Series:
+    """`series.astype(str).value_counts()` for one chunk, converting only the distinct values."""
+    counts = series.value_counts(dropna=False, sort=False)
+    labels = counts.index.to_series(index=np.arange(len(counts)))
+    labels = labels.astype(object).where(labels.notna(), MISSING_TEXT).astype(str)
+    return pd.Series(counts.to_numpy(), index=pd.Index(labels.to_numpy())).groupby(level=0, sort=False).sum()
+
+
+def _merge_unique(sorted_unique: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Union of a sorted unique array with new values; the stable sort merges the two runs in linear time."""
+    merged = np.sort(np.concatenate([sorted_unique, np.unique(values)]), kind='stable')
+    keep = np.ones(len(merged), dtype=bool)
+    keep[1:] = merged[1:] != merged[:-1]
+    return merged[keep]
+
+
+class HyperLogLog:
+    """HyperLogLog over 64-bit hashes with linear counting for small cardinalities."""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.p = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray):
+        if not len(hashes):
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # rank = 1 + trailing zeros of the remaining bits (a power of two is exact in float64)
+        lowest = rest & (~rest + np.uint64(1))
+        rank = np.where(rest == 0, 64 - self.p + 1, np.log2(lowest.astype(np.float64)) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog'):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)
+        return float(raw)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters, fed with exact per-chunk counts and merged as mergeable
+    summaries. Each kept value's count overestimates its true count by at most `errors`;
+    while no value was ever evicted, counts are exact.
+    """
+
+    def __init__(self, capacity: int = SPACE_SAVING_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.errors = pd.Series(dtype=np.int64)
+        self.floor = 0  # count of the smallest kept value once the summary has been truncated
+
+    @property
+    def exact(self) -> bool:
+        return self.floor == 0
+
+    def add_counts(self, counts: pd.Series):
+        if counts.empty:
+            return
+        # values missing from the truncated summary may have had up to `floor` occurrences
+        counts = counts.astype(np.int64)
+        merged = self.counts.add(counts, fill_value=0).astype(np.int64)
+        new = ~merged.index.isin(self.counts.index)
+        errors = self.errors.reindex(merged.index, fill_value=0)
+        if self.floor:
+            merged[new] += self.floor
+            errors[new] += self.floor
+        if len(merged) > self.capacity:
+            merged = merged.sort_values(ascending=False, kind='stable')
+            self.floor = max(self.floor, int(merged.iloc[self.capacity]))
+            merged = merged.iloc[:self.capacity]
+        self.counts, self.errors = merged, errors.reindex(merged.index)
+
+    def top(self, n: int) -> pd.Series:
+        """Most frequent values, ties in value order (as the DuckDB value_counts)."""
+        frame = pd.DataFrame({'v': self.counts.index.astype(str), 'n': self.counts.to_numpy()})
+        frame = frame.sort_values(['n', 'v'], ascending=[False, True], kind='stable').head(n)
+        return pd.Series(frame['n'].to_numpy(), index=pd.Index(frame['v'].to_numpy()), dtype='int64', name='count')
+
+
+class LengthStats:
+    """String length count/sum/min/max plus a capped histogram for quantiles."""
+
+    def __init__(self, cap: int = LENGTH_CAP):
+        self.cap = cap
+        self.hist = np.zeros(cap + 1, dtype=np.int64)
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def add(self, lengths: np.ndarray, weights: Optional[np.ndarray] = None):
+        if not len(lengths):
+            return
+        if weights is None:
+            weights = np.ones(len(lengths), dtype=np.int64)
+        self.hist += np.bincount(np.minimum(lengths, self.cap), weights, minlength=self.cap + 1).astype(np.int64)
+        self.total += int(lengths @ weights)
+        lo, hi = int(lengths.min()), int(lengths.max())
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    @property
+    def count(self) -> int:
+        return int(self.hist.sum())
+
+    def quantile(self, q: float) -> Optional[int]:
+        if not self.count:
+            return None
+        return int(np.searchsorted(np.cumsum(self.hist), q * self.count, side='left'))
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+def _merge_dtype(a: Optional[str], b: str) -> str:
+    """dtype pandas would infer for the whole column from two chunks' dtypes."""
+    if a is None or a == b:
+        return b
+    if {a, b} <= {'int64', 'float64'}:
+        return 'float64'
+    return 'object'
+
+
+class StreamingProfile:
+    """Per-column summaries accumulated chunk by chunk."""
+
+    def __init__(self, distribution_columns: Sequence[str] = (), duplicate_subset: Optional[Sequence[str]] = None,
+                 distinct_columns: Optional[Sequence[str]] = None, sample_rows: int = 10):
+        self.rows = 0
+        self.columns: List[str] = []
+        self.nulls: Dict[str, int] = {}
+        self.dtypes: Dict[str, str] = {}
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.lengths: Dict[str, LengthStats] = {}
+        self.heavy: Dict[str, SpaceSaving] = {c: SpaceSaving() for c in distribution_columns}
+        self.distinct_columns = list(distinct_columns) if distinct_columns is not None else None
+        self.duplicate_subset = list(duplicate_subset) if duplicate_subset else None
+        self._dup_keys = np.empty(0, dtype=np.uint64)
+        self._dup_hll: Optional[HyperLogLog] = None
+        self.sample_rows = sample_rows
+        self.sample: Optional[pd.DataFrame] = None
+
+    def update(self, chunk: pd.DataFrame):
+        if not self.columns:
+            self.columns = list(chunk.columns)
+            if self.duplicate_subset is not None:
+                self.duplicate_subset = [c for c in self.duplicate_subset if c in chunk.columns]
+        if self.sample is None or len(self.sample) < self.sample_rows:
+            head = chunk.head(self.sample_rows - (0 if self.sample is None else len(self.sample)))
+            self.sample = head if self.sample is None else pd.concat([self.sample, head])
+        self.rows += len(chunk)
+
+        for col in self.columns:
+            series = chunk[col]
+            notna = series.notna()
+            self.nulls[col] = self.nulls.get(col, 0) + int(len(series) - notna.sum())
+            self.dtypes[col] = _merge_dtype(self.dtypes.get(col), series.dtype.name)
+            if self.distinct_columns is None or col in self.distinct_columns:
+                # one factorization per chunk: the distinct values feed the sketch (repeats
+                # cannot change a register) and, weighted by their counts, the length histogram
+                counts = series[notna].value_counts(sort=False)
+                values = counts.index.to_numpy(dtype=object)
+                self.distinct.setdefault(col, HyperLogLog()).add_hashes(_hash_values(values))
+                if series.dtype == object:
+                    self.lengths.setdefault(col, LengthStats()).add(_lengths(values), counts.to_numpy(np.int64))
+            if col in self.heavy:
+                self.heavy[col].add_counts(_text_counts(series))
+
+        if self.duplicate_subset:
+            keys = pd.util.hash_pandas_object(chunk[self.duplicate_subset], index=False).to_numpy(np.uint64)
+            if self._dup_hll is None:
+                self._dup_keys = _merge_unique(self._dup_keys, keys)
+                if len(self._dup_keys) > DUPLICATE_EXACT_LIMIT:
+                    self._dup_hll = HyperLogLog()
+                    self._dup_hll.add_hashes(self._dup_keys)
+                    self._dup_keys = np.empty(0, dtype=np.uint64)
+            else:
+                self._dup_hll.add_hashes(keys)
+
+    # ------------------------------------------------------------------
+    # Results (same shapes as the JobQueries aggregates)
+    # ------------------------------------------------------------------
+    @property
+    def duplicates_exact(self) -> bool:
+        return self._dup_hll is None
+
+    def duplicate_count(self) -> int:
+        """Rows repeating an earlier row on the duplicate subset (estimated past the exact limit)."""
+        if not self.duplicate_subset:
+            return 0
+        distinct = len(self._dup_keys) if self._dup_hll is None else self._dup_hll.estimate()
+        return max(0, int(round(self.rows - distinct)))
+
+    def missing_counts(self) -> pd.Series:
+        return pd.Series(self.nulls, dtype='int64').reindex(self.columns).sort_values(ascending=False, kind='stable')
+
+    def dtype_series(self) -> pd.Series:
+        return pd.Series(self.dtypes).reindex(self.columns)
+
+    def value_counts(self, col: str, n: int = 15) -> pd.Series:
+        vc = self.heavy[col].top(n)
+        vc.index.name = col
+        return vc
+
+    def column_summary(self) -> pd.DataFrame:
+        rows = []
+        for col in self.columns:
+            lengths = self.lengths.get(col)
+            hll = self.distinct.get(col)
+            rows.append({
+                'column': col,
+                'non_null': self.rows - self.nulls[col],
+                'distinct_approx': int(round(hll.estimate())) if hll is not None else None,
+                'len_min': lengths.min if lengths else None,
+                'len_mean': round(lengths.mean(), 1) if lengths and lengths.count else None,
+                'len_p95': lengths.quantile(0.95) if lengths else None,
+                'len_max': lengths.max if lengths else None,
+            })
+        return pd.DataFrame(rows).set_index('column').astype({c: 'Int64' for c in ('distinct_approx', 'len_min', 'len_p95', 'len_max')})
+
+
+def profile_csv(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, **kwargs) -> StreamingProfile:
+    """Profile a CSV in one pass of `chunk_rows`-row chunks (StreamingProfile kwargs pass through)."""
+    profile = StreamingProfile(**kwargs)
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        profile.update(chunk)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-pass streaming profile of a jobs CSV')
+    parser.add_argument('--input', default=os.path.join('data', 'raw', 'unified_jobs_dataset.csv'))
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    profile = profile_csv(args.input, args.chunk_rows)
+    print(f"{args.input}: {profile.rows:,} rows x {len(profile.columns)} columns")
+    print(profile.column_summary().to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Synthetic job-posting generator for Cross Platform Job Analytics
+- Produces raw rows with the exact schema written by the Internshala scraper
+- salary_text covers every format salary_parser handles (INR ranges with Indian
+  digit grouping, monthly/daily/hourly rates, LPA/lakh, k, crore, placeholders)
+- Experience strings, relative posting dates, comma-separated skills
+- Cross-combination duplicates (same posting under another category/location)
+  and exact duplicate rows at configurable rates
+- Vectorized and chunked, so 10k-10M rows can be written without live scraping
+"""
+from __future__ import annotations
+import argparse
+import os
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_OUTPUT = os.path.join('data', 'raw', 'synthetic_jobs_dataset.csv')
+
+RAW_COLUMNS = [
+    'job_id', 'source', 'scrape_timestamp', 'category_searched', 'location_searched', 'page_found',
+    'title', 'company', 'job_url', 'location_full', 'city', 'state', 'posting_date_text',
+    'salary_text', 'skills', 'description', 'experience_text', 'job_type',
+    'collection_session', 'collection_date',
+]
+
+CATEGORIES = [
+    "Data Science", "Machine Learning", "Artificial Intelligence (AI)", "Software Development",
+    "Full Stack Development", "Backend Development", "Frontend Development", "Web Development",
+    "Mobile App Development", "Android App Development", "iOS App Development", "Python Development",
+    "Java Development", "JavaScript Development", "React Development", "Angular.js Development",
+    "Node.js Development", "PHP Development", "DevOps", "Cloud Computing", "Database Building",
+    "Network Engineering", "Cyber Security", "Big Data", "Quality Assurance", "Software Testing",
+    "UI/UX Design", "Computer Science", "Programming", "Internet of Things (IoT)", "Computer Vision",
+    "Game Development",
+]
+
+# (city as shown on the card, state, sampling weight)
+CITIES = [
+    ("Chennai", "Tamil Nadu", 20), ("Ahmedabad", "Gujarat", 9), ("Gurgaon", "Haryana", 7), ("Gurugram", "Haryana", 2),
+    ("Indore", "Madhya Pradesh", 5), ("Mumbai", "Maharashtra", 6), ("Noida", "Uttar Pradesh", 5), ("Delhi", "Delhi", 5),
+    ("Pune", "Maharashtra", 4), ("Hyderabad", "Telangana", 3), ("Surat", "Gujarat", 2), ("Bangalore", "Karnataka", 2),
+    ("Bengaluru", "Karnataka", 1), ("Jaipur", "Rajasthan", 2), ("Cochin", "Kerala", 1), ("Coimbatore", "Tamil Nadu", 1),
+    ("Kolkata", "West Bengal", 1), ("Work From Home", None, 3), ("Chandigarh", "Chandigarh", 1), ("Lucknow", "Uttar Pradesh", 1),
+]
+
+SEARCH_LOCATIONS = [
+    "Delhi", "Bangalore", "Mumbai", "Pune", "Hyderabad", "Chennai", "Gurgaon", "Noida", "Kolkata", "Ahmedabad",
+    "Jaipur", "Indore", "Chandigarh", "Kochi", "Bhopal", "Lucknow", "Nagpur", "Surat", "Coimbatore",
+    "Thiruvananthapuram", "Vadodara", "Rajkot",
+]
+
+ROLES = [
+    "Data Scientist", "Data Analyst", "Machine Learning Engineer", "AI Trainer", "Software Engineer",
+    "Full Stack Developer", "Backend Developer", "Frontend Developer", "Web Developer", "Android Developer",
+    "iOS Developer", "Python Developer", "Java Developer", "React Developer", "Node.js Developer",
+    "PHP Developer", "DevOps Engineer", "Cloud Engineer", "Database Administrator", "Network Engineer",
+    "Cyber Security Analyst", "QA Engineer", "Software Tester", "UI/UX Designer", "Game Developer",
+    "Business Analyst", "Technical Support Engineer", "Curriculum Developer", "Performance Test Engineer",
+]
+SENIORITY = ["", "Junior ", "Senior ", "Associate ", "Lead ", "Trainee "]
+
+COMPANY_WORDS = ["Tech", "Soft", "Info", "Data", "Cloud", "Digital", "Solutions", "Labs", "Systems", "Minds",
+                 "Nexus", "Byte", "Logic", "Quantum", "Pixel", "Vertex", "Stirring", "Trojan", "Apex", "Nova"]
+COMPANY_SUFFIXES = [" Private Limited", " Pvt Ltd", " LLP", "", " Technologies", " Inc", " Ltd"]
+
+SKILLS = [
+    "Python", "SQL", "MySQL", "MongoDB", "Java", "JavaScript", "React", "Node.js", "Angular", "PHP", "HTML", "CSS",
+    "Machine Learning", "Deep Learning", "Data Analytics", "Data Science", "Power BI", "Tableau", "MS-Excel",
+    "MS-Office", "AWS", "Azure", "Docker", "Kubernetes", "Linux", "Git", "REST API", "Django", "Flask",
+    "Android", "Kotlin", "Swift", "Flutter", "C++", "C Programming", "Selenium", "Manual Testing",
+    "UI & UX Design", "Figma", "Adobe Photoshop", "Adobe Illustrator", "Video Editing", "CorelDRAW",
+    "English Proficiency (Spoken)", "English Proficiency (Written)", "Effective Communication",
+    "Hindi Proficiency (Spoken)", "Interpersonal Skills", "Sales", "Client Relationship Management (CRM)",
+    "NLP", "Computer Vision", "TensorFlow", "PyTorch", "Golang", "ML", "JS", "Node",
+]
+
+DATE_TEXTS = ["Today", "Just now", "1 day ago", "2 days ago", "3 days ago", "5 days ago", "1 week ago",
+              "2 weeks ago", "3 weeks ago", "1 month ago", "2 months ago"]
+
+JOB_TYPES = [None, "Fresher  Job", "Part time", "Job offer upto ₹ 3LPA post internship", "International"]
+JOB_TYPE_P = [0.80, 0.12, 0.05, 0.02, 0.01]
+
+
+def format_inr(v: int) -> str:
+    """Indian digit grouping: 1500000 -> '15,00,000'."""
+    s = str(int(v))
+    if len(s) <= 3:
+        return s
+    head, tail = s[:-3], s[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    if head:
+        groups.insert(0, head)
+    return ",".join(groups + [tail])
+
+
+def salary_pool(rng: np.random.Generator, size: int = 3000) -> tuple[np.ndarray, np.ndarray]:
+    """Distinct salary strings in every supported format, with Zipf-like frequencies."""
+    texts = []
+    annual = rng.choice(np.arange(1, 41) * 50_000, size=size)
+    for i, lo in enumerate(annual):
+        kind = i % 20
+        hi = int(lo * rng.choice([1.0, 1.25, 1.5, 2.0, 3.0]))
+        if kind < 9:
+            texts.append(f"₹ {format_inr(lo)} - {format_inr(hi)}")
+        elif kind < 11:
+            texts.append(f"₹ {format_inr(lo)}")
+        elif kind < 12:
+            texts.append(f"₹ {format_inr(lo)} /year")
+        elif kind < 14:
+            m = int(lo // 12 // 1000 * 1000) or 5000
+            texts.append(f"₹ {format_inr(m)} /month" if kind == 12 else f"₹{format_inr(m)}-{format_inr(int(m * 1.5))} /month")
+        elif kind == 14:
+            texts.append(f"{lo // 100_000}-{hi // 100_000} LPA")
+        elif kind == 15:
+            texts.append(f"{lo / 100_000:.1f} Lakh" if i % 2 else f"{lo // 100_000} LPA")
+        elif kind == 16:
+            texts.append(f"{int(lo // 12 // 1000)}k /month")
+        elif kind == 17:
+            texts.append(f"Rs. {format_inr(int(lo // 365 // 100 * 100) or 500)} /day" if i % 2 else f"₹ {int(lo // 2112)} /hour")
+        elif kind == 18:
+            texts.append(f"{rng.choice([1, 1.2, 1.5, 2])} crore")
+        else:
+            texts.append(str(rng.choice(["Competitive salary", "Not disclosed", "As per industry standards"])))
+    texts = list(dict.fromkeys(texts))
+    texts.insert(0, "Competitive salary")
+    w = 1.0 / np.arange(1, len(texts) + 1) ** 0.9
+    w[0] = w.sum() * 0.45  # placeholder dominates, as on the live site
+    return np.array(texts, dtype=object), w / w.sum()
+
+
+def _skills_pool(rng: np.random.Generator, size: int) -> np.ndarray:
+    out = np.empty(size, dtype=object)
+    for i in range(size):
+        k = int(rng.integers(1, 9))
+        out[i] = ", ".join(rng.choice(SKILLS, size=k, replace=False))
+    return out
+
+
+def generate_raw_jobs(n: int, dup_rate: float = 0.5, exact_dup_rate: float = 0.02, missing_rate: float = 0.01,
+                      seed: int = 0, session: str = '20250101_000000', collection_date: str = '2025-01-01',
+                      id_offset: int = 0) -> pd.DataFrame:
+    """
+    n raw rows. dup_rate is the share of rows that re-list an earlier posting under
+    another (category, location) search; exact_dup_rate the share of byte-identical rows.
+    """
+    rng = np.random.default_rng(seed)
+    n_exact = int(n * exact_dup_rate)
+    n_rows = n - n_exact
+    n_unique = max(1, int(n_rows * (1 - dup_rate)))
+
+    # Per-posting attributes
+    posting = np.concatenate([np.arange(n_unique), rng.integers(0, n_unique, size=n_rows - n_unique)])
+    rng.shuffle(posting)
+
+    roles = np.array([s + r for s in SENIORITY for r in ROLES], dtype=object)
+    n_companies = max(50, n_unique // 20)
+    comp_pool = np.array([
+        f"{COMPANY_WORDS[i % len(COMPANY_WORDS)]}{COMPANY_WORDS[(i // len(COMPANY_WORDS)) % len(COMPANY_WORDS)].lower()} {i}"
+        f"{COMPANY_SUFFIXES[i % len(COMPANY_SUFFIXES)]}" for i in range(n_companies)], dtype=object)
+    city_names = np.array([c[0] for c in CITIES], dtype=object)
+    city_states = np.array([c[1] for c in CITIES], dtype=object)
+    city_w = np.array([c[2] for c in CITIES], dtype=np.float64)
+    sal_texts, sal_p = salary_pool(rng)
+    skills_pool = _skills_pool(rng, 5000)
+
+    p_title = rng.integers(0, len(roles), n_unique)
+    p_company = np.minimum(rng.zipf(1.6, n_unique) - 1, n_companies - 1)
+    p_city = rng.choice(len(CITIES), size=n_unique, p=city_w / city_w.sum())
+    p_salary = rng.choice(len(sal_texts), size=n_unique, p=sal_p)
+    p_skills = rng.integers(0, len(skills_pool), n_unique)
+    p_exp = rng.choice([0, 1, 1, 1, 2, 3, 4, 4, 5, 6, 7, 8, 10, 12, 15], size=n_unique)
+    p_exp_kind = rng.random(n_unique)
+    p_date = rng.integers(0, len(DATE_TEXTS), n_unique)
+    p_has_date = rng.random(n_unique) < 0.1
+    p_jobtype = rng.choice(len(JOB_TYPES), size=n_unique, p=JOB_TYPE_P)
+    p_has_skills = rng.random(n_unique) < 0.35
+    p_missing = rng.random(n_unique) < missing_rate
+
+    ids = (posting + id_offset).astype(np.int64)
+    title = roles[p_title[posting]]
+    company = comp_pool[p_company[posting]]
+    city = city_names[p_city[posting]]
+    state = city_states[p_city[posting]]
+    has_state = rng.random(n_rows) < 0.35
+    missing = p_missing[posting]
+
+    id_str = pd.Series(ids).astype(str)
+    slug = pd.Series(title).str.lower().str.replace(r'[^a-z0-9]+', '-', regex=True)
+    job_url = ('https://internshala.com/job/detail/' + slug + '-job-at-' + id_str).to_numpy(dtype=object)
+
+    exp_years = p_exp[posting]
+    exp_kind = p_exp_kind[posting]
+    exp_text = (pd.Series(exp_years).astype(str) + ' year(s)').to_numpy(dtype=object)
+    exp_text = np.where(exp_kind < 0.03, '6 months', exp_text)
+    exp_text = np.where((exp_kind >= 0.03) & (exp_kind < 0.05), '1-3 years', exp_text)
+    exp_text = np.where((exp_kind >= 0.05) & (exp_kind < 0.07), 'Fresher', exp_text)
+
+    location_full = np.where(pd.isna(state) | ~has_state, city, pd.Series(city) + ', ' + pd.Series(state).fillna('')).astype(object)
+    date_text = np.where(p_has_date[posting], np.array(DATE_TEXTS, dtype=object)[p_date[posting]], None)
+    skills = np.where(p_has_skills[posting], skills_pool[p_skills[posting]], None)
+    salary = sal_texts[p_salary[posting]]
+    job_type = np.array(JOB_TYPES, dtype=object)[p_jobtype[posting]]
+    description = (pd.Series(title) + ' role at ' + pd.Series(company) + '. Selected candidate will work on ' +
+                   pd.Series(np.array(SKILLS, dtype=object)[posting % len(SKILLS)]) + ' projects and collaborate with the team.').to_numpy(dtype=object)
+
+    df = pd.DataFrame({
+        'job_id': pd.util.hash_array(ids.astype(str).astype(object)).astype(str),
+        'source': 'Internshala',
+        'scrape_timestamp': f"{collection_date}T10:00:00",
+        'category_searched': np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), n_rows)],
+        'location_searched': np.array(SEARCH_LOCATIONS, dtype=object)[rng.integers(0, len(SEARCH_LOCATIONS), n_rows)],
+        'page_found': rng.integers(1, 4, n_rows),
+        'title': title,
+        'company': company,
+        'job_url': job_url,
+        'location_full': np.where(missing, None, location_full),
+        'city': np.where(missing, None, city),
+        'state': np.where(has_state & ~missing, state, None),
+        'posting_date_text': date_text,
+        'salary_text': np.where(missing, None, salary),
+        'skills': skills,
+        'description': description,
+        'experience_text': np.where(missing, None, exp_text),
+        'job_type': job_type,
+        'collection_session': session,
+        'collection_date': collection_date,
+    }, columns=RAW_COLUMNS)
+
+    if n_exact:
+        dups = df.iloc[rng.integers(0, n_rows, n_exact)]
+        df = pd.concat([df, dups], ignore_index=True)
+        df = df.iloc[rng.permutation(len(df))].reset_index(drop=True)
+    return df
+
+
+def iter_raw_job_chunks(n: int, chunk_size: int = 500_000, seed: int = 0, **kwargs) -> Iterator[pd.DataFrame]:
+    """Generate n rows in independent chunks (posting ids do not collide across chunks)."""
+    done = 0
+    i = 0
+    while done < n:
+        size = min(chunk_size, n - done)
+        yield generate_raw_jobs(size, seed=seed + i, id_offset=done, **kwargs)
+        done += size
+        i += 1
+
+
+def write_raw_jobs(path: str, n: int, chunk_size: int = 500_000, seed: int = 0, **kwargs) -> str:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    for i, chunk in enumerate(iter_raw_job_chunks(n, chunk_size=chunk_size, seed=seed, **kwargs)):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic raw jobs dataset with the scraper schema')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--dup-rate', type=float, default=0.5, help='Share of rows re-listing an earlier posting')
+    parser.add_argument('--exact-dup-rate', type=float, default=0.02, help='Share of byte-identical duplicate rows')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=500_000)
+    args = parser.parse_args()
+
+    write_raw_jobs(args.output, args.rows, chunk_size=args.chunk_size, seed=args.seed,
+                   dup_rate=args.dup_rate, exact_dup_rate=args.exact_dup_rate)
+    print(f"Wrote {args.rows} synthetic rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Embedded BM25 full-text index over job titles and descriptions
+- Tokenizer: lowercase alphanumeric runs keeping +, # and inner dots (c++, c#, node.js),
+  minus a short stopword list; title terms count TITLE_WEIGHT times
+- On disk: one immutable segment directory per batch of collection sessions, each with
+  terms sorted for binary search, CSR postings (document ids + term frequencies),
+  document lengths and job_ids as .npy files that are memory-mapped on open
+- Built after cleaning; each new collection session becomes a new segment. A re-scraped
+  job_id tombstones its earlier document in live.npy; segments are merged (dropping
+  tombstones) once there are more than MAX_SEGMENTS
+- Ranking is Okapi BM25 with collection statistics summed over all segments
+
+    python scripts/text_index.py --query "react developer" --top 10
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import re
+import shutil
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from skill_index import compact_strings
+
+DEFAULT_INPUT = os.path.join('data', 'processed', 'cleaned_jobs_dataset.csv')
+DEFAULT_INDEX = os.path.join('data', 'processed', 'text_index')
+
+PARTITION_COL = 'collection_session'
+TEXT_COLUMNS = {'title': 'title_clean', 'description': 'description'}
+TITLE_WEIGHT = 3
+MAX_SEGMENTS = 8
+FORMAT_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+# queries matching more than 1/N of all documents score into dense arrays
+DENSE_ACCUMULATE_SHARE = 16
+
+STOPWORDS = frozenset('a an and are as at be by for from has have in is it of on or our the this that to we will '
+                      'with who you your'.split())
+_token = re.compile(r'[a-z0-9](?:[a-z0-9+#]|\.(?=[a-z0-9]))*')
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _token.findall(text.lower()) if t not in STOPWORDS]
+
+
+def field_terms(series: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (row, term code) for every token occurrence in a text column, plus the column's
+    vocabulary. Each distinct text is tokenized once.
+    """
+    text_codes, texts = pd.factorize(series, use_na_sentinel=True)
+    tokens = pd.Series(texts, dtype=object).astype(str).str.lower().str.findall(_token)
+    term_codes, vocab = pd.factorize(tokens.explode().dropna().to_numpy(dtype=object))
+    # one extra empty entry for missing texts (code -1)
+    lens = np.append(tokens.str.len().to_numpy(dtype=np.int64), 0)
+    starts = np.concatenate([[0], np.cumsum(lens)])
+    row_lens = lens[text_codes]
+    row_ptr = np.concatenate([[0], np.cumsum(row_lens)])
+    gather = np.repeat(starts[text_codes] - row_ptr[:-1], row_lens) + np.arange(row_ptr[-1])
+    rows = np.repeat(np.arange(len(series), dtype=np.int64), row_lens)
+    return rows, term_codes[gather], np.asarray(vocab, dtype=object)
+
+
+def build_postings(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Segment arrays for df: (terms sorted, term_ptr, docs, tf, doc_len).
+    Documents are df's row positions; postings of a term are sorted by document.
+    """
+    n = len(df)
+    row_parts, code_parts, vocab_parts, weight_parts = [], [], [], []
+    offset = 0
+    for field, col in TEXT_COLUMNS.items():
+        if col not in df.columns:
+            col = field
+        if col not in df.columns:
+            continue
+        rows, codes, vocab = field_terms(df[col])
+        row_parts.append(rows)
+        code_parts.append(codes + offset)
+        vocab_parts.append(vocab)
+        weight_parts.append(np.full(len(rows), TITLE_WEIGHT if field == 'title' else 1, dtype=np.int64))
+        offset += len(vocab)
+    if not row_parts:
+        return (np.empty(0, dtype=str), np.zeros(1, np.int64), np.empty(0, np.int32), np.empty(0, np.uint16),
+                np.zeros(n, np.int32))
+    # merge the per-field vocabularies
+    remap, vocab = pd.factorize(np.concatenate(vocab_parts))
+    rows, weights, codes = np.concatenate(row_parts), np.concatenate(weight_parts), remap[np.concatenate(code_parts)]
+    keep = ~pd.Index(vocab).isin(STOPWORDS)[codes]
+    rows, weights, codes = rows[keep], weights[keep], codes[keep]
+    doc_len = np.bincount(rows, weights=weights, minlength=n).astype(np.int32)
+
+    # renumber terms alphabetically so a segment's term array can be binary-searched
+    vocab = np.asarray(vocab, dtype=str)
+    alpha = np.argsort(vocab, kind='stable')
+    rank = np.empty(len(vocab), dtype=np.int64)
+    rank[alpha] = np.arange(len(vocab))
+    keys = rank[codes] * max(n, 1) + rows
+    order = np.argsort(keys, kind='stable')
+    keys, weights = keys[order], weights[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, np.int64)
+    tf = np.add.reduceat(weights, starts) if len(starts) else np.empty(0, np.int64)
+    keys = keys[starts]
+    terms_of = keys // max(n, 1)
+    used = np.unique(terms_of)
+    term_ptr = np.concatenate([[0], np.cumsum(np.bincount(np.searchsorted(used, terms_of), minlength=len(used)))])
+    return (vocab[alpha][used], term_ptr.astype(np.int64), (keys % max(n, 1)).astype(np.int32),
+            np.minimum(tf, np.iinfo(np.uint16).max).astype(np.uint16), doc_len)
+
+
+class Segment:
+    """One immutable, memory-mapped segment; document ids are local to it."""
+
+    FILES = ('terms', 'term_ptr', 'docs', 'tf', 'doc_len', 'job_id')
+
+    def __init__(self, path: str):
+        self.path = path
+        for name in self.FILES:
+            setattr(self, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+
+    @property
+    def docs_count(self) -> int:
+        return len(self.doc_len)
+
+    @staticmethod
+    def write(path: str, terms: np.ndarray, term_ptr: np.ndarray, docs: np.ndarray, tf: np.ndarray,
+              doc_len: np.ndarray, job_ids: np.ndarray):
+        tmp = path + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        arrays = {'terms': terms, 'term_ptr': term_ptr, 'docs': docs, 'tf': tf, 'doc_len': doc_len,
+                  'job_id': compact_strings(job_ids)}
+        for name, arr in arrays.items():
+            np.save(os.path.join(tmp, f'{name}.npy'), arr)
+        # a crash after an earlier write but before its manifest commit leaves this name
+        # behind unreferenced (next_segment was not advanced); it is safe to drop
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        i = int(np.searchsorted(self.terms, term))
+        if i < len(self.terms) and self.terms[i] == term:
+            lo, hi = self.term_ptr[i], self.term_ptr[i + 1]
+            return self.docs[lo:hi], self.tf[lo:hi]
+        return self.docs[:0], self.tf[:0]
+
+    def pairs(self, vocab: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(term id in the sorted `vocab`, doc, tf) per posting: the segment in flat form, for merging."""
+        codes = np.searchsorted(vocab, np.asarray(self.terms)).astype(np.int32)
+        return np.repeat(codes, np.diff(self.term_ptr)), np.asarray(self.docs), np.asarray(self.tf)
+
+
+class TextIndex:
+    """
+    Segmented BM25 index under `root`. manifest.json lists the segments in order (global
+    document id = segment base + local id) and the indexed partitions; live.npy marks
+    documents that have not been replaced.
+    """
+
+    def __init__(self, root: str = DEFAULT_INDEX):
+        self.root = root
+        self.manifest = {'format_version': FORMAT_VERSION, 'title_weight': TITLE_WEIGHT, 'next_segment': 1,
+                         'segments': [], 'partitions': []}
+        path = os.path.join(root, 'manifest.json')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('format_version') != FORMAT_VERSION or manifest.get('title_weight') != TITLE_WEIGHT:
+                raise ValueError(f"Text index layout in {root} does not match this version; rebuild it")
+            self.manifest = manifest
+        self.segments = [Segment(os.path.join(root, s['name'])) for s in self.manifest['segments']]
+        live_path = os.path.join(root, 'live.npy')
+        self.live = np.load(live_path) if self.segments else np.empty(0, dtype=bool)
+        self._bases()
+
+    def _bases(self):
+        sizes = [s.docs_count for s in self.segments]
+        self.bases = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    @property
+    def partitions(self) -> List[str]:
+        return self.manifest['partitions']
+
+    @property
+    def docs(self) -> int:
+        return int(self.bases[-1])
+
+    @property
+    def live_docs(self) -> int:
+        return int(self.live.sum())
+
+    # ------------------------------------------------------------------
+    # Building / incremental maintenance
+    # ------------------------------------------------------------------
+    def update(self, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> List[str]:
+        """
+        Index rows of partitions not yet in the index as a new segment. Without a
+        partition column the index is rebuilt from df. Returns the partitions added.
+        """
+        if partition_col not in df.columns:
+            self.clear()
+            self._add_segment(df)
+            self._commit()
+            return []
+        parts = df[partition_col].astype(str)
+        new_parts = [p for p in pd.unique(parts) if p not in self.partitions]
+        if new_parts:
+            self._add_segment(df[parts.isin(new_parts)])
+            self.manifest['partitions'].extend(new_parts)
+            if len(self.segments) > MAX_SEGMENTS:
+                self._merge()
+            self._commit()
+        return new_parts
+
+    def clear(self):
+        for seg in self.segments:
+            shutil.rmtree(seg.path, ignore_errors=True)
+        self.segments, self.live = [], np.empty(0, dtype=bool)
+        self.manifest.update(segments=[], partitions=[])
+        self._bases()
+
+    def _job_ids(self) -> np.ndarray:
+        if not self.segments:
+            return np.empty(0, dtype=object)
+        return np.concatenate([np.asarray(s.job_id).astype(str) for s in self.segments]).astype(object)
+
+    def _add_segment(self, df: pd.DataFrame):
+        n = len(df)
+        job_ids = df['job_id'].astype(str).to_numpy(dtype=object) if 'job_id' in df.columns else \
+            np.array([str(self.docs + i) for i in range(n)], dtype=object)
+        if self.docs:
+            live_docs = np.flatnonzero(self.live)
+            old = pd.Index(self._job_ids()[live_docs]).get_indexer(job_ids)
+            self.live[live_docs[old[old >= 0]]] = False
+        last = ~pd.Series(job_ids).duplicated(keep='last').to_numpy()
+
+        name = f"seg_{self.manifest['next_segment']:05d}"
+        self.manifest['next_segment'] += 1
+        path = os.path.join(self.root, name)
+        os.makedirs(self.root, exist_ok=True)
+        Segment.write(path, *build_postings(df.reset_index(drop=True)), job_ids)
+        self.segments.append(Segment(path))
+        self.manifest['segments'].append({'name': name, 'docs': n})
+        self.live = np.concatenate([self.live, last])
+        self._bases()
+
+    def _merge(self):
+        """Merge every segment into one, dropping tombstoned documents."""
+        vocab = np.unique(np.concatenate([np.asarray(s.terms) for s in self.segments]))
+        code_parts, doc_parts, tf_parts = [], [], []
+        new_id = (np.cumsum(self.live) - 1).astype(np.int32)
+        for seg, base in zip(self.segments, self.bases[:-1]):
+            codes, docs, tf = seg.pairs(vocab)
+            keep = self.live[base + docs]
+            code_parts.append(codes[keep])
+            doc_parts.append(new_id[base + docs[keep]])
+            tf_parts.append(tf[keep])
+        codes, docs, tf = np.concatenate(code_parts), np.concatenate(doc_parts), np.concatenate(tf_parts)
+        n = self.live_docs
+        order = np.lexsort((docs, codes))
+        codes, docs, tf = codes[order], docs[order], tf[order]
+        counts = np.bincount(codes, minlength=len(vocab))
+        # terms that only occurred in dropped documents
+        used = counts > 0
+        vocab, counts = vocab[used], counts[used]
+        term_ptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        doc_len = np.concatenate([np.asarray(s.doc_len) for s in self.segments])[self.live]
+        job_ids = self._job_ids()[self.live]
+
+        old = list(self.segments)
+        name = f"seg_{self.manifest['next_segment']:05d}"
+        self.manifest['next_segment'] += 1
+        Segment.write(os.path.join(self.root, name), vocab, term_ptr, docs.astype(np.int32), tf, doc_len, job_ids)
+        self.segments = [Segment(os.path.join(self.root, name))]
+        self.manifest['segments'] = [{'name': name, 'docs': n}]
+        self.live = np.ones(n, dtype=bool)
+        self._bases()
+        self._commit()
+        for seg in old:
+            shutil.rmtree(seg.path, ignore_errors=True)
+
+    def optimize(self):
+        """Merge all segments now (e.g. after a large backfill)."""
+        if len(self.segments) > 1 or (self.docs and not self.live.all()):
+            self._merge()
+
+    def _commit(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, 'live.tmp.npy')
+        np.save(tmp, self.live)
+        os.replace(tmp, os.path.join(self.root, 'live.npy'))
+        tmp = os.path.join(self.root, 'manifest.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.root, 'manifest.json'))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _length_norms(self) -> List[np.ndarray]:
+        """Per segment, the BM25 length normalization k1 * (1 - b + b * dl / avgdl) of each document."""
+        key = tuple(s.path for s in self.segments)
+        if getattr(self, '_norms_key', None) != key:
+            lengths = [np.asarray(s.doc_len, dtype=np.float64) for s in self.segments]
+            avgdl = sum(float(dl.sum()) for dl in lengths) / max(self.docs, 1)
+            self._norms = [BM25_K1 * (1.0 - BM25_B + BM25_B * dl / avgdl) for dl in lengths]
+            self._norms_key = key
+        return self._norms
+
+    def search(self, query: str, top: int = 10, require_all: bool = False) -> pd.DataFrame:
+        """
+        BM25-ranked live documents matching any query term (all terms with require_all).
+        Document frequencies include tombstoned documents until the next merge.
+        Returns job_id and score, best first.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        empty = pd.DataFrame({'job_id': pd.Series(dtype=object), 'score': pd.Series(dtype=np.float64)})
+        if not terms or not self.docs:
+            return empty
+        norms = self._length_norms()
+        doc_parts, score_parts = [], []
+        for term in terms:
+            hits = [(norm, base, *seg.postings(term)) for seg, norm, base in zip(self.segments, norms, self.bases[:-1])]
+            df_t = sum(len(d) for _, _, d, _ in hits)
+            if not df_t:
+                if require_all:
+                    return empty
+                continue
+            idf = np.log(1.0 + (self.docs - df_t + 0.5) / (df_t + 0.5))
+            for norm, base, docs, tf in hits:
+                if not len(docs):
+                    continue
+                tf = tf.astype(np.float64)
+                doc_parts.append(base + docs.astype(np.int64))
+                score_parts.append(idf * (BM25_K1 + 1.0) * tf / (tf + norm[docs]))
+        if not doc_parts:
+            return empty
+        if sum(len(d) for d in doc_parts) > self.docs // DENSE_ACCUMULATE_SHARE:
+            # common terms: accumulate into dense per-document arrays instead of sorting postings
+            # (document ids are unique within one term's postings, so fancy-index += is exact)
+            acc = np.zeros(self.docs)
+            hits_per_doc = np.zeros(self.docs, dtype=np.int16)
+            for d, sc in zip(doc_parts, score_parts):
+                acc[d] += sc
+                hits_per_doc[d] += 1
+            docs = np.flatnonzero(hits_per_doc)
+            scores, matched = acc[docs], hits_per_doc[docs]
+        else:
+            docs, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+            matched = np.bincount(inverse, minlength=len(docs))
+        keep = self.live[docs]
+        if require_all:
+            keep &= matched == len(terms)
+        docs, scores = docs[keep], scores[keep]
+        if len(docs) > top:
+            # everything tied with the k-th score stays a candidate, so ties break by document id
+            kth = np.partition(scores, len(scores) - top)[len(scores) - top]
+            docs, scores = docs[scores >= kth], scores[scores >= kth]
+        order = np.lexsort((docs, -scores))[:top]
+        docs, scores = docs[order], scores[order]
+        return pd.DataFrame({'job_id': self._doc_job_ids(docs), 'score': scores})
+
+    def _doc_job_ids(self, docs: np.ndarray) -> np.ndarray:
+        seg_of = np.searchsorted(self.bases, docs, side='right') - 1
+        out = np.empty(len(docs), dtype=object)
+        for i, (s, d) in enumerate(zip(seg_of, docs)):
+            value = self.segments[s].job_id[d - self.bases[s]]
+            out[i] = value.decode() if isinstance(value, bytes) else str(value)
+        return out
+
+
+def load_or_build(root: str, df: pd.DataFrame, partition_col: str = PARTITION_COL) -> tuple[TextIndex, List[str]]:
+    """Open the index at root (if compatible) and add new partitions of df as a segment."""
+    try:
+        index = TextIndex(root)
+    except (ValueError, KeyError, OSError) as e:
+        print(f"Rebuilding text index: {e}")
+        shutil.rmtree(root, ignore_errors=True)
+        index = TextIndex(root)
+    added = index.update(df, partition_col)
+    return index, added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build/update and query the BM25 title/description index')
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='Cleaned dataset (CSV or Parquet); skipped if missing')
+    parser.add_argument('--index', default=DEFAULT_INDEX)
+    parser.add_argument('--rebuild', action='store_true', help='Discard the stored index before ingesting')
+    parser.add_argument('--optimize', action='store_true', help='Merge all segments and drop replaced documents')
+    parser.add_argument('--query', default=None)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--all', action='store_true', help='Only documents containing every query term')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        shutil.rmtree(args.index, ignore_errors=True)
+    if os.path.exists(args.input):
+        df = pd.read_parquet(args.input) if args.input.endswith('.parquet') else pd.read_csv(args.input)
+        index, added = load_or_build(args.index, df)
+        print(f"Text index: {index.live_docs:,} jobs in {len(index.segments)} segment(s), "
+              f"partitions added: {len(added)} (total {len(index.partitions)})")
+    else:
+        index = TextIndex(args.index)
+    if args.optimize:
+        index.optimize()
+        print(f"Optimized: {index.live_docs:,} jobs in {len(index.segments)} segment(s)")
+    if args.query:
+        print(index.search(args.query, args.top, args.all).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Yield-driven scheduling of the category × location search grid
+- CombinationYield: persisted per-combination history (requests, new jobs, empty runs),
+  decayed so recent runs weigh more
+- plan(): orders combinations by expected new jobs per request, skips historically
+  empty ones (re-sampling a share of them so they can recover), and cuts the list
+  to a request budget
+- Updated from the per-combination stats the scraper returns in df.attrs['combination_stats']
+
+    python src/scraping/combo_scheduler.py --show 20
+"""
+import argparse
+import json
+import os
+import random
+from datetime import datetime
+
+DEFAULT_YIELD_TABLE = os.path.join('data', 'raw', 'combination_yield.json')
+
+
+def combo_key(category, location):
+    return f"{category}|{location}"
+
+
+class CombinationYield:
+    """
+    Per-combination yield history.
+
+    decay: weight kept by the previous history on each update (0.7 = last run ~30%)
+    prior_weight: pseudo-requests of the table-wide mean blended into every estimate
+    """
+
+    def __init__(self, path=DEFAULT_YIELD_TABLE, decay=0.7, prior_weight=1.0):
+        self.path = path
+        self.decay = decay
+        self.prior_weight = prior_weight
+        self.entries = {}
+        self.runs = 0
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.entries = data.get('combinations', {})
+            self.runs = data.get('runs', 0)
+
+    def mean_yield(self):
+        requests = sum(e['requests'] for e in self.entries.values())
+        new_jobs = sum(e['new_jobs'] for e in self.entries.values())
+        return new_jobs / requests if requests else None
+
+    def estimate(self, category, location, prior=None):
+        """Expected new jobs per request; unseen combinations get the prior (table mean)."""
+        prior = self.mean_yield() if prior is None else prior
+        prior = prior if prior is not None else 1.0
+        e = self.entries.get(combo_key(category, location))
+        if e is None:
+            return prior
+        return (e['new_jobs'] + self.prior_weight * prior) / (e['requests'] + self.prior_weight)
+
+    def pages_per_visit(self, category, location, default=1.0):
+        e = self.entries.get(combo_key(category, location))
+        return e['requests'] / e['visits'] if e and e.get('visits') else default
+
+    def plan(self, combinations, budget=None, skip_empty_after=2, sample_empty=0.2, seed=None):
+        """
+        Order combinations for a run.
+
+        Combinations empty in their last `skip_empty_after` visits are skipped, except a
+        random `sample_empty` share. With a request budget, combinations are taken in
+        yield order while their expected pages fit.
+        Returns (ordered combinations, skipped combinations).
+        """
+        rng = random.Random(seed)
+        prior = self.mean_yield()
+        candidates, skipped = [], []
+        for category, location in combinations:
+            e = self.entries.get(combo_key(category, location))
+            if e and e.get('empty_streak', 0) >= skip_empty_after and rng.random() >= sample_empty:
+                skipped.append((category, location))
+            else:
+                candidates.append((category, location))
+        candidates.sort(key=lambda c: self.estimate(c[0], c[1], prior), reverse=True)
+
+        if budget is None:
+            return candidates, skipped
+        planned, spent = [], 0.0
+        for category, location in candidates:
+            cost = max(1.0, self.pages_per_visit(category, location))
+            if spent + cost > budget and planned:
+                skipped.append((category, location))
+                continue
+            planned.append((category, location))
+            spent += cost
+        return planned, skipped
+
+    def update(self, combination_stats, run_id=None):
+        """
+        Fold one run's stats (dicts with category, location, requests, fetched, new_jobs, jobs)
+        into the table. A combination only counts as empty when a page was actually fetched;
+        if every request was throttled or dead-lettered its empty streak is left as it was.
+        """
+        run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        for s in combination_stats:
+            if not s.get('requests'):
+                continue
+            key = combo_key(s['category'], s['location'])
+            e = self.entries.get(key)
+            if e is None:
+                e = self.entries[key] = {'category': s['category'], 'location': s['location'], 'requests': 0.0,
+                                         'new_jobs': 0.0, 'jobs': 0.0, 'visits': 0.0, 'empty_streak': 0}
+            for field, value in (('requests', s['requests']), ('new_jobs', s['new_jobs']),
+                                 ('jobs', s['jobs']), ('visits', 1)):
+                e[field] = e[field] * self.decay + value
+            if s.get('fetched', s['requests']):
+                e['empty_streak'] = e['empty_streak'] + 1 if s['jobs'] == 0 else 0
+            e['last_run'] = run_id
+        self.runs += 1
+
+    def save(self, path=None):
+        path = path or self.path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'runs': self.runs, 'updated': datetime.now().isoformat(timespec='seconds'),
+                       'combinations': self.entries}, f, indent=2)
+        return path
+
+    def report_lines(self, top=10):
+        prior = self.mean_yield()
+        ranked = sorted(self.entries.values(), key=lambda e: self.estimate(e['category'], e['location'], prior), reverse=True)
+        empty = sum(1 for e in ranked if e.get('empty_streak', 0) > 0)
+        lines = [f"Combination yield table: {len(ranked)} combinations over {self.runs} run(s), "
+                 f"mean {prior or 0:.2f} new jobs/request, {empty} empty in their last run"]
+        for e in ranked[:top]:
+            est = self.estimate(e['category'], e['location'], prior)
+            lines.append(f"   {e['category']} in {e['location']}: {est:.2f} new jobs/request "
+                         f"({e['new_jobs']:.0f} new / {e['requests']:.0f} requests, decayed)")
+        return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the persisted category × location yield table')
+    parser.add_argument('--table', default=DEFAULT_YIELD_TABLE)
+    parser.add_argument('--show', type=int, default=20, help='Number of top combinations to list')
+    args = parser.parse_args()
+
+    table = CombinationYield(args.table)
+    if not table.entries:
+        print(f"No yield history at {args.table}")
+        return
+    print("\n".join(table.report_lines(args.show)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+Optional detail-page enrichment for scraped postings
+- Fetches job_url detail pages only for job_ids not already in the details store,
+  so cost scales with new postings rather than total postings
+- Bounded thread pool sharing one AdaptiveRateController (retries, 429 backoff)
+- On-disk gzip response cache keyed by URL with a TTL, so re-runs and retries
+  within the TTL never hit the network
+- Parsed fields (full description, openings, perks, skills, start date) are kept in
+  data/raw/job_details.csv and merged into the raw dataset by job_id
+"""
+import gzip
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+try:
+    from scraping.rate_control import AdaptiveRateController, FetchFailed, fetch_with_retries
+except ImportError:  # run as a script from src/scraping
+    from rate_control import AdaptiveRateController, FetchFailed, fetch_with_retries
+
+DEFAULT_CACHE_DIR = os.path.join('data', 'cache', 'detail_pages')
+DEFAULT_DETAILS_STORE = os.path.join('data', 'raw', 'job_details.csv')
+DEFAULT_TTL = 7 * 24 * 3600
+
+DETAIL_COLUMNS = ['job_id', 'description_full', 'openings', 'perks', 'skills_full', 'start_date_text', 'enriched_at']
+
+# Section heading (lowercased prefix) -> output column
+SECTIONS = {
+    'about the job': 'description_full',
+    'skill(s) required': 'skills_full',
+    'skills required': 'skills_full',
+    'perks': 'perks',
+    'number of openings': 'openings',
+}
+
+
+class ResponseCache:
+    """Gzip-compressed page bodies under cache_dir, one file per URL, expired by mtime."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + '.html.gz')
+
+    def get(self, url):
+        path = self._path(url)
+        try:
+            fresh = self.ttl is None or (time.time() - os.path.getmtime(path)) <= self.ttl
+            if fresh:
+                with gzip.open(path, 'rb') as f:
+                    body = f.read()
+                with self._lock:
+                    self.hits += 1
+                return body
+        except OSError:
+            pass
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, url, body):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, 'wb', compresslevel=6) as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+
+def parse_detail_page(html):
+    """Detail page -> dict of DETAIL_COLUMNS fields (without job_id / enriched_at)."""
+    soup = BeautifulSoup(html, "html.parser")
+    out = {c: None for c in DETAIL_COLUMNS[1:-1]}
+    for heading in soup.select(".section_heading"):
+        title = heading.get_text(" ", strip=True).lower()
+        column = next((col for prefix, col in SECTIONS.items() if title.startswith(prefix)), None)
+        if column is None or out[column] is not None:
+            continue
+        body = heading.find_next_sibling()
+        if body is None:
+            continue
+        tabs = body.select(".round_tabs")
+        if tabs:
+            out[column] = ", ".join(t.get_text(strip=True) for t in tabs)
+        else:
+            out[column] = body.get_text(" ", strip=True) or None
+    start = soup.select_one("#start-date-first")
+    if start is not None:
+        out['start_date_text'] = start.get_text(" ", strip=True) or None
+    if out['openings'] is not None:
+        digits = ''.join(ch for ch in out['openings'] if ch.isdigit())
+        out['openings'] = int(digits) if digits else None
+    return out
+
+
+def detail_url(job_url, base_url=None):
+    """job_url, re-rooted at base_url (e.g. a fixture replay server) when given."""
+    if not base_url:
+        return job_url
+    parts = urlsplit(job_url)
+    return base_url.rstrip('/') + parts.path + (f"?{parts.query}" if parts.query else '')
+
+
+def load_details(path=DEFAULT_DETAILS_STORE):
+    if path and os.path.exists(path):
+        return pd.read_csv(path, dtype={'job_id': str})
+    return pd.DataFrame(columns=DETAIL_COLUMNS)
+
+
+def fetch_details(jobs, workers=4, cache=None, base_url=None, delay=0.5, max_retries=3, metrics=None):
+    """
+    Fetch and parse detail pages for (job_id, job_url) pairs with a bounded pool.
+    Returns (details DataFrame, list of failed {job_id, url, reason}).
+    """
+    cache = cache or ResponseCache()
+    controller = AdaptiveRateController(initial_rate=(1.0 / delay) if delay > 0 else float('inf'),
+                                        max_concurrency=workers)
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    }
+    local = threading.local()
+    failures = []
+    lock = threading.Lock()
+
+    def work(item):
+        job_id, job_url = item
+        url = detail_url(job_url, base_url)
+        body = cache.get(job_url)
+        if body is None:
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            try:
+                response, _ = fetch_with_retries(local.session, url, controller, headers=headers,
+                                                 max_retries=max_retries, metrics=metrics)
+            except FetchFailed as e:
+                with lock:
+                    failures.append({'job_id': job_id, 'url': url, 'reason': str(e)})
+                return None
+            body = response.content
+            cache.put(job_url, body)
+        row = parse_detail_page(body)
+        row['job_id'] = job_id
+        row['enriched_at'] = datetime.now().isoformat(timespec='seconds')
+        return row
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        rows = [r for r in pool.map(work, jobs) if r is not None]
+    if metrics is not None:
+        metrics.incr('detail_cache_hits', cache.hits)
+        metrics.incr('detail_fetch_failures', len(failures))
+    return pd.DataFrame(rows, columns=DETAIL_COLUMNS), failures
+
+
+def enrich_jobs(df, store_path=DEFAULT_DETAILS_STORE, workers=4, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL,
+                base_url=None, delay=0.5, max_retries=3, metrics=None):
+    """
+    Merge detail fields into df by job_id, fetching only job_ids missing from the store.
+    The store is updated in place; returns the merged DataFrame.
+    """
+    details = load_details(store_path)
+    known = set(details['job_id'].astype(str))
+    todo = df.loc[df['job_url'].notna() & ~df['job_id'].astype(str).isin(known), ['job_id', 'job_url']]
+    todo = todo.drop_duplicates('job_id')
+    print(f"🔎 Detail enrichment: {len(todo):,} new posting(s), {len(known):,} already enriched")
+
+    if len(todo):
+        start = time.perf_counter()
+        cache = ResponseCache(cache_dir, ttl)
+        fetched, failures = fetch_details(list(todo.itertuples(index=False, name=None)), workers=workers, cache=cache,
+                                          base_url=base_url, delay=delay, max_retries=max_retries, metrics=metrics)
+        print(f"   Enriched {len(fetched):,} in {time.perf_counter() - start:.1f}s "
+              f"(cache hits {cache.hits:,}, failures {len(failures):,})")
+        if len(fetched):
+            details = fetched if details.empty else pd.concat([details, fetched], ignore_index=True)
+            details = details.drop_duplicates('job_id', keep='last')
+            os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+            details.to_csv(store_path, index=False)
+
+    merged = df.drop(columns=[c for c in DETAIL_COLUMNS[1:] if c in df.columns])
+    merged = merged.merge(details, on='job_id', how='left')
+    merged.attrs = df.attrs
+    return merged
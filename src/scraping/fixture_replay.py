@@ -0,0 +1,304 @@
+"""
+Offline fixtures for the Internshala scraper
+- FixtureArchive: zip of listing pages keyed by URL path + query
+- record_fixtures: capture live listing pages into an archive
+- synthesize_fixtures: build an archive from job rows (e.g. scripts/synthetic_jobs.py)
+  using the same markup the scraper parses
+- ReplayServer: local HTTP server replaying an archive with configurable latency,
+  error rate and 429 responses (with Retry-After), for reproducible scraper runs
+
+    python src/scraping/fixture_replay.py record --archive fixtures/internshala.zip --categories "Data Science"
+    python src/scraping/fixture_replay.py serve --archive fixtures/internshala.zip --port 8765 --latency 0.05
+"""
+import argparse
+import html
+import os
+import random
+import sys
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping.internshala_optimized import SITE_URL, listing_url
+
+EMPTY_LISTING = "<html><body><div id=\"internship_list_container\"></div></body></html>"
+
+
+def fixture_key(url):
+    """Archive member name for a URL: path + query, independent of host."""
+    parts = urlsplit(url)
+    key = parts.path.strip('/') or 'index'
+    if parts.query:
+        key += '__' + parts.query.replace('&', '__').replace('=', '-')
+    return key + '.html'
+
+
+class FixtureArchive:
+    """Listing pages stored as deflate-compressed members of a zip file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._pages = None
+
+    def write(self, pages):
+        """pages: iterable of (url, html) pairs; replaces the archive."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        count = 0
+        with zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for url, body in pages:
+                zf.writestr(fixture_key(url), body)
+                count += 1
+        self._pages = None
+        return count
+
+    def load(self):
+        """All pages decompressed into memory (key -> bytes)."""
+        if self._pages is None:
+            with zipfile.ZipFile(self.path, 'r') as zf:
+                self._pages = {name: zf.read(name) for name in zf.namelist()}
+        return self._pages
+
+    def get(self, url):
+        return self.load().get(fixture_key(url))
+
+    def __len__(self):
+        return len(self.load())
+
+
+def record_fixtures(archive_path, categories, locations, max_pages=3, delay=1.5, base_url=SITE_URL):
+    """Fetch listing pages from the live site (stopping at the first page without cards) into an archive."""
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    }
+
+    def pages():
+        for category in categories:
+            for location in locations:
+                for page in range(1, max_pages + 1):
+                    url = listing_url(category, location, page, base_url)
+                    try:
+                        response = requests.get(url, headers=headers, timeout=15)
+                        response.raise_for_status()
+                    except requests.exceptions.RequestException as e:
+                        print(f"❌ {url}: {e}")
+                        break
+                    yield url, response.content
+                    time.sleep(delay)
+                    if b'individual_internship' not in response.content:
+                        break
+
+    count = FixtureArchive(archive_path).write(pages())
+    print(f"Recorded {count} pages to {archive_path}")
+    return count
+
+
+def _text(value):
+    return html.escape(str(value)) if isinstance(value, str) and value else ''
+
+
+def render_job_card(job):
+    """One listing card in the markup scrape_internshala_optimized parses."""
+    url = job.get('job_url') or ''
+    href = url[len(SITE_URL):] if url.startswith(SITE_URL) else url
+    locations = ''.join(f'<a href="#">{html.escape(p.strip())}</a>'
+                        for p in str(job.get('location_full') or '').split(',') if p.strip())
+    parts = [
+        '<div class="individual_internship">',
+        f'<a class="job-title-href" href="{html.escape(href)}">{_text(job.get("title"))}</a>',
+        f'<p class="company-name">{_text(job.get("company"))}</p>',
+        f'<p class="row-1-item locations">{locations}</p>',
+        f'<div class="row-1-item"><i class="ic-16-briefcase"></i><span>{_text(job.get("experience_text"))}</span></div>',
+    ]
+    if isinstance(job.get('salary_text'), str):
+        parts.append(f'<div class="row-1-item"><i class="ic-16-money"></i><span class="desktop">{_text(job["salary_text"])}</span></div>')
+    if isinstance(job.get('posting_date_text'), str):
+        parts.append(f'<div class="status-info"><span>{_text(job["posting_date_text"])}</span></div>')
+    if isinstance(job.get('skills'), str):
+        skills = ''.join(f'<div class="job_skill">{html.escape(s.strip())}</div>' for s in job['skills'].split(','))
+        parts.append(f'<div class="job_skills">{skills}</div>')
+    if isinstance(job.get('description'), str):
+        parts.append(f'<div class="about_job"><div class="text">{_text(job["description"])}</div></div>')
+    if isinstance(job.get('job_type'), str):
+        parts.append(f'<div class="gray-labels"><span>{_text(job["job_type"])}</span></div>')
+    parts.append('</div>')
+    return ''.join(parts)
+
+
+def render_listing_page(jobs):
+    cards = '\n'.join(render_job_card(j) for j in jobs)
+    return f'<html><body><div id="internship_list_container">\n{cards}\n</div></body></html>'
+
+
+def render_detail_page(job):
+    """Detail page with the section markup detail_enrichment.parse_detail_page reads."""
+    perks = ["Certificate", "Flexible work hours", "5 days a week", "Health Insurance"]
+    n = sum(map(ord, str(job.get('job_url') or ''))) % 10
+    sections = [
+        ('About the job', f'<div class="text-container">{_text(job.get("description"))} '
+                          f'Full responsibilities are listed for the {_text(job.get("title"))} role.</div>'),
+        ('Skill(s) required', '<div class="round_tabs_container">' + ''.join(
+            f'<span class="round_tabs">{html.escape(s.strip())}</span>'
+            for s in str(job.get('skills') or '').split(',') if s.strip()) + '</div>'),
+        ('Perks', '<div class="round_tabs_container">' + ''.join(
+            f'<span class="round_tabs">{p}</span>' for p in perks[:1 + n % len(perks)]) + '</div>'),
+        ('Number of openings', f'<div class="text-container">{1 + n}</div>'),
+    ]
+    body = ''.join(f'<div class="section_heading heading_5_5">{title}</div>{content}' for title, content in sections)
+    return (f'<html><body><div class="detail_view"><div id="start-date-first">Immediately</div>'
+            f'{body}</div></body></html>')
+
+
+def synthesize_fixtures(archive_path, jobs, categories, locations, pages=3, jobs_per_page=20, details=False):
+    """
+    Archive of listing pages built from job dicts: each (category, location) gets `pages`
+    pages of `jobs_per_page` cards, drawn round-robin from `jobs`. details=True also
+    stores a detail page per job_url.
+    """
+    def gen():
+        i = 0
+        for category in categories:
+            for location in locations:
+                for page in range(1, pages + 1):
+                    chunk = [jobs[(i + k) % len(jobs)] for k in range(jobs_per_page)]
+                    i += jobs_per_page
+                    yield listing_url(category, location, page), render_listing_page(chunk).encode('utf-8')
+        if details:
+            for job in {j['job_url']: j for j in jobs if j.get('job_url')}.values():
+                yield job['job_url'], render_detail_page(job).encode('utf-8')
+
+    return FixtureArchive(archive_path).write(gen())
+
+
+class ReplayServer:
+    """
+    Threaded local HTTP server answering listing requests from a FixtureArchive.
+    Unknown /jobs/ pages get an empty listing (the scraper's end of pagination).
+
+    latency: base delay per response (seconds), plus uniform jitter in [0, jitter]
+    error_rate: share of requests answered with 503
+    rate_429: share of requests answered with 429 and a Retry-After header
+    """
+
+    def __init__(self, archive, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, rate_429=0.0, retry_after=1, seed=0):
+        self.archive = archive if isinstance(archive, FixtureArchive) else FixtureArchive(archive)
+        self.pages = self.archive.load()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.status_counts = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self):
+        with self._lock:
+            return self._rng.random(), self._rng.random()
+
+    def _count(self, status):
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                roll, jitter = server._draw()
+                time.sleep(server.latency + jitter * server.jitter)
+                if roll < server.rate_429:
+                    self._send(429, b'Too Many Requests', {'Retry-After': str(server.retry_after)})
+                elif roll < server.rate_429 + server.error_rate:
+                    self._send(503, b'Service Unavailable')
+                else:
+                    body = server.pages.get(fixture_key(self.path))
+                    if body is None and not self.path.startswith('/jobs/'):
+                        self._send(404, b'Not Found')
+                    else:
+                        self._send(200, body if body is not None else EMPTY_LISTING.encode('utf-8'))
+
+            def _send(self, status, body, headers=None):
+                server._count(status)
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fixture-replay', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record Internshala listing fixtures or replay them locally')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='Capture live listing pages into a fixture archive')
+    rec.add_argument('--archive', required=True)
+    rec.add_argument('--categories', nargs='+', default=["Data Science", "Software Development"])
+    rec.add_argument('--locations', nargs='+', default=["Delhi", "Bangalore"])
+    rec.add_argument('--max-pages', type=int, default=3)
+    rec.add_argument('--delay', type=float, default=1.5)
+
+    srv = sub.add_parser('serve', help='Replay a fixture archive over HTTP')
+    srv.add_argument('--archive', required=True)
+    srv.add_argument('--host', default='127.0.0.1')
+    srv.add_argument('--port', type=int, default=8765)
+    srv.add_argument('--latency', type=float, default=0.0)
+    srv.add_argument('--jitter', type=float, default=0.0)
+    srv.add_argument('--error-rate', type=float, default=0.0)
+    srv.add_argument('--rate-429', type=float, default=0.0)
+    srv.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_fixtures(args.archive, args.categories, args.locations, args.max_pages, args.delay)
+        return
+
+    server = ReplayServer(args.archive, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, rate_429=args.rate_429, retry_after=args.retry_after)
+    print(f"Replaying {len(server.pages)} pages at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(f"Responses by status: {server.status_counts}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,139 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
 from datetime import datetime
 import hashlib
+from urllib.parse import urlsplit
+import json
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def scrape_internshala_optimized(categories=None, locations=None, max_pages=10, delay=1.5):
+try:
+    from scraping.job_records import RAW_JOB_COLUMNS, ColumnBatch
+    from scraping.rate_control import RETRY_STATUSES, AdaptiveRateController, FetchFailed, fetch_with_retries
+except ImportError:  # run as a script from src/scraping
+    from job_records import RAW_JOB_COLUMNS, ColumnBatch
+    from rate_control import RETRY_STATUSES, AdaptiveRateController, FetchFailed, fetch_with_retries
+
+SITE_URL = "https://internshala.com"
+HIT_COLUMNS = ['job_id', 'category_searched', 'location_searched', 'page_found', 'scrape_timestamp']
+
+def listing_url(category, location, page, base_url=SITE_URL):
+    """Listing page URL for a (category, location) search"""
+    category_clean = category.lower().replace(' ', '-').replace('(', '').replace(')', '').replace('/', '-').replace('.', '')
+    location_clean = location.lower().replace(' ', '-')
+    return f"{base_url.rstrip('/')}/jobs/{category_clean}-jobs-in-{location_clean}?page={page}"
+
+def listing_cards(html):
+    """Job cards on a listing page"""
+    return BeautifulSoup(html, "html.parser").select("div.individual_internship")
+
+def posting_key(card):
+    """
+    Global posting identity: the job-title-href path (query/fragment dropped), else
+    title|company. Cheap enough to check before full card extraction; None when the
+    card has no title or company.
+    """
+    title_el = card.find("a", class_="job-title-href")
+    if not title_el or not card.find("p", class_="company-name"):
+        return None
+    href = title_el.get('href')
+    if href:
+        return urlsplit(href).path.rstrip('/')
+    return f"{title_el.text.strip()}|{card.find('p', class_='company-name').text.strip()}"
+
+def parse_job_card(card):
+    """Listing card -> dict of job fields (title through job_type); None without title/company"""
+    title_el = card.find("a", class_="job-title-href")
+    company_el = card.find("p", class_="company-name")
+    
+    if not title_el or not company_el:
+        return None
+    
+    job_data = {
+        'title': title_el.text.strip(),
+        'company': company_el.text.strip(),
+    }
+    
+    # Job URL
+    job_data['job_url'] = f"{SITE_URL}{title_el.get('href')}" if title_el.get('href') else None
+    
+    # Location details
+    location_el = card.find("p", class_="row-1-item locations")
+    if location_el:
+        location_links = location_el.find_all("a")
+        job_data['location_full'] = ", ".join([link.text.strip() for link in location_links]) if location_links else location_el.text.strip()
+    else:
+        job_data['location_full'] = None
+    
+    # Extract city and state from location
+    location_text = job_data['location_full'] or ""
+    if ',' in location_text:
+        parts = location_text.split(',')
+        job_data['city'] = parts[0].strip()
+        job_data['state'] = parts[1].strip() if len(parts) > 1 else None
+    else:
+        job_data['city'] = location_text.strip()
+        job_data['state'] = None
+    
+    # Posting date
+    date_el = card.find("div", class_="status-info")
+    if date_el:
+        date_span = date_el.find("span")
+        job_data['posting_date_text'] = date_span.text.strip() if date_span else None
+    else:
+        job_data['posting_date_text'] = None
+    
+    # Salary information
+    salary_els = card.find_all("div", class_="row-1-item")
+    job_data['salary_text'] = None
+    for el in salary_els:
+        if el.find("i", class_="ic-16-money"):
+            salary_span = el.find("span", class_="desktop") or el.find("span", class_="mobile")
+            job_data['salary_text'] = salary_span.text.strip() if salary_span else None
+            break
+    
+    # Skills
+    skills_container = card.find("div", class_="job_skills")
+    if skills_container:
+        skill_divs = skills_container.find_all("div", class_="job_skill")
+        skills_list = [skill.text.strip() for skill in skill_divs]
+        job_data['skills'] = ", ".join(skills_list) if skills_list else None
+    else:
+        job_data['skills'] = None
+    
+    # Job description
+    desc_el = card.find("div", class_="about_job")
+    if desc_el:
+        text_div = desc_el.find("div", class_="text")
+        job_data['description'] = text_div.text.strip() if text_div else None
+    else:
+        job_data['description'] = None
+    
+    # Experience requirement
+    job_data['experience_text'] = None
+    for el in salary_els:
+        if el.find("i", class_="ic-16-briefcase"):
+            exp_span = el.find("span")
+            job_data['experience_text'] = exp_span.text.strip() if exp_span else None
+            break
+    
+    # Job type
+    job_type_el = card.find("div", class_="gray-labels")
+    if job_type_el:
+        type_span = job_type_el.find("span")
+        job_data['job_type'] = type_span.text.strip() if type_span else None
+    else:
+        job_data['job_type'] = None
+    
+    return job_data
+
+def scrape_internshala_optimized(categories=None, locations=None, max_pages=10, delay=1.5, metrics=None,
+                                 base_url=SITE_URL, workers=1, max_rate=None, max_retries=3,
+                                 retry_pass=True, dead_letter_path=None, combinations=None, request_budget=None,
+                                 archive=None):
     """
     Optimized Internshala scraper with duplicate detection and consistent output format
     
@@ -13,9 +141,37 @@ def scrape_internshala_optimized(categories=None, locations=None, max_pages=10,
         categories: List of job categories to search for
         locations: List of locations to search in  
         max_pages: Maximum pages to scrape (with early stopping on duplicates)
-        delay: Delay between requests in seconds
+        delay: Initial delay between requests in seconds (0 = unpaced); the adaptive
+               controller speeds up to max_rate while responses are healthy and backs
+               off on 429/5xx, honoring Retry-After
+        metrics: Optional RunMetrics (scripts/run_metrics.py); receives per-request
+                 latency ('request_latency'), per-page parse time ('page_parse') and counters
+        base_url: Site root to fetch listing pages from, e.g. a local fixture replay
+                  server (src/scraping/fixture_replay.py); job URLs always use SITE_URL
+        workers: Combinations fetched concurrently (pages within a combination stay sequential);
+                 in-flight requests start at 1 and grow towards this while healthy
+        max_rate: Ceiling in requests/second (default: 4x the initial rate)
+        max_retries: Retries per URL for 429/5xx/connection errors before dead-lettering it
+        retry_pass: Retry dead-lettered pages once more after the main pass
+        dead_letter_path: Optional JSON path for pages that still failed
+        combinations: Explicit ordered (category, location) pairs to visit instead of the full
+                      categories × locations grid (see src/scraping/combo_scheduler.py)
+        request_budget: Stop issuing listing requests once this many have been made
+        archive: Optional PageArchive (src/scraping/page_archive.py); every fetched listing
+                 page is appended to it so extraction can be re-run offline
+    
+    Returns a DataFrame with one row per posting (job_id derived from the job URL path; the
+    first combination it was found under fills category_searched/location_searched).
+    df.attrs['job_hits'] maps every job_id to all (category, location, page) it appeared in,
+    df.attrs['dead_letters'] lists pages that could not be fetched and
+    df.attrs['combination_stats'] has per-combination requests/jobs/new jobs.
     """
     
+    if combinations is not None:
+        combinations = list(combinations)
+        categories = list(dict.fromkeys(c for c, _ in combinations))
+        locations = list(dict.fromkeys(l for _, l in combinations))
+    
     # Default comprehensive tech categories
     if categories is None:
         categories = [
@@ -42,205 +198,276 @@ def scrape_internshala_optimized(categories=None, locations=None, max_pages=10,
     print(f"📋 Categories: {len(categories)}")
     print(f"📍 Locations: {len(locations)}")
     print(f"🔍 Smart duplicate detection enabled")
+    if workers > 1:
+        print(f"⚡ Concurrent mode: up to {workers} combinations in flight")
     print("=" * 60)
     
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     }
     
-    all_jobs = []
-    seen_jobs = set()  # Track unique jobs by hash
+    if combinations is None:
+        combinations = [(category, location) for category in categories for location in locations]
+    string_pool = {}  # shared intern pool for repeated strings across all batches
+    jobs_by_combination = [ColumnBatch(RAW_JOB_COLUMNS, pool=string_pool) for _ in combinations]
+    combination_stats = [{'category': c, 'location': l, 'requests': 0, 'fetched': 0, 'pages': 0, 'jobs': 0,
+                          'new_jobs': 0} for c, l in combinations]
+    hits_by_combination = [ColumnBatch(HIT_COLUMNS, pool=string_pool) for _ in combinations]  # job_id x (category, location) memberships
+    postings = {}  # posting key (job URL path) -> job_id, across all combinations
+    seen_in_combination = [set() for _ in combinations]
+    requests_issued = 0
+    latencies = []  # seconds per listing request
+    dead_letters = []  # pages that failed after all retries
+    archived_pages = set()  # (combination index, page) already appended to the archive
+    combinations_with_data = set()
     stats = {
-        'total_combinations': len(categories) * len(locations),
+        'total_combinations': len(combinations),
         'successful_combinations': 0,
         'total_pages_scraped': 0,
         'unique_jobs_found': 0,
         'duplicates_skipped': 0,
+        'cross_combination_hits': 0,
+        'card_errors': 0,
         'categories_with_data': set(),
         'locations_with_data': set()
     }
     
-    combination_count = 0
+    controller = AdaptiveRateController(
+        initial_rate=(1.0 / delay) if delay > 0 else math.inf,
+        max_rate=max_rate,
+        max_concurrency=workers,
+    )
+    lock = threading.Lock()
+    print_lock = threading.Lock()
+    local = threading.local()
+    
+    def get_session():
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        return local.session
     
-    for category in categories:
-        for location in locations:
-            combination_count += 1
+    def reserve_request(index):
+        """Count a listing request against the budget; False once the budget is spent"""
+        nonlocal requests_issued
+        with lock:
+            if request_budget is not None and requests_issued >= request_budget:
+                return False
+            requests_issued += 1
+            combination_stats[index]['requests'] += 1
+            return True
+    
+    def fetch(url):
+        response, request_secs = fetch_with_retries(get_session(), url, controller, headers=headers,
+                                                     max_retries=max_retries, metrics=metrics)
+        with lock:
+            latencies.append(request_secs)
+        return response, request_secs
+    
+    def process_page(index, page, response):
+        """
+        Parse one listing page. Postings already found under another combination only get
+        a hit row (no full extraction); returns (cards, new to combination, duplicates).
+        A card that fails to parse is skipped without registering its key, so it is not
+        mistaken for a duplicate when seen again.
+        """
+        category, location = combinations[index]
+        page_timestamp = datetime.now().isoformat()
+        if archive is not None and (index, page) not in archived_pages:
+            archive.append(response.url, response.content, category=category, location=location,
+                           page=page, fetched_at=page_timestamp)
+            with lock:
+                archived_pages.add((index, page))
+        parse_start = time.perf_counter()
+        job_cards = listing_cards(response.text)
+        
+        page_unique_count = 0
+        page_duplicate_count = 0
+        page_cross_hits = 0
+        page_card_errors = 0
+        
+        for card in job_cards:
+            key = posting_key(card)
+            if key is None:
+                continue
             
-            print(f"\\n[{combination_count}/{stats['total_combinations']}] Processing: {category} in {location}")
+            with lock:
+                known = key in seen_in_combination[index] or key in postings
+            if not known:
+                # Extract comprehensive job data before the key is registered
+                try:
+                    job = parse_job_card(card)
+                except Exception:
+                    page_card_errors += 1
+                    continue
             
-            # Create clean URL
-            category_clean = category.lower().replace(' ', '-').replace('(', '').replace(')', '').replace('/', '-').replace('.', '')
-            location_clean = location.lower().replace(' ', '-')
-            base_url = f"https://internshala.com/jobs/{category_clean}-jobs-in-{location_clean}"
+            with lock:
+                # Same posting repeated within this combination's pages
+                if key in seen_in_combination[index]:
+                    page_duplicate_count += 1
+                    stats['duplicates_skipped'] += 1
+                    continue
+                seen_in_combination[index].add(key)
+                job_id = postings.get(key)
+                is_new = job_id is None
+                if is_new:
+                    job_id = postings[key] = hashlib.md5(key.encode()).hexdigest()
+                    stats['unique_jobs_found'] += 1
+                    combination_stats[index]['new_jobs'] += 1
+                else:
+                    stats['cross_combination_hits'] += 1
+                    stats['duplicates_skipped'] += 1
+                combination_stats[index]['jobs'] += 1
+            page_unique_count += 1
+            hits_by_combination[index].append({}, job_id=job_id, category_searched=category,
+                                              location_searched=location, page_found=page,
+                                              scrape_timestamp=page_timestamp)
+            if not is_new:
+                page_cross_hits += 1
+                continue
             
-            combination_unique_jobs = 0
-            combination_duplicates = 0
-            pages_with_same_data = 0
+            # Consistent format; one timestamp per page
+            jobs_by_combination[index].append(job, job_id=job_id, source='Internshala',
+                                              scrape_timestamp=page_timestamp, category_searched=category,
+                                              location_searched=location, page_found=page)
+        
+        with lock:
+            combination_stats[index]['fetched'] += 1
+            stats['card_errors'] += page_card_errors
+            if job_cards:
+                stats['total_pages_scraped'] += 1
+                combination_stats[index]['pages'] += 1
+                if page_unique_count > 0:
+                    combinations_with_data.add(index)
+        if metrics is not None and page_card_errors:
+            metrics.incr('card_errors', page_card_errors)
+        if job_cards:
+            if metrics is not None:
+                metrics.observe('page_parse', time.perf_counter() - parse_start)
+                metrics.incr('pages_scraped')
+                metrics.incr('cross_combination_hits', page_cross_hits)
+        return len(job_cards), page_unique_count, page_duplicate_count
+    
+    def dead_letter(index, page, url, error):
+        """Queue a page that failed; non-fetch errors (e.g. a parse failure) keep their type as the reason"""
+        category, location = combinations[index]
+        if isinstance(error, FetchFailed):
+            reason, status, attempts = error.reason, error.status, error.attempts
+        else:
+            reason, status, attempts = f"{type(error).__name__}: {error}", None, 1
+        with lock:
+            dead_letters.append({'category': category, 'location': location, 'page': page, 'url': url,
+                                 'reason': reason, 'status': status, 'attempts': attempts})
+    
+    def scrape_combination(index):
+        category, location = combinations[index]
+        lines = []
+        emit = print if workers == 1 else lines.append
+        
+        emit(f"\\n[{index + 1}/{stats['total_combinations']}] Processing: {category} in {location}")
+        
+        combination_unique_jobs = 0
+        combination_duplicates = 0
+        pages_with_same_data = 0
+        
+        for page in range(1, max_pages + 1):
+            url = listing_url(category, location, page, base_url)
+            prefix = f"  📄 Page {page}: "
+            if not reserve_request(index):
+                emit(prefix + "request budget exhausted")
+                break
             
-            for page in range(1, max_pages + 1):
-                url = f"{base_url}?page={page}"
-                print(f"  📄 Page {page}: ", end="")
+            try:
+                response, request_secs = fetch(url)
+                n_cards, page_unique_count, page_duplicate_count = process_page(index, page, response)
                 
-                try:
-                    response = requests.get(url, headers=headers, timeout=15)
-                    response.raise_for_status()
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    
-                    job_cards = soup.select("div.individual_internship")
+                if not n_cards:
+                    emit(prefix + "No jobs found, stopping pagination")
+                    break
+                
+                # Print page results
+                if page_unique_count > 0:
+                    emit(prefix + f"✅ {page_unique_count} unique, {page_duplicate_count} duplicates ({request_secs:.2f}s)")
+                    combination_unique_jobs += page_unique_count
+                    combination_duplicates += page_duplicate_count
+                else:
+                    emit(prefix + f"⚠️ All {n_cards} jobs were duplicates")
+                    pages_with_same_data += 1
                     
-                    if not job_cards:
-                        print("No jobs found, stopping pagination")
+                    # Stop if we get 2 consecutive pages with all duplicates
+                    if pages_with_same_data >= 2:
+                        emit(f"    🛑 Stopping - found {pages_with_same_data} consecutive pages with all duplicates")
                         break
-                    
-                    page_unique_count = 0
-                    page_duplicate_count = 0
-                    
-                    for card in job_cards:
-                        # Extract basic job info for duplicate detection
-                        title_el = card.find("a", class_="job-title-href")
-                        company_el = card.find("p", class_="company-name")
-                        
-                        if not title_el or not company_el:
-                            continue
-                        
-                        title = title_el.text.strip()
-                        company = company_el.text.strip()
-                        
-                        # Create unique hash for this job
-                        job_hash = hashlib.md5(f"{title}|{company}|{category}|{location}".encode()).hexdigest()
-                        
-                        if job_hash in seen_jobs:
-                            page_duplicate_count += 1
-                            stats['duplicates_skipped'] += 1
-                            continue
-                        
-                        seen_jobs.add(job_hash)
-                        page_unique_count += 1
-                        stats['unique_jobs_found'] += 1
-                        
-                        # Extract comprehensive job data (consistent format)
-                        job_data = {
-                            # Basic identifiers
-                            'job_id': job_hash,
-                            'source': 'Internshala',
-                            'scrape_timestamp': datetime.now().isoformat(),
-                            'category_searched': category,
-                            'location_searched': location,
-                            'page_found': page,
-                            
-                            # Core job information
-                            'title': title,
-                            'company': company,
-                        }
-                        
-                        # Job URL
-                        job_data['job_url'] = f"https://internshala.com{title_el.get('href')}" if title_el.get('href') else None
-                        
-                        # Location details
-                        location_el = card.find("p", class_="row-1-item locations")
-                        if location_el:
-                            location_links = location_el.find_all("a")
-                            job_data['location_full'] = ", ".join([link.text.strip() for link in location_links]) if location_links else location_el.text.strip()
-                        else:
-                            job_data['location_full'] = None
-                        
-                        # Extract city and state from location
-                        location_text = job_data['location_full'] or ""
-                        if ',' in location_text:
-                            parts = location_text.split(',')
-                            job_data['city'] = parts[0].strip()
-                            job_data['state'] = parts[1].strip() if len(parts) > 1 else None
-                        else:
-                            job_data['city'] = location_text.strip()
-                            job_data['state'] = None
-                        
-                        # Posting date
-                        date_el = card.find("div", class_="status-info")
-                        if date_el:
-                            date_span = date_el.find("span")
-                            job_data['posting_date_text'] = date_span.text.strip() if date_span else None
-                        else:
-                            job_data['posting_date_text'] = None
-                        
-                        # Salary information
-                        salary_els = card.find_all("div", class_="row-1-item")
-                        job_data['salary_text'] = None
-                        for el in salary_els:
-                            if el.find("i", class_="ic-16-money"):
-                                salary_span = el.find("span", class_="desktop") or el.find("span", class_="mobile")
-                                job_data['salary_text'] = salary_span.text.strip() if salary_span else None
-                                break
-                        
-                        # Skills
-                        skills_container = card.find("div", class_="job_skills")
-                        if skills_container:
-                            skill_divs = skills_container.find_all("div", class_="job_skill")
-                            skills_list = [skill.text.strip() for skill in skill_divs]
-                            job_data['skills'] = ", ".join(skills_list) if skills_list else None
-                        else:
-                            job_data['skills'] = None
-                        
-                        # Job description
-                        desc_el = card.find("div", class_="about_job")
-                        if desc_el:
-                            text_div = desc_el.find("div", class_="text")
-                            job_data['description'] = text_div.text.strip() if text_div else None
-                        else:
-                            job_data['description'] = None
-                        
-                        # Experience requirement
-                        job_data['experience_text'] = None
-                        for el in salary_els:
-                            if el.find("i", class_="ic-16-briefcase"):
-                                exp_span = el.find("span")
-                                job_data['experience_text'] = exp_span.text.strip() if exp_span else None
-                                break
-                        
-                        # Job type
-                        job_type_el = card.find("div", class_="gray-labels")
-                        if job_type_el:
-                            type_span = job_type_el.find("span")
-                            job_data['job_type'] = type_span.text.strip() if type_span else None
-                        else:
-                            job_data['job_type'] = None
-                        
-                        all_jobs.append(job_data)
-                    
-                    stats['total_pages_scraped'] += 1
-                    
-                    # Print page results
-                    if page_unique_count > 0:
-                        print(f"✅ {page_unique_count} unique, {page_duplicate_count} duplicates")
-                        combination_unique_jobs += page_unique_count
-                        combination_duplicates += page_duplicate_count
-                    else:
-                        print(f"⚠️ All {len(job_cards)} jobs were duplicates")
-                        pages_with_same_data += 1
-                        
-                        # Stop if we get 2 consecutive pages with all duplicates
-                        if pages_with_same_data >= 2:
-                            print(f"    🛑 Stopping - found {pages_with_same_data} consecutive pages with all duplicates")
-                            break
-                    
-                except requests.exceptions.RequestException as e:
-                    print(f"❌ Request failed: {e}")
-                    continue
-                except Exception as e:
-                    print(f"❌ Error: {e}")
-                    continue
                 
-                time.sleep(delay)
-            
-            if combination_unique_jobs > 0:
-                stats['successful_combinations'] += 1
-                stats['categories_with_data'].add(category)
-                stats['locations_with_data'].add(location)
-                print(f"  📊 Combination total: {combination_unique_jobs} unique jobs")
-            else:
-                print(f"  ⚠️ No unique jobs found for this combination")
+            except FetchFailed as e:
+                emit(prefix + f"❌ Request failed: {e} (queued for retry pass)")
+                if metrics is not None:
+                    metrics.incr('request_failures')
+                dead_letter(index, page, url, e)
+                continue
+            except Exception as e:
+                emit(prefix + f"❌ Error: {e} (queued for retry pass)")
+                dead_letter(index, page, url, e)
+                continue
+        
+        if combination_unique_jobs > 0:
+            emit(f"  📊 Combination total: {combination_unique_jobs} unique jobs")
+        else:
+            emit(f"  ⚠️ No unique jobs found for this combination")
+        if lines:
+            with print_lock:
+                print("\n".join(lines))
+    
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(scrape_combination, range(len(combinations))))
+    else:
+        for index in range(len(combinations)):
+            scrape_combination(index)
+    
+    # Retry pass over dead-lettered pages, starting again from a cautious pace; pages answered
+    # with a non-retryable status (404 etc.) stay dead-lettered
+    if retry_pass and dead_letters:
+        retryable = [d['status'] is None or d['status'] in RETRY_STATUSES for d in dead_letters]
+        pending = sorted((d for d, r in zip(dead_letters, retryable) if r),
+                         key=lambda d: (combinations.index((d['category'], d['location'])), d['page']))
+        dead_letters[:] = [d for d, r in zip(dead_letters, retryable) if not r]
+        skipped = f", {len(dead_letters)} not retryable" if dead_letters else ""
+        print(f"\n🔁 Retry pass: {len(pending)} failed page(s){skipped}")
+        controller.rate = min(controller.rate, controller.min_rate * 10)
+        controller.limit = 1
+        for item in pending:
+            index = combinations.index((item['category'], item['location']))
+            if not reserve_request(index):
+                dead_letters.append(item)
+                continue
+            try:
+                response, _ = fetch(item['url'])
+                n_cards, unique, _ = process_page(index, item['page'], response)
+                print(f"  ✅ {item['category']} in {item['location']} page {item['page']}: {unique} unique")
+                if metrics is not None:
+                    metrics.incr('retry_pass_recovered')
+            except Exception as e:
+                print(f"  ❌ {item['category']} in {item['location']} page {item['page']}: {e}")
+                dead_letter(index, item['page'], item['url'], e)
+    
+    for index in sorted(combinations_with_data):
+        category, location = combinations[index]
+        stats['successful_combinations'] += 1
+        stats['categories_with_data'].add(category)
+        stats['locations_with_data'].add(location)
     
-    # Convert to DataFrame
-    df = pd.DataFrame(all_jobs)
+    # Convert to DataFrame (combination order, whatever order pages completed in)
+    df = ColumnBatch.concat(jobs_by_combination).to_frame()
+    df.attrs['dead_letters'] = list(dead_letters)
+    df.attrs['combination_stats'] = combination_stats
+    df.attrs['job_hits'] = ColumnBatch.concat(hits_by_combination, HIT_COLUMNS).to_frame()
+    if dead_letters:
+        if metrics is not None:
+            metrics.incr('dead_letters', len(dead_letters))
+        if dead_letter_path:
+            os.makedirs(os.path.dirname(dead_letter_path) or '.', exist_ok=True)
+            with open(dead_letter_path, 'w', encoding='utf-8') as f:
+                json.dump(dead_letters, f, indent=2)
     
     # Print final statistics
     print("\\n" + "="*60)
@@ -248,12 +475,23 @@ def scrape_internshala_optimized(categories=None, locations=None, max_pages=10,
     print("="*60)
     print(f"📊 Final Statistics:")
     print(f"   Total unique jobs: {stats['unique_jobs_found']:,}")
-    print(f"   Duplicates skipped: {stats['duplicates_skipped']:,}")
+    print(f"   Duplicates skipped: {stats['duplicates_skipped']:,} ({stats['cross_combination_hits']:,} found under another combination, kept as hits)")
     print(f"   Successful combinations: {stats['successful_combinations']}/{stats['total_combinations']}")
     print(f"   Pages scraped: {stats['total_pages_scraped']}")
+    if stats['card_errors']:
+        print(f"   Cards skipped (parse errors): {stats['card_errors']:,}")
+    print(f"   Listing requests: {requests_issued}" + (f" (budget {request_budget})" if request_budget is not None else ""))
     print(f"   Categories with data: {len(stats['categories_with_data'])}")
     print(f"   Locations with data: {len(stats['locations_with_data'])}")
-    print(f"   Efficiency: {(stats['unique_jobs_found']/(stats['unique_jobs_found']+stats['duplicates_skipped'])*100):.1f}% unique data")
+    print(f"   Efficiency: {(stats['unique_jobs_found']/max(1, stats['unique_jobs_found']+stats['duplicates_skipped'])*100):.1f}% unique data")
+    if latencies:
+        ordered = sorted(latencies)
+        p50 = ordered[len(ordered) // 2]
+        p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+        print(f"   Request latency: mean {sum(ordered)/len(ordered):.2f}s, p50 {p50:.2f}s, p90 {p90:.2f}s, max {ordered[-1]:.2f}s")
+    print(f"   Rate control: {controller.throttle_events} backoff(s), final {controller.rate:.2f} req/s, {controller.limit} in flight")
+    if dead_letters:
+        print(f"   Failed pages: {len(dead_letters)}" + (f" (saved to {dead_letter_path})" if dead_letter_path else ""))
     
     return df
 
@@ -0,0 +1,99 @@
+"""
+Compact in-memory representation of scraped jobs
+- JobRecord: slotted dataclass for a single posting (no per-instance __dict__)
+- ColumnBatch: column-wise builder (one list per column) that interns repeated
+  strings (source, searched category/location, page timestamp, city, ...) through a
+  shared pool and converts straight to a DataFrame or Arrow table, without an
+  intermediate list of dicts
+"""
+from dataclasses import dataclass, fields as dataclass_fields
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+RAW_JOB_COLUMNS = [
+    'job_id', 'source', 'scrape_timestamp', 'category_searched', 'location_searched', 'page_found',
+    'title', 'company', 'job_url', 'location_full', 'city', 'state', 'posting_date_text',
+    'salary_text', 'skills', 'description', 'experience_text', 'job_type',
+]
+
+# Low-cardinality columns whose values repeat across many rows
+INTERNED_COLUMNS = frozenset({
+    'source', 'scrape_timestamp', 'category_searched', 'location_searched', 'company', 'location_full',
+    'city', 'state', 'posting_date_text', 'salary_text', 'experience_text', 'job_type',
+})
+
+
+@dataclass(slots=True)
+class JobRecord:
+    job_id: str
+    source: str
+    scrape_timestamp: str
+    category_searched: str
+    location_searched: str
+    page_found: int
+    title: Optional[str] = None
+    company: Optional[str] = None
+    job_url: Optional[str] = None
+    location_full: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    posting_date_text: Optional[str] = None
+    salary_text: Optional[str] = None
+    skills: Optional[str] = None
+    description: Optional[str] = None
+    experience_text: Optional[str] = None
+    job_type: Optional[str] = None
+
+
+JOB_RECORD_FIELDS = [f.name for f in dataclass_fields(JobRecord)]
+
+
+class ColumnBatch:
+    """
+    Append-only column store. Values of `interned` columns are deduplicated through
+    `pool` (shareable between batches), so repeated strings are stored once.
+    """
+
+    __slots__ = ('columns', 'data', 'interned', 'pool')
+
+    def __init__(self, columns: List[str], interned: Iterable[str] = INTERNED_COLUMNS,
+                 pool: Optional[Dict[object, object]] = None):
+        self.columns = list(columns)
+        self.data: Dict[str, list] = {c: [] for c in self.columns}
+        self.interned = frozenset(interned) & set(self.columns)
+        self.pool = pool if pool is not None else {}
+
+    def append(self, values: dict, **extra):
+        """Add one row from a mapping (plus keyword overrides); missing columns become None."""
+        pool = self.pool
+        for c in self.columns:
+            v = extra[c] if c in extra else values.get(c)
+            if c in self.interned and v is not None:
+                v = pool.setdefault(v, v)
+            self.data[c].append(v)
+
+    def append_record(self, record: JobRecord):
+        self.append({name: getattr(record, name) for name in JOB_RECORD_FIELDS})
+
+    def extend(self, other: 'ColumnBatch'):
+        for c in self.columns:
+            self.data[c].extend(other.data.get(c, [None] * len(other)))
+
+    @classmethod
+    def concat(cls, batches: List['ColumnBatch'], columns: Optional[List[str]] = None) -> 'ColumnBatch':
+        out = cls(columns or (batches[0].columns if batches else RAW_JOB_COLUMNS),
+                  pool=batches[0].pool if batches else None)
+        for b in batches:
+            out.extend(b)
+        return out
+
+    def __len__(self):
+        return len(self.data[self.columns[0]]) if self.columns else 0
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.data, columns=self.columns)
+
+    def to_arrow(self):
+        import pyarrow as pa
+        return pa.table(self.data)
@@ -0,0 +1,226 @@
+"""
+Append-only compressed archive of fetched listing pages, and offline re-extraction
+- pages.bin: sequence of frames  MAGIC | meta_len (u32) | body_len (u32) | meta JSON | zlib(html)
+  Frames are self-describing, so the index can always be rebuilt by scanning the file
+- pages.idx: one JSON line per frame (offset, lengths, url, category, location, page, ...)
+- reparse: memory-maps pages.bin and re-runs card extraction over every page on a
+  process pool, without any network, producing the scraper's raw CSV + hits table with
+  the collection_session/collection_date columns a live run saves
+
+    python src/scraping/page_archive.py info --archive data/raw/html_archive
+    python src/scraping/page_archive.py reparse --archive data/raw/html_archive --output data/raw/reparsed_jobs.csv
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping.internshala_optimized import HIT_COLUMNS, listing_cards, parse_job_card, posting_key
+from scraping.job_records import INTERNED_COLUMNS, RAW_JOB_COLUMNS, ColumnBatch
+
+DEFAULT_ARCHIVE_DIR = os.path.join('data', 'raw', 'html_archive')
+MAGIC = b'JHA1'
+FRAME_HEADER = struct.Struct('<4sII')
+SESSION_FORMAT = '%Y%m%d_%H%M%S'
+SESSION_COLUMNS = ['collection_session', 'collection_date']
+REPARSED_JOB_COLUMNS = RAW_JOB_COLUMNS + SESSION_COLUMNS
+REPARSED_HIT_COLUMNS = HIT_COLUMNS + ['collection_session']
+
+
+class PageArchive:
+    """Thread-safe appender/reader for one archive directory; default_meta (e.g. session) is stored with every page."""
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR, level=6, **default_meta):
+        self.directory = directory
+        self.level = level
+        self.default_meta = default_meta
+        self.data_path = os.path.join(directory, 'pages.bin')
+        self.index_path = os.path.join(directory, 'pages.idx')
+        self._lock = threading.Lock()
+
+    def append(self, url, body, **meta):
+        """Compress and append one page; returns its index entry."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        payload = zlib.compress(body, self.level)
+        meta = {'url': url, 'raw_length': len(body), **self.default_meta, **meta}
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        frame = FRAME_HEADER.pack(MAGIC, len(meta_bytes), len(payload)) + meta_bytes + payload
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.data_path, 'ab') as f:
+                offset = f.tell()
+                f.write(frame)
+            entry = {'offset': offset, 'meta_length': len(meta_bytes), 'length': len(payload), **meta}
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return entry
+
+    def index(self):
+        """Index entries in append order (rebuilt from pages.bin when the index is missing)."""
+        if not os.path.exists(self.index_path):
+            return self.rebuild_index() if os.path.exists(self.data_path) else []
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def rebuild_index(self):
+        entries = []
+        with open(self.data_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos + FRAME_HEADER.size <= len(mm):
+                magic, meta_len, body_len = FRAME_HEADER.unpack_from(mm, pos)
+                if magic != MAGIC:
+                    raise ValueError(f"Corrupt archive frame at offset {pos}")
+                meta = json.loads(bytes(mm[pos + FRAME_HEADER.size:pos + FRAME_HEADER.size + meta_len]))
+                entries.append({'offset': pos, 'meta_length': meta_len, 'length': body_len, **meta})
+                pos += FRAME_HEADER.size + meta_len + body_len
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            for e in entries:
+                f.write(json.dumps(e, ensure_ascii=False) + '\n')
+        return entries
+
+    def read(self, entry, mm=None):
+        """Decompressed page body for an index entry (pass an open mmap to avoid re-opening)."""
+        start = entry['offset'] + FRAME_HEADER.size + entry['meta_length']
+        if mm is not None:
+            return zlib.decompress(memoryview(mm)[start:start + entry['length']])
+        with open(self.data_path, 'rb') as f:
+            f.seek(start)
+            return zlib.decompress(f.read(entry['length']))
+
+
+def _extract_range(data_path, entries):
+    """
+    Worker: map the archive and extract (posting key, fields) from each page in entries.
+    Returns (cards per page, errors); a page that fails yields no cards and an error
+    dict with its offset and URL, and the remaining pages are still extracted.
+    """
+    archive = PageArchive(os.path.dirname(data_path))
+    out, errors = [], []
+    with open(data_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for entry in entries:
+            cards = []
+            try:
+                for card in listing_cards(archive.read(entry, mm)):
+                    key = posting_key(card)
+                    if key is not None:
+                        cards.append((key, parse_job_card(card)))
+            except Exception as e:
+                errors.append({'offset': entry.get('offset'), 'url': entry.get('url'),
+                               'reason': f"{type(e).__name__}: {e}"})
+                cards = []
+            out.append(cards)
+    return out, errors
+
+
+def _collection_date(entry):
+    """Date of the run a page belongs to: from its session stamp, else from when it was fetched."""
+    try:
+        return datetime.strptime(entry['session'], SESSION_FORMAT).strftime('%Y-%m-%d')
+    except (KeyError, TypeError, ValueError):
+        return (entry.get('fetched_at') or '')[:10] or None
+
+
+def reparse(directory=DEFAULT_ARCHIVE_DIR, workers=None, chunk_pages=50):
+    """
+    Re-run extraction over every archived listing page.
+    Returns (jobs DataFrame, hits DataFrame) with the scraper's columns plus the session
+    columns; postings are deduplicated by job URL path within each session in archive
+    (fetch) order, like a live run, so every session gets its own row per posting.
+    Pages that could not be extracted are listed (offset, url, reason) in
+    jobs.attrs['page_errors'].
+    """
+    archive = PageArchive(directory)
+    entries = archive.index()
+    if not entries:
+        return pd.DataFrame(columns=REPARSED_JOB_COLUMNS), pd.DataFrame(columns=REPARSED_HIT_COLUMNS)
+    chunks = [entries[i:i + chunk_pages] for i in range(0, len(entries), chunk_pages)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_extract_range, [archive.data_path] * len(chunks), chunks))
+    else:
+        results = [_extract_range(archive.data_path, chunk) for chunk in chunks]
+
+    pool, interned = {}, INTERNED_COLUMNS | set(SESSION_COLUMNS)
+    jobs = ColumnBatch(REPARSED_JOB_COLUMNS, interned=interned, pool=pool)
+    hits = ColumnBatch(REPARSED_HIT_COLUMNS, interned=interned, pool=pool)
+    postings_in_session, seen_in_combination = {}, {}
+    for entry, cards in zip(entries, (page for chunk, _ in results for page in chunk)):
+        session = entry.get('session')
+        postings = postings_in_session.setdefault(session, {})
+        seen = seen_in_combination.setdefault((session, entry.get('category'), entry.get('location')), set())
+        for key, fields in cards:
+            if key in seen:
+                continue
+            seen.add(key)
+            job_id = postings.get(key)
+            if job_id is None:
+                job_id = postings[key] = hashlib.md5(key.encode()).hexdigest()
+                jobs.append(fields, job_id=job_id, source='Internshala', scrape_timestamp=entry.get('fetched_at'),
+                            category_searched=entry.get('category'), location_searched=entry.get('location'),
+                            page_found=entry.get('page'), collection_session=session,
+                            collection_date=_collection_date(entry))
+            hits.append({}, job_id=job_id, category_searched=entry.get('category'),
+                        location_searched=entry.get('location'), page_found=entry.get('page'),
+                        scrape_timestamp=entry.get('fetched_at'), collection_session=session)
+    jobs = jobs.to_frame()
+    jobs.attrs['page_errors'] = [e for _, errors in results for e in errors]
+    return jobs, hits.to_frame()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or re-parse the archived listing pages')
+    sub = parser.add_subparsers(dest='command', required=True)
+    info = sub.add_parser('info', help='Summarize the archive')
+    info.add_argument('--archive', default=DEFAULT_ARCHIVE_DIR)
+    rp = sub.add_parser('reparse', help='Re-extract jobs from every archived page (no network)')
+    rp.add_argument('--archive', default=DEFAULT_ARCHIVE_DIR)
+    rp.add_argument('--output', default=os.path.join('data', 'raw', 'reparsed_jobs_dataset.csv'))
+    rp.add_argument('--hits-output', default=None, help='Hits CSV (default: <output>_hits.csv)')
+    rp.add_argument('--workers', type=int, default=None)
+    rp.add_argument('--rebuild-index', action='store_true', help='Rebuild pages.idx from pages.bin first')
+    args = parser.parse_args()
+
+    archive = PageArchive(args.archive)
+    if args.command == 'info':
+        entries = archive.index()
+        raw = sum(e['raw_length'] for e in entries)
+        stored = os.path.getsize(archive.data_path) if os.path.exists(archive.data_path) else 0
+        sessions = sorted({e.get('session') for e in entries if e.get('session')})
+        print(f"{len(entries):,} pages, {raw / 1e6:.1f} MB raw, {stored / 1e6:.1f} MB stored "
+              f"({(raw / stored) if stored else 0:.1f}x), sessions: {', '.join(sessions) or '-'}")
+        return
+
+    if args.rebuild_index:
+        archive.rebuild_index()
+    start = time.perf_counter()
+    jobs, hits = reparse(args.archive, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    jobs.to_csv(args.output, index=False)
+    hits_path = args.hits_output or args.output[:-4] + '_hits.csv'
+    hits.to_csv(hits_path, index=False)
+    pages = len(archive.index())
+    print(f"Re-parsed {pages:,} pages in {elapsed:.2f}s ({pages / elapsed if elapsed else 0:.0f} pages/s): "
+          f"{len(jobs):,} jobs -> {args.output}, {len(hits):,} hits -> {hits_path}")
+    errors = jobs.attrs.get('page_errors')
+    if errors:
+        print(f"Skipped {len(errors):,} page(s) that failed to parse:")
+        for e in errors:
+            print(f"  offset {e['offset']} {e['url']}: {e['reason']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Adaptive request pacing for the scraper
+- AdaptiveRateController: AIMD on request rate and concurrency. Healthy responses
+  raise the rate additively (and widen concurrency); 429/5xx/connection errors
+  cut both multiplicatively, and Retry-After pauses every worker
+- fetch_with_retries: bounded retries with exponential backoff + jitter, raising
+  FetchFailed once retries are exhausted so callers can dead-letter the URL
+"""
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchFailed(Exception):
+    """A URL that could not be fetched within the retry budget."""
+
+    def __init__(self, url, reason, attempts, status=None):
+        super().__init__(f"{reason} after {attempts} attempt(s)")
+        self.url = url
+        self.reason = reason
+        self.attempts = attempts
+        self.status = status
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date); None if absent/invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class AdaptiveRateController:
+    """
+    Shared pacing state for all fetch workers.
+
+    rate: requests started per second (math.inf = unpaced); starts at initial_rate
+    limit: requests allowed in flight; starts at 1 and grows to max_concurrency
+    """
+
+    def __init__(self, initial_rate=1.0, max_rate=None, min_rate=0.1, max_concurrency=1,
+                 increase=0.1, decrease=0.5, grow_after=5):
+        self.rate = initial_rate
+        self.max_rate = max_rate if max_rate is not None else initial_rate * 4
+        self.min_rate = min_rate
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = 1
+        self.increase = increase
+        self.decrease = decrease
+        self.grow_after = grow_after
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.throttle_events = 0
+        self._next_slot = 0.0
+        self._last_start = None
+        self._observed_rate = None  # EWMA of actual request starts per second
+        self._streak = 0
+        self._cond = threading.Condition()
+
+    @property
+    def interval(self):
+        return 0.0 if math.isinf(self.rate) else 1.0 / self.rate
+
+    def acquire(self):
+        """Block until a concurrency permit and the next pacing slot are available."""
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self.paused_until)
+            self._next_slot = slot + self.interval
+            if self._last_start is not None and slot > self._last_start:
+                inst = 1.0 / (slot - self._last_start)
+                self._observed_rate = inst if self._observed_rate is None else 0.8 * self._observed_rate + 0.2 * inst
+            self._last_start = slot
+        wait = slot - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self):
+        with self._cond:
+            if not math.isinf(self.rate):
+                self.rate = min(self.max_rate, self.rate + self.increase)
+            self._streak += 1
+            if self._streak >= self.grow_after * self.limit and self.limit < self.max_concurrency:
+                self.limit += 1
+                self._streak = 0
+                self._cond.notify()
+
+    def on_throttle(self, retry_after=None):
+        """429/5xx or connection failure: multiplicative decrease, optional global pause."""
+        with self._cond:
+            self.throttle_events += 1
+            self._streak = 0
+            # Unpaced so far: decrease from the rate actually being achieved
+            base = (self._observed_rate or self.min_rate) if math.isinf(self.rate) else self.rate
+            self.rate = max(self.min_rate, base * self.decrease)
+            self.limit = max(1, int(self.limit * self.decrease))
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def snapshot(self):
+        return {'rate': self.rate, 'limit': self.limit, 'throttle_events': self.throttle_events}
+
+
+def fetch_with_retries(session, url, controller, headers=None, timeout=15, max_retries=3,
+                       backoff_base=0.5, backoff_max=30.0, metrics=None, rng=random):
+    """
+    GET url through the controller; retries 429/5xx/connection errors up to max_retries
+    times with exponential backoff (or the server's Retry-After when longer).
+    Returns (response, seconds_of_last_request); raises FetchFailed when giving up.
+    Other 4xx responses are not retried.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        controller.acquire()
+        retry_after = None
+        try:
+            start = time.perf_counter()
+            response = session.get(url, headers=headers, timeout=timeout)
+            secs = time.perf_counter() - start
+        except requests.exceptions.RequestException as e:
+            controller.release()
+            controller.on_throttle()
+            status, reason = None, f"{type(e).__name__}: {e}"
+        else:
+            controller.release()
+            if metrics is not None:
+                metrics.observe('request_latency', secs)
+                metrics.incr(f'http_{response.status_code}')
+            if response.status_code < 400:
+                controller.on_success()
+                return response, secs
+            status, reason = response.status_code, f"HTTP {response.status_code}"
+            if status not in RETRY_STATUSES:
+                raise FetchFailed(url, reason, attempt, status)
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            controller.on_throttle(retry_after)
+
+        if attempt > max_retries:
+            raise FetchFailed(url, reason, attempt, status)
+        if metrics is not None:
+            metrics.incr('request_retries')
+        backoff = min(backoff_max, backoff_base * (2 ** (attempt - 1))) * (0.5 + rng.random())
+        time.sleep(max(backoff, retry_after or 0.0))